@@ -1,4 +1,4 @@
 """
 AI module for Wai project.
 """
-from backend.ai.llama_model import LlamaModel
\ No newline at end of file
+from backend.ai.llama_model import AIServiceClient, AIServiceConfig
@@ -2,9 +2,12 @@
 Document API endpoints for Wai.
 Handles document retrieval and processing.
 """
+import json
+import os
 from typing import Dict, List, Any, Optional, Union
 from fastapi import APIRouter, HTTPException, Depends, Query
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from backend.integrations.mcp_client import MCPClient, MCPConfig
 from backend.ai.llama_model import AIServiceClient, AIServiceConfig
@@ -14,13 +17,14 @@ router = APIRouter()
 
 # Configuration would typically come from environment variables
 mcp_config = MCPConfig(
-    base_url="https://mcp.yourdomain.com",
-    api_key="your-mcp-api-key"
+    base_url=os.environ.get("WAI_MCP_BASE_URL", "https://mcp.yourdomain.com"),
+    api_key=os.environ.get("WAI_MCP_API_KEY", "your-mcp-api-key"),
+    prefetch_enabled=os.environ.get("WAI_MCP_PREFETCH", "").lower() in ("1", "true", "yes")
 )
 
 ai_config = AIServiceConfig(
-    base_url="https://ai.yourdomain.com",
-    api_key="your-ai-api-key"
+    base_url=os.environ.get("WAI_AI_BASE_URL", "https://ai.yourdomain.com"),
+    api_key=os.environ.get("WAI_AI_API_KEY", "your-ai-api-key")
 )
 
 mcp_client = MCPClient(mcp_config)
@@ -32,9 +36,15 @@ class DocumentRequest(BaseModel):
     params: Dict[str, Any]  # Source-specific parameters
     query: Optional[str] = None
 
+class MetadataBatchRequest(BaseModel):
+    """Bulk metadata request schema."""
+    source: str  # e.g. 'google-drive'
+    file_ids: List[str] = Field(min_length=1, max_length=1000)
+    stream: bool = True  # Stream newline-delimited JSON results as they complete
+
 class DocumentResponse(BaseModel):
     """Document response schema."""
-    content: Dict[str, Any]  # Raw document data
+    content: str  # Document content, truncated for display
     ai_response: Optional[str] = None
 
 
@@ -106,7 +116,8 @@ async def batch_process_documents(requests: List[DocumentRequest]):
 @router.get ("/list")
 async def list_files_endpoint(
     source: str,
-    folder_id: Optional[str] = Query(None, description="ID of the folder to list files from")
+    folder_id: Optional[str] = Query(None, description="ID of the folder to list files from"),
+    prefetch: Optional[bool] = Query(None, description="Warm the cache with recently modified files")
 ):
     """
     List files from the specified MCP integration.
@@ -114,18 +125,30 @@ async def list_files_endpoint(
     Args:
         source: Integration type (e.g. 'google-drive')
         folder_id: ID of the folder to list files from (optional)
+        prefetch: Override the server's prefetch setting (optional)
         
     Returns:
         List of files and their metadata
     """
     try:
-        files = await mcp_client.list_files(source, {"folder_id": folder_id})
+        files = await mcp_client.list_files(source, {"folder_id": folder_id}, prefetch=prefetch)
         return {"files": files}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
     
 
+@router.get("/cache/stats")
+async def cache_stats_endpoint():
+    """
+    Report document cache and prefetch statistics.
+    
+    Returns:
+        Cache hit rates and prefetch counters
+    """
+    return mcp_client.cache_stats()
+
+
 @router.get("/metadata")
 async def get_metadata_endpoint(
     source: str,
@@ -146,4 +169,38 @@ async def get_metadata_endpoint(
         return {"metadata": metadata}
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching metadata: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching metadata: {str(e)}")
+
+
+@router.post("/metadata/batch")
+async def get_metadata_batch_endpoint(request: MetadataBatchRequest):
+    """
+    Fetch metadata for many files in one request.
+    
+    Args:
+        request: Source and list of file IDs
+        
+    Returns:
+        Newline-delimited JSON objects with `file_id` and `metadata` or `error`,
+        in completion order; or, when `stream` is false, a single object
+        mapping file IDs to metadata and errors.
+    """
+    try:
+        results = mcp_client.iter_metadata(request.source, request.file_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching metadata: {str(e)}")
+
+    if request.stream:
+        async def ndjson():
+            async for result in results:
+                yield json.dumps(result) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    metadata, errors = {}, {}
+    async for result in results:
+        if "error" in result:
+            errors[result["file_id"]] = result["error"]
+        else:
+            metadata[result["file_id"]] = result["metadata"]
+    return {"metadata": metadata, "errors": errors}
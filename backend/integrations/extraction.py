@@ -0,0 +1,400 @@
+"""
+Content extraction for documents exported from MCP integrations.
+Turns binary exports (PDF, DOCX, XLSX, PPTX, plain text) into text.
+"""
+import codecs
+import io
+import mmap
+import re
+import tempfile
+import zipfile
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterator, Optional, Set
+from xml.etree import ElementTree
+
+# Google-native formats cannot be downloaded directly and must be exported
+GOOGLE_EXPORT_FORMATS = {
+    "application/vnd.google-apps.document": "text/plain",
+    "application/vnd.google-apps.spreadsheet": "text/csv",
+    "application/vnd.google-apps.presentation": "text/plain",
+}
+
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PPTX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+PDF_MIME_TYPE = "application/pdf"
+
+TEXT_MIME_TYPES = {"application/json", "application/xml", "application/csv", "application/x-yaml"}
+
+DECODE_CHUNK_SIZE = 64 * 1024
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_CELL_COLUMN = re.compile(r"[A-Z]+")
+
+
+class ExtractionError(Exception):
+    """Raised when a document cannot be converted to text."""
+
+
+class _ViewReader(io.RawIOBase):
+    """Read-only, seekable file object over a memoryview without copying it."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._view) + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class BinaryBuffer:
+    """
+    Destination for streamed binary downloads.
+
+    Chunks are written straight into a preallocated bytearray when the size is
+    known and small, or into a temporary file once `spill_threshold` bytes are
+    exceeded. The contents are exposed as a memoryview over the bytearray or an
+    mmap of the file, so extractors never need an intermediate `bytes` copy.
+    """
+
+    def __init__(self, expected_size: Optional[int] = None, spill_threshold: int = 8 * 1024 * 1024):
+        self.spill_threshold = spill_threshold
+        self.length = 0
+        self._data: Optional[bytearray] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        if expected_size is not None and expected_size > spill_threshold:
+            self._file = tempfile.TemporaryFile()
+        else:
+            self._data = bytearray(expected_size or 0)
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk of the download."""
+        if self._view is not None:
+            raise ValueError("Buffer is read-only once viewed")
+        if self._file is None and self.length + len(chunk) > self.spill_threshold:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(memoryview(self._data)[:self.length])
+            self._data = None
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            # Fills the preallocated space in place, growing only past it
+            self._data[self.length:self.length + len(chunk)] = chunk
+        self.length += len(chunk)
+
+    def view(self) -> memoryview:
+        """Return a read-only memoryview of everything written so far."""
+        if self._view is None:
+            if self._file is not None:
+                self._file.flush()
+                if self.length:
+                    self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._view = memoryview(self._mmap)
+                else:
+                    self._view = memoryview(b"")
+            else:
+                self._view = memoryview(self._data)[:self.length].toreadonly()
+        return self._view
+
+    def open(self) -> io.BufferedReader:
+        """Return a seekable file object over the buffer contents."""
+        return io.BufferedReader(_ViewReader(self.view()))
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the contents live in a temporary file."""
+        return self._file is not None
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = None
+
+    def __enter__(self) -> "BinaryBuffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_plain_text(buffer: BinaryBuffer, charset: str = "utf-8") -> Iterator[str]:
+    """Decode text incrementally, one slice of the buffer at a time."""
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    view = buffer.view()
+    for start in range(0, len(view), DECODE_CHUNK_SIZE):
+        text = decoder.decode(view[start:start + DECODE_CHUNK_SIZE])
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _iter_xml(archive: zipfile.ZipFile, name: str) -> Iterator[ElementTree.Element]:
+    """Stream elements of an XML member as their end tags are parsed."""
+    with archive.open(name) as stream:
+        for _, element in ElementTree.iterparse(stream, events=("end",)):
+            yield element
+
+
+def _open_archive(buffer: BinaryBuffer) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(buffer.open())
+    except zipfile.BadZipFile as e:
+        raise ExtractionError(f"Invalid Office document: {str(e)}")
+
+
+def _numbered_members(archive: zipfile.ZipFile, pattern: str) -> list:
+    regex = re.compile(pattern)
+    matches = [(int(m.group(1)), name) for name in archive.namelist() if (m := regex.fullmatch(name))]
+    return [name for _, name in sorted(matches)]
+
+
+def _column_index(reference: Optional[str]) -> Optional[int]:
+    """Zero-based column of a cell reference such as "C5"."""
+    match = _CELL_COLUMN.match(reference or "")
+    if match is None:
+        return None
+    index = 0
+    for letter in match.group():
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def iter_docx_text(buffer: BinaryBuffer, charset: str = "utf-8") -> Iterator[str]:
+    """Extract paragraph text from a Word document."""
+    with _open_archive(buffer) as archive:
+        parts = []
+        for element in _iter_xml(archive, "word/document.xml"):
+            if element.tag == f"{_WORD_NS}t" and element.text:
+                parts.append(element.text)
+            elif element.tag == f"{_WORD_NS}tab":
+                parts.append("\t")
+            elif element.tag == f"{_WORD_NS}p":
+                parts.append("\n")
+                yield "".join(parts)
+                parts = []
+                element.clear()
+
+
+def iter_xlsx_text(buffer: BinaryBuffer, charset: str = "utf-8") -> Iterator[str]:
+    """Extract sheets from a spreadsheet as tab-separated rows."""
+    with _open_archive(buffer) as archive:
+        shared_strings = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            for element in _iter_xml(archive, "xl/sharedStrings.xml"):
+                if element.tag == f"{_SHEET_NS}si":
+                    shared_strings.append("".join(t.text or "" for t in element.iter(f"{_SHEET_NS}t")))
+                    element.clear()
+
+        for name in _numbered_members(archive, r"xl/worksheets/sheet(\d+)\.xml"):
+            cells = []
+            for element in _iter_xml(archive, name):
+                if element.tag == f"{_SHEET_NS}c":
+                    # Empty cells are left out, so place each one by its reference
+                    column = _column_index(element.get("r"))
+                    if column is not None and column > len(cells):
+                        cells.extend([""] * (column - len(cells)))
+                    value = element.findtext(f"{_SHEET_NS}v")
+                    if element.get("t") == "s" and value is not None:
+                        index = int(value) if value.isdigit() else -1
+                        value = shared_strings[index] if 0 <= index < len(shared_strings) else None
+                    elif element.get("t") == "inlineStr":
+                        value = "".join(t.text or "" for t in element.iter(f"{_SHEET_NS}t"))
+                    cells.append(value or "")
+                elif element.tag == f"{_SHEET_NS}row":
+                    yield "\t".join(cells) + "\n"
+                    cells = []
+                    element.clear()
+
+
+def iter_pptx_text(buffer: BinaryBuffer, charset: str = "utf-8") -> Iterator[str]:
+    """Extract the text of each slide of a presentation."""
+    with _open_archive(buffer) as archive:
+        for name in _numbered_members(archive, r"ppt/slides/slide(\d+)\.xml"):
+            parts = []
+            for element in _iter_xml(archive, name):
+                if element.tag == f"{_DRAWING_NS}t" and element.text:
+                    parts.append(element.text)
+                elif element.tag == f"{_DRAWING_NS}p":
+                    parts.append("\n")
+            yield "".join(parts) + "\n"
+
+
+def iter_pdf_text(buffer: BinaryBuffer, charset: str = "utf-8") -> Iterator[str]:
+    """Extract the text of each page of a PDF (requires pypdf)."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractionError("PDF extraction requires the 'pypdf' package")
+    try:
+        reader = PdfReader(buffer.open())
+        for page in reader.pages:
+            yield (page.extract_text() or "") + "\n"
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Invalid PDF document: {str(e)}")
+
+
+Extractor = Callable[[BinaryBuffer, str], Iterator[str]]
+
+EXTRACTORS: Dict[str, Extractor] = {
+    DOCX_MIME_TYPE: iter_docx_text,
+    XLSX_MIME_TYPE: iter_xlsx_text,
+    PPTX_MIME_TYPE: iter_pptx_text,
+    PDF_MIME_TYPE: iter_pdf_text,
+}
+
+
+def get_extractor(mime_type: str) -> Optional[Extractor]:
+    """Return the extractor for a MIME type, or None if it is not supported."""
+    mime_type = mime_type.split(";")[0].strip().lower()
+    if mime_type in EXTRACTORS:
+        return EXTRACTORS[mime_type]
+    if mime_type.startswith("text/") or mime_type in TEXT_MIME_TYPES or mime_type.endswith("+json"):
+        return iter_plain_text
+    return None
+
+
+def extract_text(mime_type: str, buffer: BinaryBuffer, charset: str = "utf-8",
+                 max_chars: Optional[int] = None) -> str:
+    """
+    Extract text from a downloaded document.
+
+    Args:
+        mime_type: MIME type of the buffer contents
+        buffer: Downloaded document
+        charset: Character set for text formats
+        max_chars: Stop extracting once this many characters were produced
+
+    Returns:
+        Extracted text, truncated to `max_chars`
+    """
+    extractor = get_extractor(mime_type)
+    if extractor is None:
+        raise ExtractionError(f"Unsupported content type: {mime_type}")
+
+    chunks = []
+    total = 0
+    for chunk in extractor(buffer, charset):
+        if max_chars is not None and total + len(chunk) >= max_chars:
+            chunks.append(chunk[:max_chars - total])
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+    return "".join(chunks)
+
+
+class ExtractedTextCache:
+    """
+    LRU cache of extracted document text, bounded by total characters.
+
+    Entries stored by the prefetcher are tracked separately so the share of
+    prefetched documents that are actually requested can be reported.
+    """
+
+    def __init__(self, max_chars: int = 50_000_000):
+        self.max_chars = max_chars
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+        self.prefetch_evictions = 0
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._prefetched: Set[Hashable] = set()
+
+    def get(self, key: Hashable, record: bool = True) -> Optional[str]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+            record: Whether the lookup counts towards the hit statistics
+        """
+        text = self._entries.get(key)
+        if not record:
+            return text
+        if text is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if key in self._prefetched:
+            self._prefetched.discard(key)
+            self.prefetch_hits += 1
+        return text
+
+    def put(self, key: Hashable, text: str, prefetched: bool = False) -> None:
+        if len(text) > self.max_chars:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = text
+        self.size += len(text)
+        if prefetched:
+            self._prefetched.add(key)
+        else:
+            self._prefetched.discard(key)
+        while self.size > self.max_chars:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            if evicted_key in self._prefetched:
+                self._prefetched.discard(evicted_key)
+                self.prefetch_evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_chars": self.size,
+            "max_chars": self.max_chars,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_evictions": self.prefetch_evictions,
+            "prefetch_pending": len(self._prefetched),
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,21 +2,34 @@
 Google Drive MCP Adapter for Wai.
 Handles Google Drive-specific document operations.
 """
+import asyncio
+from functools import partial
 from typing import Dict, Any, Optional
 import httpx
 from pydantic import BaseModel
 
+from backend.integrations.extraction import (
+    GOOGLE_EXPORT_FORMATS,
+    BinaryBuffer,
+    ExtractedTextCache,
+    extract_text,
+    get_extractor,
+)
+
 class GoogleDriveConfig(BaseModel):
     """Google Drive specific configuration"""
     base_url: str = "https://mcp.yourdomain.com/google-drive"
     api_key: str
     timeout: int = 30
+    max_extracted_chars: int = 5_000_000
+    spill_threshold_bytes: int = 8 * 1024 * 1024
 
 class GoogleDriveAdapter:
     """Adapter for Google Drive operations via MCP"""
     
-    def __init__(self, config: GoogleDriveConfig):
+    def __init__(self, config: GoogleDriveConfig, cache: Optional[ExtractedTextCache] = None):
         self.config = config
+        self.cache = cache
         self.client = httpx.AsyncClient(
             base_url=config.base_url,
             headers={
@@ -34,10 +47,64 @@ class GoogleDriveAdapter:
                 json={"document_id": document_id}
             )
             response.raise_for_status()
-            return await response.json()
+            return response.json()
         except Exception as e:
             raise Exception(f"Google Drive MCP error: {str(e)}")
 
+    async def extract_document(self, document_id: str, prefetch: bool = False) -> Dict[str, Any]:
+        """
+        Get the text of a document, converting it according to its MIME type.
+
+        Google-native files are exported to text, binary files (PDF, DOCX,
+        XLSX, PPTX) are streamed into a buffer and their text extracted.
+        Other types fall back to `get_document`.
+
+        Args:
+            document_id: ID of the file to extract.
+            prefetch: Whether this is a speculative fetch that should not count
+                towards cache statistics.
+
+        Returns:
+            Dictionary with the extracted `content` and the file `metadata`.
+        """
+        metadata = await self.get_metadata(document_id)
+        mime_type = metadata.get("mimeType", "")
+        modified_time = metadata.get("modifiedTime")
+        cache_key = (document_id, modified_time)
+        # Without a modification time a cached text could never be invalidated
+        cache = self.cache if modified_time else None
+        if cache is not None:
+            content = cache.get(cache_key, record=not prefetch)
+            if content is not None:
+                return {"content": content, "metadata": metadata}
+
+        if mime_type in GOOGLE_EXPORT_FORMATS:
+            mime_type = GOOGLE_EXPORT_FORMATS[mime_type]
+            url, params = f"/files/{document_id}/export", {"mimeType": mime_type}
+        elif get_extractor(mime_type) is not None:
+            url, params = f"/files/{document_id}", {"alt": "media"}
+        else:
+            return await self.get_document(document_id)
+
+        size = metadata.get("size")
+        try:
+            with BinaryBuffer(int(size) if size else None, self.config.spill_threshold_bytes) as buffer:
+                async with self.client.stream("GET", url, params=params) as response:
+                    response.raise_for_status()
+                    charset = response.charset_encoding or "utf-8"
+                    async for chunk in response.aiter_bytes():
+                        buffer.write(chunk)
+                # Extraction is CPU-bound, keep it off the event loop
+                content = await asyncio.get_running_loop().run_in_executor(None, partial(
+                    extract_text, mime_type, buffer, charset, self.config.max_extracted_chars
+                ))
+        except Exception as e:
+            raise Exception(f"Google Drive extraction error: {str(e)}")
+
+        if cache is not None:
+            cache.put(cache_key, content, prefetched=prefetch)
+        return {"content": content, "metadata": metadata}
+
     async def search_documents(self, query: str) -> Dict[str, Any]:
         """Search documents in Google Drive"""
         try:
@@ -46,7 +113,7 @@ class GoogleDriveAdapter:
                 json={"query": query}
             )
             response.raise_for_status()
-            return await response.json()
+            return response.json()
         except Exception as e:
             raise Exception(f"Google Drive search error: {str(e)}")
         
@@ -62,7 +129,7 @@ class GoogleDriveAdapter:
         """
         params = {
             "q": f"'{folder_id}' in parents" if folder_id else None,
-            "fields": "files(id, name, mimeType, modifiedTime)"
+            "fields": "files(id, name, mimeType, size, modifiedTime)"
         }
         try:
             response = await self.client.get("/files", params=params)
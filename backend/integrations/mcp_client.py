@@ -2,16 +2,30 @@
 MCP (Model Context Processor) Client for Wai.
 Provides unified interface to various MCP integrations.
 """
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Any, Hashable, List, Optional, Set, Tuple
 import httpx
 from pydantic import BaseModel
-from backend.integrations.google_drive import GoogleDriveConfig
+from backend.integrations.extraction import ExtractedTextCache
+from backend.integrations.google_drive import GoogleDriveAdapter, GoogleDriveConfig
 
 class MCPConfig(BaseModel):
     """Configuration for MCP service"""
     base_url: str
     api_key: str
     timeout: int = 30
+    document_cache_chars: int = 50_000_000
+    prefetch_enabled: bool = False
+    prefetch_max_files: int = 5
+    prefetch_concurrency: int = 2
+    prefetch_byte_budget: int = 20 * 1024 * 1024
+    metadata_concurrency: int = 16
+    metadata_cache_size: int = 10_000
+    metadata_cache_ttl: float = 300.0
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
 
 class MCPClient:
     """Client for interacting with MCP services."""
@@ -23,6 +37,21 @@ class MCPClient:
             headers={"Authorization": f"Bearer {config.api_key}"},
             timeout=config.timeout
         )
+        self.document_cache = ExtractedTextCache(config.document_cache_chars)
+        self.metadata_cache = MetadataCache(config.metadata_cache_size, config.metadata_cache_ttl)
+        self._google_drive: Optional[GoogleDriveAdapter] = None
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+        self.prefetch_stats = {"started": 0, "completed": 0, "failed": 0, "skipped": 0, "bytes": 0}
+
+    def _google_drive_adapter(self) -> GoogleDriveAdapter:
+        """Return the shared Google Drive adapter, creating it on first use."""
+        if self._google_drive is None:
+            self._google_drive = GoogleDriveAdapter(GoogleDriveConfig(
+                base_url=f"{self.config.base_url}/google-drive",
+                api_key=self.config.api_key,
+                timeout=self.config.timeout
+            ), cache=self.document_cache)
+        return self._google_drive
     
     async def get_documents(self, source: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -36,13 +65,11 @@ class MCPClient:
             Dictionary containing documents and metadata
         """
         if source == "google-drive":
-            from backend.integrations.google_drive import GoogleDriveAdapter
-            adapter = GoogleDriveAdapter(GoogleDriveConfig(
-                base_url=f"{self.config.base_url}/google-drive",
-                api_key=self.config.api_key,
-                timeout=self.config.timeout
-            ))
-            return await adapter.get_document(params["document_id"])
+            adapter = self._google_drive_adapter()
+            result = await adapter.extract_document(params["document_id"])
+            if result.get("metadata"):
+                self.metadata_cache.put((source, params["document_id"]), result["metadata"])
+            return result
         else:
             try:
                 response = await self.client.post(
@@ -54,49 +81,202 @@ class MCPClient:
             except Exception as e:
                 raise Exception(f"MCP {source} error: {str(e)}")
 
-    async def list_files(self, source: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def list_files(self, source: str, params: Dict[str, Any],
+                         prefetch: Optional[bool] = None) -> Dict[str, Any]:
         """
         List files from the specified MCP integration.
 
         Args:
             source: Integration type (e.g., 'google-drive')
             params: Source-specific parameters (e.g., folder_id).
+            prefetch: Warm the document cache with the most recently modified
+                files in the background. Defaults to `config.prefetch_enabled`.
 
         Returns:
             Dictionary containing a list of files and their metadata.
         """
         if source == "google-drive":
-            from backend.integrations.google_drive import GoogleDriveAdapter
-            adapter = GoogleDriveAdapter(GoogleDriveConfig(
-                base_url=f"{self.config.base_url}/google-drive",
-                api_key=self.config.api_key,
-                timeout=self.config.timeout
-            ))
-            return await adapter.list_files(params.get("folder_id"))
+            adapter = self._google_drive_adapter()
+            listing = await adapter.list_files(params.get("folder_id"))
+            if self.config.prefetch_enabled if prefetch is None else prefetch:
+                self._start_prefetch(listing.get("files", []))
+            return listing
         else:
             raise Exception(f"Listing files is not supported for source: {source}")
-    
-    
-async def get_metadata(self, source: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Fetch metadata for a specific file from the specified MCP integration.
-
-    Args:
-        source: Integration type (e.g., 'google-drive')
-        params: Source-specific parameters (e.g., file_id).
-
-    Returns:
-        Dictionary containing file metadata.
-    """
-    if source == "google-drive":
-        from backend.integrations.google_drive import GoogleDriveAdapter
-        adapter = GoogleDriveAdapter(GoogleDriveConfig(
-            base_url=f"{self.config.base_url}/google-drive",
-            api_key=self.config.api_key,
-            timeout=self.config.timeout
-        ))
-        return await adapter.get_metadata(params["file_id"])
-    else:
-        raise Exception(f"Fetching metadata is not supported for source: {source}")
-    
+
+    def _start_prefetch(self, files: List[Dict[str, Any]]) -> None:
+        """Schedule a background prefetch of the most recently modified files."""
+        candidates = [
+            file for file in files
+            if file.get("id")
+            and file.get("mimeType") != FOLDER_MIME_TYPE
+            and (file["id"], file.get("modifiedTime")) not in self.document_cache
+        ]
+        # RFC 3339 timestamps sort chronologically as strings
+        candidates.sort(key=lambda file: file.get("modifiedTime") or "", reverse=True)
+        candidates = candidates[:self.config.prefetch_max_files]
+        if not candidates:
+            return
+        task = asyncio.create_task(self._prefetch(candidates))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch(self, files: List[Dict[str, Any]]) -> None:
+        """
+        Fetch files into the document cache within the configured budget.
+
+        Files with a known size are charged up front; others are charged their
+        extracted length once fetched, so the budget can be exceeded by at most
+        the files already in flight.
+        """
+        adapter = self._google_drive_adapter()
+        semaphore = asyncio.Semaphore(self.config.prefetch_concurrency)
+        budget = self.config.prefetch_byte_budget
+
+        async def fetch(file: Dict[str, Any]):
+            nonlocal budget
+            async with semaphore:
+                size = int(file.get("size") or 0)
+                if budget <= 0 or size > budget:
+                    self.prefetch_stats["skipped"] += 1
+                    return
+                budget -= size
+                self.prefetch_stats["started"] += 1
+                try:
+                    result = await adapter.extract_document(file["id"], prefetch=True)
+                except Exception:
+                    self.prefetch_stats["failed"] += 1
+                    return
+                fetched = size or len(result.get("content", ""))
+                if not size:
+                    budget -= fetched
+                self.prefetch_stats["completed"] += 1
+                self.prefetch_stats["bytes"] += fetched
+
+        await asyncio.gather(*(fetch(file) for file in files))
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Report document cache and prefetch statistics.
+
+        `prefetch.hit_rate` is the share of completed prefetches that were
+        later requested, which is the figure to watch when tuning the budget.
+        """
+        cache = self.document_cache.stats()
+        completed = self.prefetch_stats["completed"]
+        return {
+            "document_cache": cache,
+            "prefetch": {
+                **self.prefetch_stats,
+                "in_flight": len(self._prefetch_tasks),
+                "hits": cache["prefetch_hits"],
+                "hit_rate": cache["prefetch_hits"] / completed if completed else 0.0,
+            },
+        }
+
+
+    async def get_metadata(self, source: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch metadata for a specific file from the specified MCP integration.
+
+        Args:
+            source: Integration type (e.g., 'google-drive')
+            params: Source-specific parameters (e.g., file_id).
+
+        Returns:
+            Dictionary containing file metadata.
+        """
+        if source == "google-drive":
+            cached = self.metadata_cache.get((source, params["file_id"]))
+            if cached is not None:
+                return cached
+            return await self._fetch_metadata(source, params["file_id"])
+        else:
+            raise Exception(f"Fetching metadata is not supported for source: {source}")
+
+    def iter_metadata(self, source: str, file_ids: List[str],
+                      concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch metadata for many files, yielding results as they complete.
+
+        Cached entries are yielded first, the rest are fetched with at most
+        `concurrency` requests in flight. Each result is a dictionary with the
+        `file_id` and either its `metadata` or an `error` message.
+
+        Args:
+            source: Integration type (e.g., 'google-drive')
+            file_ids: IDs of the files to fetch metadata for; duplicates are ignored.
+            concurrency: Maximum parallel requests (defaults to config.metadata_concurrency).
+
+        Returns:
+            Async iterator of per-file results.
+        """
+        if source != "google-drive":
+            raise Exception(f"Fetching metadata is not supported for source: {source}")
+        return self._iter_metadata(source, file_ids, concurrency or self.config.metadata_concurrency)
+
+    async def _iter_metadata(self, source: str, file_ids: List[str],
+                             concurrency: int) -> AsyncIterator[Dict[str, Any]]:
+        pending = []
+        for file_id in dict.fromkeys(file_ids):
+            cached = self.metadata_cache.get((source, file_id))
+            if cached is not None:
+                yield {"file_id": file_id, "metadata": cached, "cached": True}
+            else:
+                pending.append(file_id)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(file_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    metadata = await self._fetch_metadata(source, file_id)
+                except Exception as e:
+                    return {"file_id": file_id, "error": str(e)}
+                return {"file_id": file_id, "metadata": metadata, "cached": False}
+
+        tasks = [asyncio.create_task(fetch(file_id)) for file_id in pending]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Stop outstanding requests if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_metadata(self, source: str, file_id: str) -> Dict[str, Any]:
+        """Fetch metadata from the integration and store it in the cache."""
+        metadata = await self._google_drive_adapter().get_metadata(file_id)
+        self.metadata_cache.put((source, file_id), metadata)
+        return metadata
+
     # Add other MCP methods as needed
+
+
+class MetadataCache:
+    """LRU cache of file metadata whose entries expire after a fixed TTL."""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,166 @@
+"""
+Tests for document content extraction.
+"""
+import io
+import zipfile
+
+import httpx
+import pytest
+
+from backend.integrations.extraction import (
+    DOCX_MIME_TYPE,
+    XLSX_MIME_TYPE,
+    BinaryBuffer,
+    ExtractedTextCache,
+    ExtractionError,
+    extract_text,
+)
+from backend.integrations.google_drive import GoogleDriveAdapter, GoogleDriveConfig
+
+
+def make_buffer(data: bytes, **kwargs) -> BinaryBuffer:
+    buffer = BinaryBuffer(**kwargs)
+    for start in range(0, len(data), 7):
+        buffer.write(data[start:start + 7])
+    return buffer
+
+
+def make_zip(members: dict) -> bytes:
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return output.getvalue()
+
+
+def test_buffer_preallocates_and_spills():
+    with make_buffer(b"x" * 100, expected_size=100) as buffer:
+        assert not buffer.spilled
+        assert buffer.view().tobytes() == b"x" * 100
+
+    with make_buffer(b"abcdefghij" * 10, spill_threshold=32) as buffer:
+        assert buffer.spilled
+        assert buffer.view().tobytes() == b"abcdefghij" * 10
+        assert buffer.open().read(4) == b"abcd"
+
+
+def test_plain_text_decodes_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr("backend.integrations.extraction.DECODE_CHUNK_SIZE", 3)
+    text = "héllo wörld ✓"
+    with make_buffer(text.encode("utf-8")) as buffer:
+        assert extract_text("text/plain", buffer) == text
+    with make_buffer(text.encode("utf-8")) as buffer:
+        assert extract_text("text/plain", buffer, max_chars=5) == "héllo"
+
+
+def test_docx_extraction():
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        "<w:p><w:r><w:t>Hello</w:t></w:r><w:r><w:t> world</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>Second</w:t></w:r></w:p>"
+        "</w:body></w:document>"
+    )
+    with make_buffer(make_zip({"word/document.xml": document})) as buffer:
+        assert extract_text(DOCX_MIME_TYPE, buffer) == "Hello world\nSecond\n"
+
+
+def test_xlsx_extraction():
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    shared = f"<sst {ns}><si><t>Name</t></si><si><t>Alice</t></si></sst>"
+    sheet = (
+        f"<worksheet {ns}><sheetData>"
+        '<row><c t="s"><v>0</v></c><c><v>1</v></c></row>'
+        '<row><c t="s"><v>1</v></c><c><v>42</v></c></row>'
+        "</sheetData></worksheet>"
+    )
+    data = make_zip({"xl/sharedStrings.xml": shared, "xl/worksheets/sheet1.xml": sheet})
+    with make_buffer(data) as buffer:
+        assert extract_text(XLSX_MIME_TYPE, buffer) == "Name\t1\nAlice\t42\n"
+
+
+def test_xlsx_extraction_places_sparse_cells():
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    shared = f"<sst {ns}><si><t>Name</t></si></sst>"
+    sheet = (
+        f"<worksheet {ns}><sheetData>"
+        '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="C1"><v>3</v></c></row>'
+        '<row r="2"><c r="B2" t="s"><v>7</v></c><c r="AA2"><v>27</v></c></row>'
+        "</sheetData></worksheet>"
+    )
+    data = make_zip({"xl/sharedStrings.xml": shared, "xl/worksheets/sheet1.xml": sheet})
+    with make_buffer(data) as buffer:
+        assert extract_text(XLSX_MIME_TYPE, buffer) == "Name\t\t3\n" + "\t" * 26 + "27\n"
+
+
+def test_unsupported_and_invalid_documents():
+    with make_buffer(b"\x00\x01") as buffer:
+        with pytest.raises(ExtractionError):
+            extract_text("image/png", buffer)
+        with pytest.raises(ExtractionError):
+            extract_text(DOCX_MIME_TYPE, buffer)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ExtractedTextCache(max_chars=10)
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    assert cache.get("a") == "12345"
+    cache.put("c", "12345")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.size == 10
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_extract_document_exports_and_caches():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/files/doc-1":
+            return httpx.Response(200, json={
+                "id": "doc-1",
+                "mimeType": "application/vnd.google-apps.document",
+                "modifiedTime": "2024-01-01T00:00:00Z",
+            })
+        assert request.url.path == "/files/doc-1/export"
+        assert request.url.params["mimeType"] == "text/plain"
+        return httpx.Response(200, content="Exported text".encode(), headers={"Content-Type": "text/plain"})
+
+    adapter = GoogleDriveAdapter(
+        GoogleDriveConfig(base_url="https://test-mcp.example.com", api_key="test-api-key"),
+        cache=ExtractedTextCache(),
+    )
+    adapter.client = httpx.AsyncClient(base_url="https://test-mcp.example.com", transport=httpx.MockTransport(handler))
+
+    result = await adapter.extract_document("doc-1")
+    assert result["content"] == "Exported text"
+    assert result["metadata"]["id"] == "doc-1"
+
+    cached = await adapter.extract_document("doc-1")
+    assert cached["content"] == "Exported text"
+    # Only the metadata lookup is repeated on a cache hit
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_extract_document_without_modified_time_is_not_cached():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/files/doc-1":
+            return httpx.Response(200, json={"id": "doc-1", "mimeType": "application/vnd.google-apps.document"})
+        return httpx.Response(200, content=f"Version {len(requests)}".encode(), headers={"Content-Type": "text/plain"})
+
+    cache = ExtractedTextCache()
+    adapter = GoogleDriveAdapter(
+        GoogleDriveConfig(base_url="https://test-mcp.example.com", api_key="test-api-key"),
+        cache=cache,
+    )
+    adapter.client = httpx.AsyncClient(base_url="https://test-mcp.example.com", transport=httpx.MockTransport(handler))
+
+    assert (await adapter.extract_document("doc-1"))["content"] == "Version 2"
+    assert (await adapter.extract_document("doc-1"))["content"] == "Version 4"
+    assert cache.size == 0
@@ -3,7 +3,7 @@ Tests for Google Drive MCP integration.
 """
 import pytest
 import pytest_asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from backend.integrations.google_drive import GoogleDriveAdapter, GoogleDriveConfig
 
 @pytest_asyncio.fixture
@@ -28,7 +28,7 @@ async def test_get_document_success(mock_adapter):
     }
 
     with patch.object(mock_adapter.client, 'post', new_callable=AsyncMock) as mock_post:
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = expected_response
         mock_post.return_value = mock_response
@@ -65,7 +65,7 @@ async def test_search_documents_success(mock_adapter):
     }
 
     with patch.object(mock_adapter.client, 'post', new_callable=AsyncMock) as mock_post:
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = expected_response
         mock_post.return_value = mock_response
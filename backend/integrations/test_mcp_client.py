@@ -1,9 +1,12 @@
 """
 Tests for MCP client integration.
 """
+import asyncio
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch
-from backend.integrations.mcp_client import MCPClient, MCPConfig
+from backend.integrations.mcp_client import MCPClient, MCPConfig, MetadataCache
 from backend.integrations.google_drive import GoogleDriveAdapter
 
 @pytest.fixture
@@ -27,7 +30,7 @@ async def test_google_drive_integration(mock_client):
         "metadata": {"id": test_doc_id}
     }
 
-    with patch('backend.integrations.google_drive.GoogleDriveAdapter.get_document', 
+    with patch('backend.integrations.google_drive.GoogleDriveAdapter.extract_document', 
               new_callable=AsyncMock) as mock_get:
         mock_get.return_value = expected_response
 
@@ -37,3 +40,111 @@ async def test_google_drive_integration(mock_client):
         )
         assert result == expected_response
         mock_get.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_list_files_prefetches_recent_files():
+    """Test speculative prefetch of recently modified files"""
+    files = [
+        {"id": "old", "mimeType": "text/plain", "modifiedTime": "2024-01-01T00:00:00Z"},
+        {"id": "new", "mimeType": "text/plain", "modifiedTime": "2024-03-01T00:00:00Z"},
+        {"id": "mid", "mimeType": "text/plain", "modifiedTime": "2024-02-01T00:00:00Z"},
+        {"id": "dir", "mimeType": "application/vnd.google-apps.folder", "modifiedTime": "2024-04-01T00:00:00Z"},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/google-drive/files":
+            return httpx.Response(200, json={"files": files})
+        file_id = request.url.path.split("/")[-1]
+        if request.url.params.get("alt") == "media":
+            return httpx.Response(200, content=f"content of {file_id}".encode())
+        return httpx.Response(200, json=next(f for f in files if f["id"] == file_id))
+
+    client = MCPClient(MCPConfig(
+        base_url="https://test-mcp.example.com",
+        api_key="test-api-key",
+        prefetch_enabled=True,
+        prefetch_max_files=2,
+    ))
+    adapter = client._google_drive_adapter()
+    adapter.client = httpx.AsyncClient(
+        base_url="https://test-mcp.example.com/google-drive",
+        transport=httpx.MockTransport(handler),
+    )
+
+    listing = await client.list_files("google-drive", {"folder_id": None})
+    assert listing == {"files": files}
+    await asyncio.gather(*client._prefetch_tasks)
+
+    assert ("new", "2024-03-01T00:00:00Z") in client.document_cache
+    assert ("mid", "2024-02-01T00:00:00Z") in client.document_cache
+    assert ("old", "2024-01-01T00:00:00Z") not in client.document_cache
+
+    result = await client.get_documents("google-drive", {"document_id": "new"})
+    assert result["content"] == "content of new"
+
+    stats = client.cache_stats()
+    assert stats["prefetch"]["completed"] == 2
+    assert stats["prefetch"]["hits"] == 1
+    assert stats["prefetch"]["hit_rate"] == 0.5
+    assert stats["document_cache"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_metadata_bounded_and_cached():
+    """Test bulk metadata fan-out, error reporting and caching"""
+    in_flight = 0
+    max_in_flight = 0
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        file_id = request.url.path.split("/")[-1]
+        calls.append(file_id)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if file_id == "missing":
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json={"id": file_id, "mimeType": "text/plain"})
+
+    client = MCPClient(MCPConfig(
+        base_url="https://test-mcp.example.com",
+        api_key="test-api-key",
+        metadata_concurrency=3,
+    ))
+    client._google_drive_adapter().client = httpx.AsyncClient(
+        base_url="https://test-mcp.example.com/google-drive",
+        transport=httpx.MockTransport(handler),
+    )
+    file_ids = [f"file-{i}" for i in range(10)] + ["missing", "file-0"]
+
+    results = [r async for r in client.iter_metadata("google-drive", file_ids)]
+    assert len(results) == 11
+    assert max_in_flight <= 3
+    errors = [r for r in results if "error" in r]
+    assert [r["file_id"] for r in errors] == ["missing"]
+
+    calls.clear()
+    again = [r async for r in client.iter_metadata("google-drive", ["file-1", "file-2"])]
+    assert calls == []
+    assert all(r["cached"] for r in again)
+    assert await client.get_metadata("google-drive", {"file_id": "file-3"}) == {"id": "file-3", "mimeType": "text/plain"}
+
+    with pytest.raises(Exception):
+        client.iter_metadata("notion", ["page"])
+
+
+def test_metadata_cache_expires_entries():
+    """Test TTL expiry and size bound of the metadata cache"""
+    cache = MetadataCache(max_entries=2, ttl=60)
+    cache.put("a", {"id": "a"})
+    cache.put("b", {"id": "b"})
+    cache.put("c", {"id": "c"})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"id": "c"}
+
+    expired = MetadataCache(ttl=-1)
+    expired.put("a", {"id": "a"})
+    assert expired.get("a") is None
@@ -0,0 +1,126 @@
+"""Benchmark the HTML extractors of the fetch server over a corpus of saved pages.
+
+For every page and extractor this reports the latency of
+extract_content_from_html, its peak memory and how well the markdown matches
+the page's main content.
+
+Run from servers/src/fetch:
+
+    uv run python benchmarks/extraction.py [--corpus DIR] [--extractor NAME ...] [--repeat N]
+
+Quality is the F1 score of the words in the output against a reference text:
+the text of the elements marked `data-main-content` (minus any marked
+`data-boilerplate`) when the page has them, otherwise the output of the first
+extractor. Memory is the peak Python allocation during extraction plus the
+peak resident size of child processes, which is where the Node based
+readability extractor does its work.
+"""
+
+import argparse
+import re
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from lxml import html
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_server_fetch.server import EXTRACTORS, extract_content_from_html  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "corpus"
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> Counter:
+    return Counter(word.lower() for word in _WORD.findall(text))
+
+
+def f1(output: Counter, reference: Counter) -> float:
+    common = sum((output & reference).values())
+    if not common:
+        return 0.0
+    precision = common / sum(output.values())
+    recall = common / sum(reference.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def marked_content(page: str) -> str | None:
+    """Text of the elements marked as the page's main content, if any."""
+    document = html.document_fromstring(page.encode("utf-8"))
+    marked = document.xpath("//*[@data-main-content]")
+    if not marked:
+        return None
+    for element in document.xpath("//*[@data-boilerplate]"):
+        element.drop_tree()
+    return "\n".join(element.text_content() for element in marked)
+
+
+def measure(page: str, extractor: str, repeat: int) -> dict:
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    timings = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = extract_content_from_html(page, extractor)
+        timings.append(time.perf_counter() - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "output": output,
+        "median_ms": statistics.median(timings) * 1000,
+        "peak_kib": peak / 1024,
+        # ru_maxrss is the largest child so far, so only a new maximum shows up here
+        "child_rss_kib": children_after if children_after > children_before else 0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved .html pages")
+    parser.add_argument(
+        "--extractor",
+        action="append",
+        choices=EXTRACTORS,
+        help="Extractor to benchmark, may be repeated (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Extractions per page, the median is reported")
+    args = parser.parse_args()
+    extractors = args.extractor or list(EXTRACTORS)
+
+    pages = sorted(args.corpus.glob("*.html"))
+    if not pages:
+        parser.error(f"no .html files in {args.corpus}")
+
+    print(f"{'page':<24} {'extractor':<12} {'median ms':>10} {'peak KiB':>10} {'child KiB':>10} {'chars':>8} {'F1':>6}")
+    totals: dict[str, list[tuple[float, float]]] = {name: [] for name in extractors}
+    for path in pages:
+        page = path.read_text(encoding="utf-8", errors="replace")
+        reference = marked_content(page)
+        for name in extractors:
+            result = measure(page, name, args.repeat)
+            if reference is None:
+                reference = result["output"]
+            score = f1(words(result["output"]), words(reference))
+            totals[name].append((result["median_ms"], score))
+            print(
+                f"{path.stem[:24]:<24} {name:<12} {result['median_ms']:>10.2f} {result['peak_kib']:>10.0f} "
+                f"{result['child_rss_kib']:>10.0f} {len(result['output']):>8} {score:>6.3f}"
+            )
+
+    print()
+    for name, results in totals.items():
+        print(
+            f"{name:<12} total {sum(ms for ms, _ in results):.1f} ms, "
+            f"mean F1 {statistics.mean(score for _, score in results):.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Benchmark the fetch server end to end against a local site.
+
+This starts the server in a subprocess, talks to it over stdio the way an
+MCP client does and reports, for `call_tool`:
+
+- latency: each corpus page fetched once from a fresh URL (cold) and then
+  again from the same URL (warm, served after revalidation)
+- large pages: a 5 MB text page read in the first window and in chunks
+- throughput: pages per second for `fetch` calls issued at several
+  concurrency levels, and for one `fetch_many` batch
+- memory: the peak resident size of the server process
+
+Run from servers/src/fetch:
+
+    uv run python benchmarks/fetch.py [--extractor NAME] [--delay SECONDS] [--requests N] [--concurrency N ...]
+
+`--delay` makes the local site wait before every answer, to stand in for
+network latency. Cold URLs get a query string so no cache answers them.
+"""
+
+import argparse
+import asyncio
+import itertools
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+
+from local_site import LocalSite, fetch_server  # noqa: E402
+from mcp_server_fetch.server import EXTRACTORS  # noqa: E402
+
+LARGE_PAGE_BYTES = 5_000_000
+_fresh = itertools.count()
+
+
+def fresh(url: str) -> str:
+    """`url` with a query string no cache has seen."""
+    return f"{url}?n={next(_fresh)}"
+
+
+async def timed_call(session, name: str, arguments: dict) -> float:
+    start = time.perf_counter()
+    result = await session.call_tool(name, arguments)
+    elapsed = time.perf_counter() - start
+    if result.isError:
+        raise RuntimeError(f"{name} {arguments} failed: {result.content[0].text}")
+    return elapsed
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<36} {len(timings):>6} {statistics.median(timings) * 1000:>10.1f} "
+        f"{percentile(timings, 0.95) * 1000:>10.1f} {max(timings) * 1000:>10.1f}"
+    )
+
+
+async def latency(session, site: LocalSite, repeat: int) -> None:
+    print(f"{'latency':<36} {'calls':>6} {'median ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for name in site.pages():
+        url = site.url(f"/pages/{name}")
+        report(f"{name} cold", [await timed_call(session, "fetch", {"url": fresh(url)}) for _ in range(repeat)])
+        await timed_call(session, "fetch", {"url": url})
+        report(f"{name} warm", [await timed_call(session, "fetch", {"url": url}) for _ in range(repeat)])
+
+    url = site.url(f"/text/{LARGE_PAGE_BYTES}")
+    report("large page, first window", [
+        await timed_call(session, "fetch", {"url": fresh(url), "raw": True}) for _ in range(repeat)
+    ])
+    report("large page, first chunk", [
+        await timed_call(session, "fetch", {"url": fresh(url), "chunk": 0, "max_length": 100_000}) for _ in range(repeat)
+    ])
+    report("large page, later chunks", [
+        await timed_call(session, "fetch", {"url": url, "chunk": chunk, "max_length": 100_000})
+        for chunk in range(1, repeat + 1)
+    ])
+    print()
+
+
+async def throughput(session, site: LocalSite, requests: int, levels: list[int]) -> None:
+    print(f"{'throughput':<36} {'calls':>6} {'pages/s':>10} {'median ms':>10} {'p95 ms':>10}")
+    urls = [site.url(f"/pages/{name}") for name in site.pages()]
+    for concurrency in levels:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def call(url: str) -> float:
+            async with slots:
+                return await timed_call(session, "fetch", {"url": fresh(url)})
+
+        start = time.perf_counter()
+        timings = await asyncio.gather(*(call(urls[n % len(urls)]) for n in range(requests)))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{f'fetch, concurrency {concurrency}':<36} {requests:>6} {requests / elapsed:>10.1f} "
+            f"{statistics.median(timings) * 1000:>10.1f} {percentile(timings, 0.95) * 1000:>10.1f}"
+        )
+
+    batch = [fresh(urls[n % len(urls)]) for n in range(min(requests, 50))]
+    elapsed = await timed_call(session, "fetch_many", {"urls": batch})
+    print(f"{'fetch_many':<36} {len(batch):>6} {len(batch) / elapsed:>10.1f} {elapsed * 1000:>10.1f} {'':>10}")
+    print()
+
+
+async def run(args: argparse.Namespace) -> None:
+    server_args = ["--extractor", args.extractor]
+    if args.extract_workers is not None:
+        server_args += ["--extract-workers", str(args.extract_workers)]
+    with LocalSite(delay=args.delay) as site:
+        async with fetch_server(*server_args) as session:
+            await latency(session, site, args.repeat)
+            await throughput(session, site, args.requests, args.concurrency)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--extractor", choices=EXTRACTORS, default="lxml", help="Extractor the server uses")
+    parser.add_argument("--extract-workers", type=int, help="Extraction workers of the server")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds the local site waits before answering")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls per latency measurement")
+    parser.add_argument("--requests", type=int, default=100, help="Calls per throughput measurement")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        action="append",
+        help="Concurrent calls for a throughput measurement, may be repeated (default: 1, 4 and 16)",
+    )
+    args = parser.parse_args()
+    args.concurrency = args.concurrency or [1, 4, 16]
+
+    asyncio.run(run(args))
+    # The server has exited, so it is counted among the finished children.
+    # ru_maxrss is the largest single process: the server or one of its workers.
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(f"peak server RSS {peak / 1024:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,19 @@
-from .server import serve
+from .server import (
+    DEFAULT_CONTENT_CACHE_BYTES,
+    DEFAULT_EXTRACT_TIMEOUT,
+    DEFAULT_EXTRACT_WORKERS,
+    DEFAULT_EXTRACTOR,
+    DEFAULT_HTTP_CACHE_BYTES,
+    DEFAULT_MAX_CONCURRENT_FETCHES,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    DEFAULT_MAX_DOWNLOAD_BYTES,
+    DEFAULT_MAX_EXTRACT_CHARS,
+    DEFAULT_ROBOTS_CACHE_SIZE,
+    DEFAULT_ROBOTS_TTL,
+    EXTRACTORS,
+    serve,
+)
 
 
 def main():
@@ -15,9 +30,104 @@ def main():
         action="store_true",
         help="Ignore robots.txt restrictions",
     )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS,
+        help="Maximum number of open connections across all hosts",
+    )
+    parser.add_argument(
+        "--max-connections-per-host",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        help="Maximum number of concurrent requests to a single host",
+    )
+    parser.add_argument(
+        "--robots-cache-size",
+        type=int,
+        default=DEFAULT_ROBOTS_CACHE_SIZE,
+        help="Number of sites whose robots.txt is cached (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--robots-ttl",
+        type=float,
+        default=DEFAULT_ROBOTS_TTL,
+        help="Seconds to cache a robots.txt that sets no Cache-Control max-age",
+    )
+    parser.add_argument(
+        "--content-cache-bytes",
+        type=int,
+        default=DEFAULT_CONTENT_CACHE_BYTES,
+        help="Memory budget for fetched pages kept for start_index continuation calls",
+    )
+    parser.add_argument(
+        "--extractor",
+        choices=EXTRACTORS,
+        default=DEFAULT_EXTRACTOR,
+        help="How to find the main content of HTML pages: readability (Node) or lxml (in-process)",
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=DEFAULT_EXTRACT_WORKERS,
+        help="Worker processes that simplify HTML (0 runs it in a thread)",
+    )
+    parser.add_argument(
+        "--extract-timeout",
+        type=float,
+        default=DEFAULT_EXTRACT_TIMEOUT,
+        help="Seconds a page may take to be simplified",
+    )
+    parser.add_argument(
+        "--max-extract-chars",
+        type=int,
+        default=DEFAULT_MAX_EXTRACT_CHARS,
+        help="Longest page, in characters, that is simplified to markdown",
+    )
+    parser.add_argument(
+        "--max-download-bytes",
+        type=int,
+        default=DEFAULT_MAX_DOWNLOAD_BYTES,
+        help="Stop downloading a response after this many bytes",
+    )
+    parser.add_argument(
+        "--max-concurrent-fetches",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_FETCHES,
+        help="Maximum number of URLs fetched at the same time by fetch_many",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory for an on-disk HTTP cache that persists across restarts (disabled if not set)",
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_HTTP_CACHE_BYTES,
+        help="Size limit of the on-disk HTTP cache",
+    )
 
     args = parser.parse_args()
-    asyncio.run(serve(args.user_agent, args.ignore_robots_txt))
+    asyncio.run(
+        serve(
+            args.user_agent,
+            args.ignore_robots_txt,
+            max_connections=args.max_connections,
+            max_connections_per_host=args.max_connections_per_host,
+            robots_cache_size=args.robots_cache_size,
+            robots_ttl=args.robots_ttl,
+            content_cache_bytes=args.content_cache_bytes,
+            extractor=args.extractor,
+            extract_workers=args.extract_workers,
+            extract_timeout=args.extract_timeout,
+            max_extract_chars=args.max_extract_chars,
+            max_download_bytes=args.max_download_bytes,
+            max_concurrent_fetches=args.max_concurrent_fetches,
+            cache_dir=args.cache_dir,
+            cache_max_bytes=args.cache_max_bytes,
+        )
+    )
 
 
 if __name__ == "__main__":
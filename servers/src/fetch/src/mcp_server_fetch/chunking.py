@@ -0,0 +1,130 @@
+"""Splitting of simplified pages into chunks on structural boundaries.
+
+Content is first cut into blocks: paragraphs separated by blank lines,
+with fenced code blocks and tables kept whole. Blocks are then packed
+greedily into chunks of at most `max_chars` characters, starting a new
+chunk at a heading once the current one is half full. Only blocks longer
+than a whole chunk are split, at line and then word boundaries.
+"""
+
+import re
+from dataclasses import dataclass
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HEADING = re.compile(r"^ {0,3}#{1,6}\s", re.M)
+_TABLE_ROW = re.compile(r"^\s*\|")
+
+
+@dataclass
+class Chunk:
+    """A chunk of content, as character and UTF-8 byte offsets into it."""
+
+    start: int
+    end: int
+    byte_start: int
+    byte_end: int
+    title: str
+
+
+def _blocks(content: str) -> list[tuple[int, int]]:
+    """Character spans of the paragraphs, code blocks and tables of `content`."""
+    blocks = []
+    start = None
+    fence = None
+    in_table = False
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if fence is not None:
+            # Inside a code block, only the closing fence ends it
+            if stripped.startswith(fence):
+                fence = None
+        elif match := _FENCE.match(line):
+            if start is not None:
+                blocks.append((start, offset))
+            fence = match.group(1)
+            start = offset
+            in_table = False
+        elif not stripped:
+            if start is not None:
+                blocks.append((start, offset))
+                start = None
+            in_table = False
+        else:
+            is_row = bool(_TABLE_ROW.match(line))
+            if start is not None and (_HEADING.match(line) or is_row != in_table):
+                # Headings and tables start blocks of their own
+                blocks.append((start, offset))
+                start = None
+            if start is None:
+                start = offset
+            in_table = is_row
+        offset += len(line)
+    if start is not None:
+        blocks.append((start, offset))
+    return blocks
+
+
+def _split_long(content: str, start: int, end: int, max_chars: int) -> list[tuple[int, int]]:
+    """Split a block longer than `max_chars` at line, then word, boundaries."""
+    pieces = []
+    while end - start > max_chars:
+        limit = start + max_chars
+        cut = content.rfind("\n", start, limit)
+        if cut <= start:
+            cut = content.rfind(" ", start, limit)
+        cut = limit if cut <= start else cut + 1
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def _title(content: str, start: int, end: int) -> str:
+    for line in content[start:end].splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return ""
+
+
+def split_chunks(content: str, max_chars: int) -> list[Chunk]:
+    """Split `content` into chunks of at most `max_chars` characters on structural boundaries.
+
+    Blank lines between two chunks belong to neither of them.
+    """
+    spans: list[tuple[int, int]] = []
+    for start, end in _blocks(content):
+        if end - start > max_chars:
+            spans.extend(_split_long(content, start, end, max_chars))
+        else:
+            spans.append((start, end))
+
+    bounds: list[tuple[int, int]] = []
+    current: list[tuple[int, int]] = []
+    for start, end in spans:
+        if current:
+            full = end - current[0][0] > max_chars
+            heading = _HEADING.match(content, start) is not None
+            if full or (heading and current[-1][1] - current[0][0] >= max_chars // 2):
+                carried = []
+                if full and len(current) > 1 and _HEADING.match(content, current[-1][0]):
+                    # Carry a trailing heading over to the chunk with its section
+                    carried = [current.pop()]
+                    if end - carried[0][0] > max_chars:
+                        current.append(carried.pop())
+                bounds.append((current[0][0], current[-1][1]))
+                current = carried
+        current.append((start, end))
+    if current:
+        bounds.append((current[0][0], current[-1][1]))
+    if not bounds:
+        bounds.append((0, len(content)))
+
+    chunks = []
+    position = byte_offset = 0
+    for start, end in bounds:
+        byte_start = byte_offset + len(content[position:start].encode("utf-8"))
+        byte_end = byte_start + len(content[start:end].encode("utf-8"))
+        chunks.append(Chunk(start, end, byte_start, byte_end, _title(content, start, end)))
+        position, byte_offset = end, byte_end
+    return chunks
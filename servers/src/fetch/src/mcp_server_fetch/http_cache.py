@@ -0,0 +1,393 @@
+"""On-disk HTTP cache for the fetch server's client.
+
+Follows RFC 9111 for a private cache: responses are stored with their
+headers, served without a request while they are fresh, and revalidated
+with If-None-Match/If-Modified-Since once they are stale. Entries survive
+server restarts and the directory may be shared by several servers.
+
+Each entry is a `<key>.json` metadata file naming a `<key>.<token>.body`
+file, so replacing an entry is a single rename of its metadata.
+"""
+
+import email.utils
+import hashlib
+import json
+import os
+import re
+import secrets
+import time
+from typing import BinaryIO
+
+from httpx import AsyncBaseTransport, AsyncByteStream, Headers, Request, Response
+
+DEFAULT_HTTP_CACHE_BYTES = 256 * 1024 * 1024
+# Responses with no explicit lifetime stay fresh for 10% of the time since
+# they were last modified (RFC 9111 section 4.2.2), at most this long.
+MAX_HEURISTIC_LIFETIME = 86400.0
+HEURISTICALLY_CACHEABLE = (200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501)
+READ_CHUNK_SIZE = 64 * 1024
+# Headers of a 304 response that must not replace the stored ones (RFC 9111 section 3.2)
+_NOT_UPDATED = ("content-length", "content-encoding", "transfer-encoding", "content-range")
+
+_KEY = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _directives(value: str) -> dict[str, str | None]:
+    """Parse a Cache-Control header into {directive: argument}."""
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _seconds(value: str | None) -> float | None:
+    try:
+        return float(int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def freshness_lifetime(status_code: int, headers: Headers, response_time: float) -> float:
+    """Seconds a stored response is fresh for (RFC 9111 section 4.2.1)."""
+    directives = _directives(headers.get("cache-control", ""))
+    if "no-cache" in directives:
+        return 0.0
+    max_age = _seconds(directives.get("max-age"))
+    if max_age is not None:
+        return max_age
+    date = _http_date(headers.get("date")) or response_time
+    if "expires" in headers:
+        expires = _http_date(headers["expires"])
+        return max(expires - date, 0.0) if expires is not None else 0.0
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None and status_code in HEURISTICALLY_CACHEABLE:
+        return min(max(date - last_modified, 0.0) * 0.1, MAX_HEURISTIC_LIFETIME)
+    return 0.0
+
+
+def current_age(headers: Headers, request_time: float, response_time: float, now: float) -> float:
+    """Age of a stored response (RFC 9111 section 4.2.3)."""
+    date = _http_date(headers.get("date")) or response_time
+    apparent_age = max(0.0, response_time - date)
+    corrected_age = (_seconds(headers.get("age")) or 0.0) + (response_time - request_time)
+    return max(apparent_age, corrected_age) + (now - response_time)
+
+
+class _FileStream(AsyncByteStream):
+    """Body of a cached response, read from an already opened file."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+
+    async def __aiter__(self):
+        while chunk := self._file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+    async def aclose(self) -> None:
+        self._file.close()
+
+
+class _StoringStream(AsyncByteStream):
+    """Response body that is written to the cache as it is read.
+
+    The entry is only committed if the whole body was read; a response that
+    is closed early, or grows past the entry size limit, is not stored.
+    """
+
+    def __init__(self, stream: AsyncByteStream, cache: "HttpCacheTransport", key: str, meta: dict) -> None:
+        self._stream = stream
+        self._cache = cache
+        self._key = key
+        self._meta = meta
+        self._body = f"{key}.{secrets.token_hex(4)}.body"
+        self._file: BinaryIO | None = open(os.path.join(cache.directory, self._body), "wb")
+        self._size = 0
+        self._complete = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            if self._file is not None:
+                self._size += len(chunk)
+                if self._size > self._cache.max_entry_bytes:
+                    self._abandon()
+                else:
+                    self._file.write(chunk)
+            yield chunk
+        self._complete = True
+
+    def _abandon(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        _remove(os.path.join(self._cache.directory, self._body))
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._file is not None:
+                if self._complete:
+                    self._file.close()
+                    self._file = None
+                    self._meta["body"] = self._body
+                    self._cache._commit(self._key, self._meta, self._size)
+                else:
+                    self._abandon()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class HttpCacheTransport(AsyncBaseTransport):
+    """Transport that caches GET responses in `directory`, up to `max_bytes` of bodies.
+
+    The least recently used entries are evicted first. Only one variant
+    (per the Vary header) of each URL is kept.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        directory: str,
+        max_bytes: int = DEFAULT_HTTP_CACHE_BYTES,
+        clock=time.time,
+    ) -> None:
+        self._transport = transport
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self._clock = clock
+        # key -> [last used, body size]
+        self._index: dict[str, list] = {}
+        self.size = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_index(self) -> None:
+        bodies = set()
+        for entry in os.scandir(self.directory):
+            key, _, extension = entry.name.partition(".")
+            if extension == "json" and _KEY.match(key):
+                try:
+                    with open(entry.path, encoding="utf-8") as file:
+                        body = json.load(file)["body"]
+                    size = os.stat(self._path(body)).st_size
+                except (OSError, ValueError, KeyError):
+                    _remove(entry.path)
+                    continue
+                bodies.add(body)
+                self._index[key] = [entry.stat().st_mtime, size]
+                self.size += size
+        # Bodies left behind by entries that were replaced or never committed
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".body") and entry.name not in bodies:
+                if entry.stat().st_mtime < self._clock() - 3600:
+                    _remove(entry.path)
+
+    def _open(self, key: str, request: Request) -> tuple[dict, BinaryIO] | None:
+        """Stored metadata and open body file for `request`, if there is a matching entry."""
+        try:
+            with open(self._path(f"{key}.json"), encoding="utf-8") as file:
+                meta = json.load(file)
+            body = open(self._path(meta["body"]), "rb")
+        except (OSError, ValueError, KeyError):
+            self._forget(key)
+            return None
+        for name, value in meta["vary"].items():
+            if request.headers.get(name) != value:
+                body.close()
+                return None
+        return meta, body
+
+    def _forget(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def _touch(self, key: str) -> None:
+        now = self._clock()
+        if key in self._index:
+            self._index[key][0] = now
+        try:
+            os.utime(self._path(f"{key}.json"), (now, now))
+        except OSError:
+            pass
+
+    def _write_meta(self, key: str, meta: dict) -> None:
+        temporary = self._path(f".{key}.{secrets.token_hex(4)}.tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+        os.replace(temporary, self._path(f"{key}.json"))
+
+    def _commit(self, key: str, meta: dict, size: int) -> None:
+        previous = None
+        try:
+            with open(self._path(f"{key}.json"), encoding="utf-8") as file:
+                previous = json.load(file).get("body")
+        except (OSError, ValueError):
+            pass
+        self._write_meta(key, meta)
+        if previous and previous != meta["body"]:
+            _remove(self._path(previous))
+        self._forget(key)
+        self._index[key] = [self._clock(), size]
+        self.size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.size <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if self.size <= self.max_bytes:
+                break
+            try:
+                with open(self._path(f"{key}.json"), encoding="utf-8") as file:
+                    body = json.load(file)["body"]
+                _remove(self._path(f"{key}.json"))
+                _remove(self._path(body))
+            except (OSError, ValueError, KeyError):
+                pass
+            self._forget(key)
+
+    def _storable(self, request: Request, response: Response) -> bool:
+        directives = _directives(response.headers.get("cache-control", ""))
+        if response.status_code not in HEURISTICALLY_CACHEABLE or "no-store" in directives:
+            return False
+        if response.headers.get("vary", "").strip() == "*":
+            return False
+        has_validator = "etag" in response.headers or "last-modified" in response.headers
+        has_lifetime = "max-age" in directives or "expires" in response.headers
+        return has_validator or has_lifetime
+
+    def _cached_response(self, request: Request, meta: dict, body: BinaryIO, age: float, conditional: bool = True) -> Response:
+        """The stored response, or a 304 if `conditional` and the request's validators match it."""
+        headers = Headers(meta["headers"])
+        headers["age"] = str(int(age))
+        etag = headers.get("etag")
+        if_none_match = request.headers.get("if-none-match")
+        if not conditional:
+            not_modified = False
+        elif if_none_match is not None:
+            not_modified = etag is not None and _strip_weak(etag) in (
+                _strip_weak(tag.strip()) for tag in if_none_match.split(",")
+            )
+        else:
+            since = _http_date(request.headers.get("if-modified-since"))
+            modified = _http_date(headers.get("last-modified"))
+            not_modified = since is not None and modified is not None and modified <= since
+        if not_modified and meta["status"] == 200:
+            body.close()
+            for name in _NOT_UPDATED:
+                headers.pop(name, None)
+            return Response(304, headers=headers, extensions={"from_cache": True})
+        return Response(meta["status"], headers=headers, stream=_FileStream(body), extensions={"from_cache": True})
+
+    async def handle_async_request(self, request: Request) -> Response:
+        request_directives = _directives(request.headers.get("cache-control", ""))
+        if request.method != "GET" or "no-store" in request_directives:
+            return await self._transport.handle_async_request(request)
+
+        key = hashlib.sha256(str(request.url).encode("utf-8")).hexdigest()
+        stored = self._open(key, request)
+        if stored is None:
+            request_time = self._clock()
+            response = await self._transport.handle_async_request(request)
+            return self._store(key, request, response, request_time, self._clock())
+
+        meta, body = stored
+        headers = Headers(meta["headers"])
+        age = current_age(headers, meta["request_time"], meta["response_time"], self._clock())
+        lifetime = freshness_lifetime(meta["status"], headers, meta["response_time"])
+        revalidate = "no-cache" in request_directives or request_directives.get("max-age") == "0"
+        if age < lifetime and not revalidate:
+            self.hits += 1
+            self._touch(key)
+            return self._cached_response(request, meta, body, age)
+        added_validators = False
+        if "if-none-match" not in request.headers and "if-modified-since" not in request.headers:
+            if "etag" in headers:
+                request.headers["If-None-Match"] = headers["etag"]
+                added_validators = True
+            if "last-modified" in headers:
+                request.headers["If-Modified-Since"] = headers["last-modified"]
+                added_validators = True
+
+        request_time = self._clock()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            body.close()
+            raise
+        response_time = self._clock()
+
+        if response.status_code != 304:
+            body.close()
+            return self._store(key, request, response, request_time, response_time)
+        await response.aclose()
+        self.revalidated += 1
+        # Freshen the stored entry with the headers of the 304 (RFC 9111 section 4.3.4)
+        for name, value in response.headers.items():
+            if name not in _NOT_UPDATED:
+                headers[name] = value
+        meta.update(
+            headers=headers.multi_items(),
+            request_time=request_time,
+            response_time=response_time,
+        )
+        try:
+            self._write_meta(key, meta)
+        except OSError:
+            pass
+        self._touch(key)
+        age = current_age(headers, request_time, response_time, response_time)
+        if added_validators:
+            return self._cached_response(request, meta, body, age, conditional=False)
+        body.close()
+        return Response(304, headers=response.headers, extensions=response.extensions)
+
+    def _store(self, key: str, request: Request, response: Response, request_time: float, response_time: float) -> Response:
+        """`response` from the origin, set up to be stored as it is read if it is cacheable."""
+        self.misses += 1
+        if self._storable(request, response) and isinstance(response.stream, AsyncByteStream):
+            vary = [name.strip().lower() for name in response.headers.get("vary", "").split(",") if name.strip()]
+            meta = {
+                "url": str(request.url),
+                "status": response.status_code,
+                "headers": response.headers.multi_items(),
+                "vary": {name: request.headers.get(name) for name in vary},
+                "request_time": request_time,
+                "response_time": response_time,
+            }
+            try:
+                response.stream = _StoringStream(response.stream, self, key, meta)
+            except OSError:
+                pass
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
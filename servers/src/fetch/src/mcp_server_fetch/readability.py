@@ -0,0 +1,203 @@
+"""In-process article extraction with lxml.
+
+A port of the main content scoring of Mozilla's Readability (which
+readabilipy runs in a Node subprocess): paragraphs award points to their
+ancestors, the best scoring element is taken as the article and siblings
+that look like part of it are added back.
+"""
+
+import re
+
+import lxml.etree as etree
+from lxml import html
+
+UNLIKELY_CANDIDATES = re.compile(
+    r"-ad-|ai2html|banner|breadcrumbs|combx|comment|community|cover-wrap|disqus|extra|footer|gdpr|header|"
+    r"legends|menu|related|remark|replies|rss|shoutbox|sidebar|skyscraper|social|sponsor|supplemental|"
+    r"ad-break|agegate|pagination|pager|popup|yom-remote|cookie|newsletter|subscribe|share",
+    re.I,
+)
+MAYBE_CANDIDATE = re.compile(r"and|article|body|column|content|main|shadow", re.I)
+POSITIVE = re.compile(
+    r"article|body|content|entry|hentry|h-entry|main|page|pagination|post|text|blog|story", re.I
+)
+NEGATIVE = re.compile(
+    r"-ad-|hidden|^hid$| hid$| hid |^hid |banner|combx|comment|com-|contact|foot|footer|footnote|gdpr|"
+    r"masthead|media|meta|outbrain|promo|related|scroll|share|shoutbox|sidebar|skyscraper|sponsor|"
+    r"shopping|tags|tool|widget|cookie|newsletter",
+    re.I,
+)
+
+# Elements that never hold article text
+REMOVED_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "object", "embed", "svg", "canvas",
+    "form", "input", "button", "select", "textarea", "nav", "aside", "footer", "link", "meta",
+)
+SCORED_TAGS = ("p", "pre", "td", "blockquote", "section", "h2", "h3")
+# Containers that are kept only if they look like content once the article is chosen
+CONDITIONAL_TAGS = ("div", "section", "table", "ul", "ol", "header")
+TAG_SCORES = {
+    "div": 5, "article": 10, "main": 8, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+    "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3, "form": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+MIN_PARAGRAPH_LENGTH = 25
+
+
+def _text(element) -> str:
+    return " ".join(element.text_content().split())
+
+
+def _class_weight(element) -> int:
+    weight = 0
+    for attribute in ("class", "id"):
+        value = element.get(attribute)
+        if value:
+            if NEGATIVE.search(value):
+                weight -= 25
+            if POSITIVE.search(value):
+                weight += 25
+    return weight
+
+
+def _link_density(element, text_length: int | None = None) -> float:
+    if text_length is None:
+        text_length = len(_text(element))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(_text(link)) for link in element.iter("a"))
+    return link_length / text_length
+
+
+def _parse(page: str):
+    # lxml refuses str input that carries an XML encoding declaration
+    parser = html.HTMLParser(encoding="utf-8", remove_comments=True)
+    return html.document_fromstring(page.encode("utf-8", "replace"), parser=parser)
+
+
+def _strip_unlikely(document) -> None:
+    etree.strip_elements(document, *REMOVED_TAGS, with_tail=False)
+    for element in list(document.iter(etree.Element)):
+        if element.tag in ("html", "body", "article", "main") or element.getparent() is None:
+            continue
+        if element.get("hidden") is not None or element.get("aria-hidden") == "true":
+            element.drop_tree()
+            continue
+        role = element.get("role")
+        if role in ("navigation", "complementary", "banner", "contentinfo", "dialog", "alert"):
+            element.drop_tree()
+            continue
+        match_string = f"{element.get('class', '')} {element.get('id', '')}"
+        if UNLIKELY_CANDIDATES.search(match_string) and not MAYBE_CANDIDATE.search(match_string):
+            element.drop_tree()
+
+
+def _score(document) -> dict:
+    scores: dict = {}
+
+    def initial(element) -> float:
+        if element not in scores:
+            scores[element] = TAG_SCORES.get(element.tag, 0) + _class_weight(element)
+        return scores[element]
+
+    for paragraph in document.iter(*SCORED_TAGS):
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_LENGTH:
+            continue
+        points = 1 + text.count(",") + min(len(text) // 100, 3)
+        ancestor = paragraph.getparent()
+        level = 0
+        while ancestor is not None and level < 3:
+            if ancestor.tag in ("html", "body") and level:
+                break
+            initial(ancestor)
+            scores[ancestor] += points / (1 if level == 0 else 2 if level == 1 else level * 3)
+            ancestor = ancestor.getparent()
+            level += 1
+
+    for element in scores:
+        scores[element] *= 1 - _link_density(element)
+    return scores
+
+
+def _clean(article) -> None:
+    for element in list(article.iter(*CONDITIONAL_TAGS)):
+        if element is article or element.getparent() is None:
+            continue
+        weight = _class_weight(element)
+        if weight < 0:
+            element.drop_tree()
+            continue
+        text = _text(element)
+        if text.count(",") >= 10:
+            continue
+        paragraphs = sum(1 for _ in element.iter("p"))
+        images = sum(1 for _ in element.iter("img"))
+        items = sum(1 for _ in element.iter("li"))
+        inputs = sum(1 for _ in element.iter("input"))
+        density = _link_density(element, len(text))
+        is_list = element.tag in ("ul", "ol")
+        if (
+            (images > 1 and paragraphs and paragraphs / images < 0.5)
+            or (not is_list and items > paragraphs + 100)
+            or inputs > paragraphs / 3
+            or (not is_list and len(text) < 25 and images == 0 and not any(element.iter("pre", "table", "img")))
+            or (weight < 25 and density > 0.2)
+            or (weight >= 25 and density > 0.5)
+        ):
+            element.drop_tree()
+
+
+def extract_article(page: str) -> str | None:
+    """Return the HTML of the main content of `page`, or None if it has none."""
+    try:
+        document = _parse(page)
+    except (etree.ParserError, ValueError):
+        return None
+    body = document.find("body")
+    if body is None:
+        body = document
+    _strip_unlikely(body)
+
+    scores = _score(body)
+    if scores:
+        top = max(scores, key=lambda element: scores[element])
+        top_score = scores[top]
+    else:
+        top, top_score = body, 0.0
+
+    # Climb out of a wrapper whose parent holds the rest of the article
+    while top.getparent() is not None and top.tag not in ("body", "article", "main"):
+        parent = top.getparent()
+        if scores.get(parent, 0) < top_score * 0.75 or parent.tag in ("body", "html"):
+            break
+        top, top_score = parent, scores[parent]
+
+    article = html.Element("div")
+    parent = top.getparent()
+    siblings = list(parent) if parent is not None and top.tag not in ("body", "html") else [top]
+    threshold = max(10, top_score * 0.2)
+    for sibling in siblings:
+        if not isinstance(sibling.tag, str):
+            continue
+        keep = sibling is top
+        if not keep:
+            bonus = top_score * 0.2 if sibling.get("class") and sibling.get("class") == top.get("class") else 0
+            if scores.get(sibling, 0) + bonus >= threshold:
+                keep = True
+            elif sibling.tag == "p":
+                text = _text(sibling)
+                density = _link_density(sibling, len(text))
+                keep = (len(text) > 80 and density < 0.25) or (
+                    0 < len(text) <= 80 and density == 0 and re.search(r"\.( |$)", text) is not None
+                )
+        if keep:
+            sibling.tail = None
+            article.append(sibling)
+
+    _clean(article)
+    if not _text(article):
+        return None
+    article_html = html.tostring(article, encoding="unicode", method="html")
+    # Always a str with encoding="unicode", which lxml's annotations do not express
+    return article_html if isinstance(article_html, str) else article_html.decode("utf-8")
@@ -1,8 +1,29 @@
+import asyncio
+import codecs
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from typing import Annotated, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import markdownify
 import readabilipy.simple_json
+from httpx import (
+    AsyncBaseTransport,
+    AsyncByteStream,
+    AsyncClient,
+    AsyncHTTPTransport,
+    HTTPError,
+    Limits,
+    Request,
+    Response,
+)
 from mcp.shared.exceptions import McpError
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -20,31 +41,289 @@ from mcp.types import (
 from protego import Protego
 from pydantic import BaseModel, Field, AnyUrl
 
+from .chunking import split_chunks
+from .http_cache import DEFAULT_HTTP_CACHE_BYTES, HttpCacheTransport
+from .readability import extract_article
+
 DEFAULT_USER_AGENT_AUTONOMOUS = "ModelContextProtocol/1.0 (Autonomous; +https://github.com/modelcontextprotocol/servers)"
 DEFAULT_USER_AGENT_MANUAL = "ModelContextProtocol/1.0 (User-Specified; +https://github.com/modelcontextprotocol/servers)"
 
+# "readability" runs Mozilla's Readability in Node via readabilipy, "lxml"
+# runs the in-process port in readability.py
+EXTRACTORS = ("readability", "lxml")
+DEFAULT_EXTRACTOR = "readability"
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 6
+KEEPALIVE_EXPIRY = 30.0
+REQUEST_TIMEOUT = 30.0
+
+DEFAULT_ROBOTS_CACHE_SIZE = 512
+DEFAULT_ROBOTS_TTL = 3600.0
+# RFC 9309 asks crawlers not to use a cached robots.txt for more than a day.
+MAX_ROBOTS_TTL = 86400.0
+
+DEFAULT_CONTENT_CACHE_BYTES = 32 * 1024 * 1024
+
+DEFAULT_MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+# How much of a body is looked at to tell its type and character encoding
+SNIFF_BYTES = 1024
+# Raw content shorter than this is read whole, so continuation calls can be
+# served from the content cache; longer content is read up to the window
+MIN_RAW_CHARS = 1_000_000
+
+DEFAULT_MAX_CONCURRENT_FETCHES = 10
+MAX_BATCH_URLS = 50
+
+DEFAULT_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_EXTRACT_TIMEOUT = 30.0
+DEFAULT_MAX_EXTRACT_CHARS = 10_000_000
+
+_MAX_AGE = re.compile(r"max-age\s*=\s*\"?(\d+)")
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_XML_ENCODING = re.compile(rb"^<\?xml[^>]+encoding\s*=\s*[\"']([\w.:-]+)")
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class _ReleasingStream(AsyncByteStream):
+    """Response body that calls `release` once it has been closed."""
+
+    def __init__(self, stream: AsyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class HostLimitedTransport(AsyncBaseTransport):
+    """Transport that allows at most `max_per_host` requests in flight per host.
 
-def extract_content_from_html(html: str) -> str:
+    A request holds its slot until its response body is closed, so a slow
+    download from one site cannot take all of the client's connections.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, max_per_host: int) -> None:
+        self._transport = transport
+        self._max_per_host = max_per_host
+        # host -> [semaphore, number of requests holding or awaiting it]
+        self._hosts: dict[str, list] = {}
+
+    async def handle_async_request(self, request: Request) -> Response:
+        host = request.url.netloc.decode("ascii")
+        entry = self._hosts.setdefault(host, [asyncio.Semaphore(self._max_per_host), 0])
+        entry[1] += 1
+
+        def leave(acquired: bool) -> None:
+            if acquired:
+                entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._hosts[host]
+
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            leave(acquired=False)
+            raise
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            leave(acquired=True)
+            raise
+        if isinstance(response.stream, AsyncByteStream):
+            response.stream = _ReleasingStream(response.stream, lambda: leave(acquired=True))
+        else:
+            # Not a body this transport can read, so there is nothing to wait for
+            leave(acquired=True)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = DEFAULT_HTTP_CACHE_BYTES,
+) -> AsyncClient:
+    """Create the HTTP client shared by every request the server makes.
+
+    Connections are kept alive and reused across tool calls, and HTTP/2 is
+    negotiated where the server supports it, so requests to one host share a
+    single connection. With a `cache_dir`, responses are also cached on disk
+    there, and fresh ones are served without a request.
+    """
+    transport = AsyncHTTPTransport(
+        http2=True,
+        limits=Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+    transport = HostLimitedTransport(transport, max_connections_per_host)
+    if cache_dir is not None:
+        transport = HttpCacheTransport(transport, cache_dir, cache_max_bytes)
+    return AsyncClient(transport=transport, timeout=REQUEST_TIMEOUT)
+
+
+def extract_content_from_html(html: str, extractor: str = DEFAULT_EXTRACTOR) -> str:
     """Extract and convert HTML content to Markdown format.
 
     Args:
         html: Raw HTML content to process
+        extractor: One of EXTRACTORS, the implementation used to find the main content
 
     Returns:
         Simplified markdown version of the content
     """
-    ret = readabilipy.simple_json.simple_json_from_html_string(
-        html, use_readability=True
-    )
-    if not ret["content"]:
+    if extractor == "lxml":
+        article = extract_article(html)
+    else:
+        article = readabilipy.simple_json.simple_json_from_html_string(
+            html, use_readability=True
+        )["content"]
+    if not article:
         return "<error>Page failed to be simplified from HTML</error>"
     content = markdownify.markdownify(
-        ret["content"],
+        article,
         heading_style=markdownify.ATX,
     )
     return content
 
 
+def _worker_ready() -> None:
+    """Run in a new worker process to have it import this module."""
+
+
+class ExtractionPool:
+    """Runs extract_content_from_html in a pool of worker processes.
+
+    Keeps parsing and markdown conversion off the event loop and spreads
+    concurrent pages across cores. Pages longer than `max_chars` are not
+    simplified, and a page that takes longer than `timeout` seconds has its
+    worker processes killed and replaced. With `workers=0` extraction runs in
+    a thread instead, where the time limit cannot be enforced.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_EXTRACT_WORKERS,
+        timeout: float = DEFAULT_EXTRACT_TIMEOUT,
+        max_chars: int = DEFAULT_MAX_EXTRACT_CHARS,
+    ) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self._executor: ProcessPoolExecutor | None = None
+        self._started: asyncio.Future | None = None
+        # Pages wait here for a free worker, so that queueing does not count
+        # against their time limit
+        self._slots = asyncio.Semaphore(max(workers, 1))
+
+    async def _get_executor(self) -> ProcessPoolExecutor:
+        executor, started = self._executor, self._started
+        if executor is None or started is None:
+            # Forking a process that runs an event loop and other threads is unsafe
+            executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            # Start every worker before timing pages, so that process start up does
+            # not count against the time limit (spawned pools otherwise start
+            # workers one at a time, on demand)
+            loop = asyncio.get_running_loop()
+            started = asyncio.gather(*(
+                loop.run_in_executor(executor, _worker_ready) for _ in range(self.workers)
+            ))
+            self._executor, self._started = executor, started
+        try:
+            await asyncio.shield(started)
+        except BrokenProcessPool:
+            if self._executor is executor:
+                self._executor = None
+            raise
+        return executor
+
+    def _kill(self, executor: ProcessPoolExecutor) -> None:
+        if self._executor is executor:
+            self._executor = None
+        # The executor has no API to stop a running task, so stop its workers
+        for process in (getattr(executor, "_processes", None) or {}).values():
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, html: str, extractor: str = DEFAULT_EXTRACTOR) -> str:
+        if len(html) > self.max_chars:
+            return (
+                f"<error>Page is too large to be simplified ({len(html)} characters, the limit is "
+                f"{self.max_chars}). Fetch it with raw=true to get the HTML instead.</error>"
+            )
+        if self.workers <= 0:
+            return await asyncio.to_thread(extract_content_from_html, html, extractor)
+
+        async with self._slots:
+            return await self._run(html, extractor)
+
+    async def _run(self, html: str, extractor: str) -> str:
+        loop = asyncio.get_running_loop()
+        retried = False
+        while True:
+            executor = None
+            try:
+                executor = await self._get_executor()
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, extract_content_from_html, html, extractor),
+                    self.timeout,
+                )
+            except asyncio.TimeoutError:
+                if executor is not None:
+                    self._kill(executor)
+                return (
+                    f"<error>Page took longer than {self.timeout:g}s to be simplified. "
+                    f"Fetch it with raw=true to get the HTML instead.</error>"
+                )
+            except BrokenProcessPool:
+                # A crashed worker, or another page's timeout, broke the pool under this one
+                if executor is not None:
+                    self._kill(executor)
+                if retried:
+                    raise McpError(ErrorData(
+                        code=INTERNAL_ERROR,
+                        message="The worker process simplifying the page exited unexpectedly",
+                    ))
+                retried = True
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._kill(self._executor)
+
+
+@asynccontextmanager
+async def _borrow_client(client: AsyncClient | None):
+    """Yield `client`, or a new client that is closed afterwards if it is None."""
+    if client is not None:
+        yield client
+        return
+    async with AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        yield client
+
+
 def get_robots_txt_url(url: str) -> str:
     """Get the robots.txt URL for a given website URL.
 
@@ -63,16 +342,38 @@ def get_robots_txt_url(url: str) -> str:
     return robots_url
 
 
-async def check_may_autonomously_fetch_url(url: str, user_agent: str) -> None:
-    """
-    Check if the URL can be fetched by the user agent according to the robots.txt file.
-    Raises a McpError if not.
+class RobotsTxt:
+    """A site's robots.txt as fetched from `url`.
+
+    `status_code` is kept so that a 4xx answer can be cached like any other:
+    401/403 deny autonomous fetching, other 4xx allow everything.
     """
-    from httpx import AsyncClient, HTTPError
 
-    robot_txt_url = get_robots_txt_url(url)
+    def __init__(self, url: str, status_code: int, text: str, max_age: float | None = None) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.max_age = max_age
+        self.parser = None
+        if not 400 <= status_code < 500:
+            processed_robot_txt = "\n".join(
+                line for line in text.splitlines() if not line.strip().startswith("#")
+            )
+            self.parser = Protego.parse(processed_robot_txt)
+
+
+def _max_age(cache_control: str) -> float | None:
+    """Seconds a response may be reused for according to its Cache-Control header."""
+    directives = cache_control.lower()
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    match = _MAX_AGE.search(directives)
+    return float(match.group(1)) if match else None
 
-    async with AsyncClient() as client:
+
+async def fetch_robots_txt(robot_txt_url: str, user_agent: str, client: AsyncClient | None = None) -> RobotsTxt:
+    """Download robots.txt from `robot_txt_url`. Raises a McpError on connection failures."""
+    async with _borrow_client(client) as client:
         try:
             response = await client.get(
                 robot_txt_url,
@@ -84,68 +385,366 @@ async def check_may_autonomously_fetch_url(url: str, user_agent: str) -> None:
                 code=INTERNAL_ERROR,
                 message=f"Failed to fetch robots.txt {robot_txt_url} due to a connection issue",
             ))
-        if response.status_code in (401, 403):
-            raise McpError(ErrorData(
-                code=INTERNAL_ERROR,
-                message=f"When fetching robots.txt ({robot_txt_url}), received status {response.status_code} so assuming that autonomous fetching is not allowed, the user can try manually fetching by using the fetch prompt",
-            ))
-        elif 400 <= response.status_code < 500:
-            return
-        robot_txt = response.text
-    processed_robot_txt = "\n".join(
-        line for line in robot_txt.splitlines() if not line.strip().startswith("#")
+        text = "" if 400 <= response.status_code < 500 else response.text
+    return RobotsTxt(
+        robot_txt_url,
+        response.status_code,
+        text,
+        max_age=_max_age(response.headers.get("cache-control", "")),
     )
-    robot_parser = Protego.parse(processed_robot_txt)
-    if not robot_parser.can_fetch(str(url), user_agent):
+
+
+class RobotsCache:
+    """LRU cache of parsed robots.txt files, keyed by robots.txt URL (one per origin).
+
+    Entries live for the response's Cache-Control max-age, or `default_ttl`
+    seconds when it has none, capped at `max_ttl`. 4xx answers are cached
+    too; 5xx answers and connection failures are not. Concurrent lookups for
+    the same origin share one download.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_ROBOTS_CACHE_SIZE,
+        default_ttl: float = DEFAULT_ROBOTS_TTL,
+        max_ttl: float = MAX_ROBOTS_TTL,
+        clock=time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self._clock = clock
+        # robots.txt URL -> (expiry time, RobotsTxt), least recently used first
+        self._entries: OrderedDict[str, tuple[float, RobotsTxt]] = OrderedDict()
+        self._pending: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, robot_txt_url: str, user_agent: str, client: AsyncClient | None = None) -> RobotsTxt:
+        entry = self._entries.get(robot_txt_url)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(robot_txt_url)
+                self.hits += 1
+                return entry[1]
+            del self._entries[robot_txt_url]
+
+        task = self._pending.get(robot_txt_url)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(robot_txt_url, user_agent, client))
+            self._pending[robot_txt_url] = task
+            task.add_done_callback(lambda done: self._finish(robot_txt_url, done))
+        else:
+            self.coalesced += 1
+        # Shielded so that one caller being cancelled does not fail the others
+        return await asyncio.shield(task)
+
+    async def _load(self, robot_txt_url: str, user_agent: str, client: AsyncClient | None) -> RobotsTxt:
+        robots = await fetch_robots_txt(robot_txt_url, user_agent, client)
+        if robots.status_code < 500:
+            ttl = self.default_ttl if robots.max_age is None else robots.max_age
+            ttl = min(ttl, self.max_ttl)
+            if ttl > 0 and self.max_entries > 0:
+                self._entries[robot_txt_url] = (self._clock() + ttl, robots)
+                self._entries.move_to_end(robot_txt_url)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return robots
+
+    def _finish(self, robot_txt_url: str, task: asyncio.Task) -> None:
+        self._pending.pop(robot_txt_url, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter has gone away
+            task.exception()
+
+
+async def check_may_autonomously_fetch_url(
+    url: str,
+    user_agent: str,
+    client: AsyncClient | None = None,
+    robots_cache: RobotsCache | None = None,
+) -> None:
+    """
+    Check if the URL can be fetched by the user agent according to the robots.txt file.
+    Raises a McpError if not.
+
+    Uses `client` if given, otherwise a client for this check alone. With a
+    `robots_cache`, robots.txt is only downloaded when the cached copy has expired.
+    """
+    robot_txt_url = get_robots_txt_url(url)
+
+    if robots_cache is not None:
+        robots = await robots_cache.get(robot_txt_url, user_agent, client)
+    else:
+        robots = await fetch_robots_txt(robot_txt_url, user_agent, client)
+    if robots.status_code in (401, 403):
+        raise McpError(ErrorData(
+            code=INTERNAL_ERROR,
+            message=f"When fetching robots.txt ({robot_txt_url}), received status {robots.status_code} so assuming that autonomous fetching is not allowed, the user can try manually fetching by using the fetch prompt",
+        ))
+    elif robots.parser is None:
+        return
+    if not robots.parser.can_fetch(str(url), user_agent):
         raise McpError(ErrorData(
             code=INTERNAL_ERROR,
             message=f"The sites robots.txt ({robot_txt_url}), specifies that autonomous fetching of this page is not allowed, "
             f"<useragent>{user_agent}</useragent>\n"
             f"<url>{url}</url>"
-            f"<robots>\n{robot_txt}\n</robots>\n"
+            f"<robots>\n{robots.text}\n</robots>\n"
             f"The assistant must let the user know that it failed to view the page. The assistant may provide further guidance based on the above information.\n"
             f"The assistant can tell the user that they can try manually fetching the page by using the fetch prompt within their UI.",
         ))
 
 
+class CachedPage:
+    """Converted content of a fetched page and the validators to revalidate it with.
+
+    `complete` is False when only the start of a raw page was read.
+    """
+
+    def __init__(
+        self,
+        content: str,
+        prefix: str,
+        etag: str | None,
+        last_modified: str | None,
+        complete: bool = True,
+    ) -> None:
+        self.content = content
+        self.prefix = prefix
+        self.etag = etag
+        self.last_modified = last_modified
+        self.complete = complete
+        self.size = sys.getsizeof(content) + sys.getsizeof(prefix)
+
+    def covers(self, max_chars: int | None) -> bool:
+        """Whether this holds the first `max_chars` characters of the page (all of it if None)."""
+        return self.complete or (max_chars is not None and len(self.content) >= max_chars)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ContentCache:
+    """Converted pages keyed by (URL, raw), least recently used evicted first.
+
+    Continuation calls of the fetch tool slice the cached content instead of
+    downloading and converting the page again. The total size is bounded by
+    `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CONTENT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries: OrderedDict[tuple[str, bool], CachedPage] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str, raw: bool) -> CachedPage | None:
+        page = self._entries.get((url, raw))
+        if page is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((url, raw))
+        self.hits += 1
+        return page
+
+    def put(self, url: str, raw: bool, page: CachedPage) -> None:
+        self.discard(url, raw)
+        if page.size > self.max_bytes:
+            return
+        self._entries[(url, raw)] = page
+        self.size += page.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    def discard(self, url: str, raw: bool) -> None:
+        page = self._entries.pop((url, raw), None)
+        if page is not None:
+            self.size -= page.size
+
+
+def _detect_encoding(content_type: str, head: bytes) -> str:
+    """Character encoding of a body from its byte order mark, Content-Type or first bytes."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    names = []
+    match = _HEADER_CHARSET.search(content_type)
+    if match:
+        names.append(match.group(1))
+    for pattern in (_XML_ENCODING, _META_CHARSET):
+        match = pattern.search(head)
+        # A declaration that could be read as ASCII cannot really be UTF-16/32
+        if match and not match.group(1).lower().startswith((b"utf-16", b"utf-32")):
+            names.append(match.group(1).decode("ascii"))
+    for name in names:
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def _is_html(content_type: str, head: bytes) -> bool:
+    start = head[:100].lower()
+    return b"<html" in start or b"<!doctype html" in start or "text/html" in content_type or not content_type
+
+
+async def _read_page(
+    response: Response, force_raw: bool, max_bytes: int, max_chars: int | None
+) -> tuple[str, bool, bool, bool]:
+    """Stream and decode the body of `response`.
+
+    The type and encoding of the body are taken from its headers and first
+    bytes. Reading stops after `max_bytes` bytes, and for content that will
+    be returned raw, once `max_chars` characters have been decoded. Returns
+    the text, whether it is HTML to simplify, whether all of it was read and
+    whether it was cut off at `max_bytes`.
+    """
+    content_type = response.headers.get("content-type", "")
+    chunks = response.aiter_bytes()
+    head = b""
+    async for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_BYTES:
+            break
+    simplify = _is_html(content_type, head) and not force_raw
+    if simplify:
+        max_chars = None
+    decoder = codecs.getincrementaldecoder(_detect_encoding(content_type, head))(errors="replace")
+
+    async def body():
+        yield head
+        async for chunk in chunks:
+            yield chunk
+
+    parts = []
+    length = received = 0
+    async for chunk in body():
+        if received + len(chunk) > max_bytes:
+            parts.append(decoder.decode(chunk[: max_bytes - received]))
+            return "".join(parts), simplify, True, True
+        received += len(chunk)
+        text = decoder.decode(chunk)
+        parts.append(text)
+        length += len(text)
+        if max_chars is not None and length >= max_chars:
+            return "".join(parts)[:max_chars], simplify, False, False
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), simplify, True, False
+
+
 async def fetch_url(
-    url: str, user_agent: str, force_raw: bool = False
+    url: str,
+    user_agent: str,
+    force_raw: bool = False,
+    client: AsyncClient | None = None,
+    content_cache: ContentCache | None = None,
+    extractor: str = DEFAULT_EXTRACTOR,
+    extraction_pool: ExtractionPool | None = None,
+    max_bytes: int = DEFAULT_MAX_DOWNLOAD_BYTES,
+    max_chars: int | None = None,
 ) -> Tuple[str, str]:
     """
     Fetch the URL and return the content in a form ready for the LLM, as well as a prefix string with status information.
-    """
-    from httpx import AsyncClient, HTTPError
 
-    async with AsyncClient() as client:
+    Uses `client` if given, otherwise a client for this request alone. With a
+    `content_cache`, a page that is already cached is revalidated with its
+    ETag/Last-Modified and only converted again if it has changed. With an
+    `extraction_pool`, HTML is simplified there instead of on the event loop.
+
+    At most `max_bytes` of the response are downloaded. Content that is
+    returned raw is only read up to its first `max_chars` characters.
+    """
+    cached = content_cache.get(url, force_raw) if content_cache is not None else None
+    if cached is not None and not cached.covers(max_chars):
+        cached = None
+    headers = {"User-Agent": user_agent}
+    if cached is not None:
+        headers.update(cached.conditional_headers())
+
+    async with _borrow_client(client) as client:
         try:
-            response = await client.get(
+            async with client.stream(
+                "GET",
                 url,
                 follow_redirects=True,
-                headers={"User-Agent": user_agent},
-                timeout=30,
-            )
+                headers=headers,
+            ) as response:
+                if cached is not None and response.status_code == 304:
+                    if content_cache is not None:
+                        content_cache.revalidated += 1
+                    return cached.content, cached.prefix
+                if response.status_code >= 400:
+                    if content_cache is not None:
+                        content_cache.discard(url, force_raw)
+                    raise McpError(ErrorData(
+                        code=INTERNAL_ERROR,
+                        message=f"Failed to fetch {url} - status code {response.status_code}",
+                    ))
+                page_raw, simplify, complete, cut_off = await _read_page(
+                    response, force_raw, max_bytes, max_chars
+                )
         except HTTPError as e:
             raise McpError(ErrorData(code=INTERNAL_ERROR, message=f"Failed to fetch {url}: {e!r}"))
-        if response.status_code >= 400:
-            raise McpError(ErrorData(
-                code=INTERNAL_ERROR,
-                message=f"Failed to fetch {url} - status code {response.status_code}",
-            ))
-
-        page_raw = response.text
 
     content_type = response.headers.get("content-type", "")
-    is_page_html = (
-        "<html" in page_raw[:100] or "text/html" in content_type or not content_type
-    )
-
-    if is_page_html and not force_raw:
-        return extract_content_from_html(page_raw), ""
-
-    return (
-        page_raw,
-        f"Content type {content_type} cannot be simplified to markdown, but here is the raw content:\n",
-    )
+    if simplify:
+        if extraction_pool is not None:
+            content = await extraction_pool.extract(page_raw, extractor)
+        else:
+            content = extract_content_from_html(page_raw, extractor)
+        prefix = ""
+    else:
+        content, prefix = (
+            page_raw,
+            f"Content type {content_type} cannot be simplified to markdown, but here is the raw content:\n",
+        )
+    if cut_off:
+        prefix = f"The page is larger than the {max_bytes} byte download limit, only its start was read.\n" + prefix
+    if content_cache is not None:
+        content_cache.put(url, force_raw, CachedPage(
+            content,
+            prefix,
+            response.headers.get("etag"),
+            response.headers.get("last-modified"),
+            complete=complete or cut_off,
+        ))
+    return content, prefix
+
+
+def format_chunk(url: str, content: str, max_length: int, number: int) -> str:
+    """Chunk `number` of `content` split into chunks of `max_length`, with the chunk index for chunk 0."""
+    chunks = split_chunks(content, max_length)
+    if number >= len(chunks):
+        return f"Contents of {url}:\n<error>There is no chunk {number}, the page has {len(chunks)} chunks (0 to {len(chunks) - 1}).</error>"
+    chunk = chunks[number]
+    text = f"Contents of {url} (chunk {number} of {len(chunks)}, characters {chunk.start}-{chunk.end}):\n{content[chunk.start:chunk.end]}"
+    if number == 0 and len(chunks) > 1:
+        lines = [
+            f"{index}: characters {c.start}-{c.end}, bytes {c.byte_start}-{c.byte_end}: {c.title}"
+            for index, c in enumerate(chunks)
+        ]
+        text += "\n\n<chunks>\n" + "\n".join(lines) + "\n</chunks>"
+    if number + 1 < len(chunks):
+        text += f"\n\n<error>Content continues. Call the fetch tool with chunk {number + 1} and the same max_length to get the next chunk.</error>"
+    return text
 
 
 class Fetch(BaseModel):
@@ -176,20 +775,90 @@ class Fetch(BaseModel):
             description="Get the actual HTML content if the requested page, without simplification.",
         ),
     ]
+    chunk: Annotated[
+        int | None,
+        Field(
+            default=None,
+            description="Return this chunk of the page instead of starting at start_index. The page is split into chunks of up to max_length characters at headings and paragraphs, keeping code blocks and tables whole unless they are longer than a chunk; chunk 0 comes with an index of all chunks.",
+            ge=0,
+        ),
+    ]
+
+
+class FetchMany(BaseModel):
+    """Parameters for fetching several URLs at once."""
+
+    urls: Annotated[
+        list[AnyUrl],
+        Field(
+            description="URLs to fetch",
+            min_length=1,
+            max_length=MAX_BATCH_URLS,
+        ),
+    ]
+    max_length: Annotated[
+        int,
+        Field(
+            default=5000,
+            description="Maximum number of characters to return for each URL.",
+            gt=0,
+            lt=1000000,
+        ),
+    ]
+    raw: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Get the actual HTML content of the requested pages, without simplification.",
+        ),
+    ]
 
 
 async def serve(
-    custom_user_agent: str | None = None, ignore_robots_txt: bool = False
+    custom_user_agent: str | None = None,
+    ignore_robots_txt: bool = False,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    robots_cache_size: int = DEFAULT_ROBOTS_CACHE_SIZE,
+    robots_ttl: float = DEFAULT_ROBOTS_TTL,
+    content_cache_bytes: int = DEFAULT_CONTENT_CACHE_BYTES,
+    extractor: str = DEFAULT_EXTRACTOR,
+    extract_workers: int = DEFAULT_EXTRACT_WORKERS,
+    extract_timeout: float = DEFAULT_EXTRACT_TIMEOUT,
+    max_extract_chars: int = DEFAULT_MAX_EXTRACT_CHARS,
+    max_download_bytes: int = DEFAULT_MAX_DOWNLOAD_BYTES,
+    max_concurrent_fetches: int = DEFAULT_MAX_CONCURRENT_FETCHES,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = DEFAULT_HTTP_CACHE_BYTES,
 ) -> None:
     """Run the fetch MCP server.
 
     Args:
         custom_user_agent: Optional custom User-Agent string to use for requests
         ignore_robots_txt: Whether to ignore robots.txt restrictions
+        max_connections: Maximum number of open connections across all hosts
+        max_connections_per_host: Maximum number of concurrent requests to one host
+        robots_cache_size: Number of sites whose robots.txt is kept in memory
+        robots_ttl: Seconds to reuse a robots.txt that has no Cache-Control max-age
+        content_cache_bytes: Memory budget for converted pages kept for continuation calls
+        extractor: HTML main content extractor, one of EXTRACTORS
+        extract_workers: Worker processes simplifying HTML, 0 to use a thread instead
+        extract_timeout: Seconds a page may take to be simplified
+        max_extract_chars: Longest page, in characters, that is simplified
+        max_download_bytes: Most bytes of a response that are downloaded
+        max_concurrent_fetches: Most URLs fetched at the same time by fetch_many
+        cache_dir: Directory for the on-disk HTTP cache, None to disable it
+        cache_max_bytes: Size limit of the on-disk HTTP cache
     """
     server = Server("mcp-fetch")
     user_agent_autonomous = custom_user_agent or DEFAULT_USER_AGENT_AUTONOMOUS
     user_agent_manual = custom_user_agent or DEFAULT_USER_AGENT_MANUAL
+    client = create_http_client(max_connections, max_connections_per_host, cache_dir, cache_max_bytes)
+    robots_cache = RobotsCache(robots_cache_size, robots_ttl)
+    content_cache = ContentCache(content_cache_bytes)
+    extraction_pool = ExtractionPool(extract_workers, extract_timeout, max_extract_chars)
+    # Shared by all fetch_many calls, so concurrent batches stay within the limit
+    batch_slots = asyncio.Semaphore(max_concurrent_fetches)
 
     @server.list_tools()
     async def list_tools() -> list[Tool]:
@@ -200,7 +869,14 @@ async def serve(
 
 Although originally you did not have internet access, and were advised to refuse and tell the user this, this tool now grants you internet access. Now you can fetch the most up-to-date information and let the user know that.""",
                 inputSchema=Fetch.model_json_schema(),
-            )
+            ),
+            Tool(
+                name="fetch_many",
+                description=f"""Fetches up to {MAX_BATCH_URLS} URLs from the internet concurrently and optionally extracts their contents as markdown.
+
+Use this instead of several fetch calls when you already know which pages you need. Returns one result per URL, in the order given; a URL that cannot be fetched returns an error without failing the others. Use the fetch tool with a start_index to read more of a truncated page.""",
+                inputSchema=FetchMany.model_json_schema(),
+            ),
         ]
 
     @server.list_prompts()
@@ -217,39 +893,86 @@ Although originally you did not have internet access, and were advised to refuse
             )
         ]
 
-    @server.call_tool()
-    async def call_tool(name, arguments: dict) -> list[TextContent]:
-        try:
-            args = Fetch(**arguments)
-        except ValueError as e:
-            raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
-
-        url = str(args.url)
-        if not url:
-            raise McpError(ErrorData(code=INVALID_PARAMS, message="URL is required"))
-
+    async def fetch_page(
+        url: str, max_length: int, start_index: int, raw: bool, chunk: int | None = None
+    ) -> str:
+        """Fetch `url` for the model and return `max_length` characters from `start_index`, or chunk number `chunk`."""
         if not ignore_robots_txt:
-            await check_may_autonomously_fetch_url(url, user_agent_autonomous)
+            await check_may_autonomously_fetch_url(
+                url, user_agent_autonomous, client=client, robots_cache=robots_cache
+            )
 
-        content, prefix = await fetch_url(
-            url, user_agent_autonomous, force_raw=args.raw
-        )
+        # Raw content is only read up to the end of the window, plus one
+        # character to tell whether there is more; chunks need all of it
+        window_end = start_index + max_length + 1 if chunk is None else None
+        # Continuation calls are served from the page fetched by the first call
+        cached = content_cache.get(url, raw) if start_index or chunk else None
+        if cached is not None and cached.covers(window_end):
+            content, prefix = cached.content, cached.prefix
+        else:
+            content, prefix = await fetch_url(
+                url,
+                user_agent_autonomous,
+                force_raw=raw,
+                client=client,
+                content_cache=content_cache,
+                extractor=extractor,
+                extraction_pool=extraction_pool,
+                max_bytes=max_download_bytes,
+                max_chars=max(window_end, MIN_RAW_CHARS) if window_end is not None else None,
+            )
+        if chunk is not None:
+            return prefix + format_chunk(url, content, max_length, chunk)
         original_length = len(content)
-        if args.start_index >= original_length:
+        if start_index >= original_length:
             content = "<error>No more content available.</error>"
         else:
-            truncated_content = content[args.start_index : args.start_index + args.max_length]
+            truncated_content = content[start_index : start_index + max_length]
             if not truncated_content:
                 content = "<error>No more content available.</error>"
             else:
                 content = truncated_content
                 actual_content_length = len(truncated_content)
-                remaining_content = original_length - (args.start_index + actual_content_length)
+                remaining_content = original_length - (start_index + actual_content_length)
                 # Only add the prompt to continue fetching if there is still remaining content
-                if actual_content_length == args.max_length and remaining_content > 0:
-                    next_start = args.start_index + actual_content_length
+                if actual_content_length == max_length and remaining_content > 0:
+                    next_start = start_index + actual_content_length
                     content += f"\n\n<error>Content truncated. Call the fetch tool with a start_index of {next_start} to get more content.</error>"
-        return [TextContent(type="text", text=f"{prefix}Contents of {url}:\n{content}")]
+        return f"{prefix}Contents of {url}:\n{content}"
+
+    @server.call_tool()
+    async def call_tool(name, arguments: dict) -> list[TextContent]:
+        if name == "fetch_many":
+            try:
+                batch = FetchMany(**arguments)
+            except ValueError as e:
+                raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
+
+            async def fetch_one(url: str) -> str:
+                # Per-host limits are applied by the client's transport
+                async with batch_slots:
+                    try:
+                        return await fetch_page(url, batch.max_length, 0, batch.raw)
+                    except McpError as e:
+                        return f"Failed to fetch {url}:\n<error>{e.error.message}</error>"
+                    except Exception as e:
+                        # One page failing unexpectedly must not lose the others
+                        return f"Failed to fetch {url}:\n<error>{e!r}</error>"
+
+            results = await asyncio.gather(*(fetch_one(str(url)) for url in batch.urls))
+            return [TextContent(type="text", text=result) for result in results]
+
+        try:
+            args = Fetch(**arguments)
+        except ValueError as e:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
+
+        url = str(args.url)
+        if not url:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="URL is required"))
+
+        text = await fetch_page(url, args.max_length, args.start_index, args.raw, args.chunk)
+        return [TextContent(type="text", text=text)]
 
     @server.get_prompt()
     async def get_prompt(name: str, arguments: dict | None) -> GetPromptResult:
@@ -259,7 +982,15 @@ Although originally you did not have internet access, and were advised to refuse
         url = arguments["url"]
 
         try:
-            content, prefix = await fetch_url(url, user_agent_manual)
+            content, prefix = await fetch_url(
+                url,
+                user_agent_manual,
+                client=client,
+                content_cache=content_cache,
+                extractor=extractor,
+                extraction_pool=extraction_pool,
+                max_bytes=max_download_bytes,
+            )
             # TODO: after SDK bug is addressed, don't catch the exception
         except McpError as e:
             return GetPromptResult(
@@ -281,5 +1012,8 @@ Although originally you did not have internet access, and were advised to refuse
         )
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with client, stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        extraction_pool.close()
@@ -0,0 +1,181 @@
+"""A local HTTP site for testing and benchmarking the fetch server.
+
+`LocalSite` serves, on 127.0.0.1 in a background thread:
+
+    /robots.txt           the `robots` text, or an empty answer with status `robots` if it is an int
+    /pages/<name>         <name>.html from the corpus directory, with an ETag
+    /text/<n>             n bytes of plain text
+    /redirect/<n>/<path>  a chain of n redirects ending at /<path>
+    /slow/<s>/<path>      /<path> after a delay of s seconds
+    /status/<code>        an empty answer with that status
+    /custom/<name>        the body of `responses[name]` with its headers, or a 304
+                          if the request's validators match its ETag/Last-Modified
+
+Every page also waits `delay` seconds before answering, to stand in for
+network latency. Query strings are ignored, so `?n=1` gives an uncached copy
+of the same page. Requests are counted per path in `hits`.
+
+`fetch_server` runs the fetch server in a subprocess and connects an MCP
+client session to it over stdio.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+CORPUS = Path(__file__).resolve().parents[1] / "benchmarks" / "corpus"
+SRC = Path(__file__).resolve().parents[1] / "src"
+_TEXT_LINE = b"The quick brown fox jumps over the lazy dog, again and again.\n"
+
+
+def text_body(size: int) -> bytes:
+    """The body served at /text/<size>."""
+    return (_TEXT_LINE * (size // len(_TEXT_LINE) + 1))[:size]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        site = self.server.site
+        path = urlsplit(self.path).path
+        with site._lock:
+            site.hits[path] += 1
+        if path == "/robots.txt":
+            self._robots(site.robots)
+            return
+        if site.delay:
+            time.sleep(site.delay)
+        self._route(path)
+
+    def _route(self, path: str) -> None:
+        parts = path.strip("/").split("/")
+        kind, args = parts[0], parts[1:]
+        if kind == "pages" and len(args) == 1:
+            page = self.server.site.corpus / f"{args[0]}.html"
+            if page.is_file():
+                self._page(page.read_bytes())
+                return
+        elif kind == "text" and len(args) == 1 and args[0].isdigit():
+            self._send(200, text_body(int(args[0])), "text/plain; charset=utf-8")
+            return
+        elif kind == "redirect" and args and args[0].isdigit():
+            remaining = int(args[0])
+            target = "/" + "/".join(args[1:]) if remaining <= 1 else f"/redirect/{remaining - 1}/" + "/".join(args[1:])
+            self._send(302, b"", "text/plain", {"Location": target})
+            return
+        elif kind == "slow" and args:
+            time.sleep(float(args[0]))
+            self._route("/" + "/".join(args[1:]))
+            return
+        elif kind == "status" and len(args) == 1 and args[0].isdigit():
+            self._send(int(args[0]), b"", "text/plain")
+            return
+        elif kind == "custom" and len(args) == 1 and args[0] in self.server.site.responses:
+            headers, body = self.server.site.responses[args[0]]
+            self._custom(headers, body)
+            return
+        self._send(404, b"Not found", "text/plain")
+
+    def _robots(self, robots: str | int) -> None:
+        if isinstance(robots, int):
+            self._send(robots, b"", "text/plain")
+        else:
+            self._send(200, robots.encode(), "text/plain", {"Cache-Control": "max-age=3600"})
+
+    def _page(self, body: bytes) -> None:
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", "text/html", {"ETag": etag})
+        else:
+            self._send(200, body, "text/html; charset=utf-8", {"ETag": etag})
+
+    def _custom(self, headers: dict, body: bytes) -> None:
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            not_modified = etag is not None and if_none_match == etag
+        else:
+            not_modified = last_modified is not None and self.headers.get("If-Modified-Since") == last_modified
+        self._send(304 if not_modified else 200, b"" if not_modified else body, "text/plain", headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The fetch server stops reading at its download limit
+            self.close_connection = True
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    site: "LocalSite"
+
+
+class LocalSite:
+    """A local HTTP site, to be used as a context manager."""
+
+    def __init__(self, robots: str | int = 404, delay: float = 0.0, corpus: Path = CORPUS) -> None:
+        self.robots = robots
+        self.delay = delay
+        self.corpus = corpus
+        # name -> (headers, body) served at /custom/<name>
+        self.responses: dict[str, tuple[dict, bytes]] = {}
+        self.hits: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server: _Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def pages(self) -> list[str]:
+        """Names of the corpus pages, as served under /pages/<name>."""
+        return sorted(path.stem for path in self.corpus.glob("*.html"))
+
+    def __enter__(self) -> "LocalSite":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.site = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@asynccontextmanager
+async def fetch_server(*args: str):
+    """An initialized client session with a fetch server started with `args`."""
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_server_fetch", *args],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))},
+    )
+    async with stdio_client(params) as (read, write), ClientSession(read, write) as session:
+        await session.initialize()
+        yield session
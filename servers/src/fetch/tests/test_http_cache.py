@@ -0,0 +1,216 @@
+import email.utils
+import os
+import time
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient, AsyncHTTPTransport
+
+from local_site import LocalSite
+from mcp_server_fetch.http_cache import HttpCacheTransport
+from mcp_server_fetch.server import DEFAULT_USER_AGENT_AUTONOMOUS, ContentCache, create_http_client, fetch_url
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def http_date(timestamp: float) -> str:
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+@pytest.fixture
+def site():
+    with LocalSite() as local_site:
+        yield local_site
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def cache_client(tmp_path: Path, clock: Clock, max_bytes: int = 1024 * 1024) -> tuple[AsyncClient, HttpCacheTransport]:
+    transport = HttpCacheTransport(AsyncHTTPTransport(), str(tmp_path), max_bytes, clock=clock)
+    return AsyncClient(transport=transport), transport
+
+
+def stored_entries(tmp_path: Path) -> list[Path]:
+    return sorted(tmp_path.glob("*.json"))
+
+
+@pytest.mark.asyncio
+async def test_max_age_response_is_served_until_stale(site, clock, tmp_path):
+    site.responses["page"] = ({"Cache-Control": "max-age=60", "ETag": '"v1"'}, b"body")
+    url = site.url("/custom/page")
+    client, cache = cache_client(tmp_path, clock)
+    async with client:
+        assert (await client.get(url)).text == "body"
+        clock.advance(30)
+        response = await client.get(url)
+        assert response.text == "body" and response.extensions["from_cache"]
+        assert site.hits["/custom/page"] == 1
+
+        clock.advance(60)
+        response = await client.get(url)
+        assert (response.status_code, response.text) == (200, "body")
+        assert site.hits["/custom/page"] == 2
+    assert (cache.misses, cache.hits, cache.revalidated) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_expires_sets_lifetime(site, clock, tmp_path):
+    site.responses["page"] = ({"Expires": http_date(clock.now + 100)}, b"body")
+    url = site.url("/custom/page")
+    client, _ = cache_client(tmp_path, clock)
+    async with client:
+        await client.get(url)
+        clock.advance(50)
+        await client.get(url)
+        assert site.hits["/custom/page"] == 1
+        clock.advance(100)
+        await client.get(url)
+        assert site.hits["/custom/page"] == 2
+
+
+@pytest.mark.asyncio
+async def test_last_modified_gives_heuristic_lifetime(site, clock, tmp_path):
+    # Modified 1000s ago, so fresh for 10% of that
+    site.responses["page"] = ({"Last-Modified": http_date(clock.now - 1000)}, b"body")
+    url = site.url("/custom/page")
+    client, cache = cache_client(tmp_path, clock)
+    async with client:
+        await client.get(url)
+        clock.advance(90)
+        await client.get(url)
+        assert site.hits["/custom/page"] == 1
+        clock.advance(20)
+        assert (await client.get(url)).text == "body"
+        assert site.hits["/custom/page"] == 2
+    assert cache.revalidated == 1
+
+
+@pytest.mark.asyncio
+async def test_matching_validators_get_a_304_from_the_cache(site, clock, tmp_path):
+    site.responses["page"] = ({"Cache-Control": "max-age=60", "ETag": '"v1"'}, b"body")
+    url = site.url("/custom/page")
+    client, _ = cache_client(tmp_path, clock)
+    async with client:
+        await client.get(url)
+        response = await client.get(url, headers={"If-None-Match": '"v1"'})
+        assert response.status_code == 304 and response.extensions["from_cache"]
+        assert (await client.get(url, headers={"If-None-Match": '"v0"'})).text == "body"
+    assert site.hits["/custom/page"] == 1
+
+
+@pytest.mark.asyncio
+async def test_content_cache_revalidates_against_the_http_cache(site, tmp_path):
+    site.responses["page"] = ({"Cache-Control": "max-age=600", "ETag": '"v1"'}, b"body")
+    url = site.url("/custom/page")
+    content_cache = ContentCache()
+    async with create_http_client(cache_dir=str(tmp_path)) as client:
+        for _ in range(2):
+            content, _ = await fetch_url(url, DEFAULT_USER_AGENT_AUTONOMOUS, client=client, content_cache=content_cache)
+            assert content == "body"
+    assert content_cache.revalidated == 1
+    assert site.hits["/custom/page"] == 1
+
+
+@pytest.mark.asyncio
+async def test_304_refreshes_stored_headers(site, clock, tmp_path):
+    site.responses["page"] = ({"Cache-Control": "max-age=10", "ETag": '"v1"', "X-Version": "1"}, b"body")
+    url = site.url("/custom/page")
+    client, _ = cache_client(tmp_path, clock)
+    async with client:
+        await client.get(url)
+        site.responses["page"] = ({"Cache-Control": "max-age=600", "ETag": '"v1"', "X-Version": "2"}, b"unused")
+        clock.advance(20)
+        response = await client.get(url)
+        assert (response.text, response.headers["x-version"]) == ("body", "2")
+        assert site.hits["/custom/page"] == 2
+
+        clock.advance(300)
+        response = await client.get(url)
+        assert response.extensions["from_cache"] and response.headers["x-version"] == "2"
+        assert site.hits["/custom/page"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [
+    {"Cache-Control": "no-store, max-age=60"},
+    {"Cache-Control": "max-age=60", "Vary": "*"},
+])
+async def test_uncacheable_responses_are_not_stored(site, clock, tmp_path, headers):
+    site.responses["page"] = (headers, b"body")
+    url = site.url("/custom/page")
+    client, _ = cache_client(tmp_path, clock)
+    async with client:
+        await client.get(url)
+        await client.get(url)
+    assert site.hits["/custom/page"] == 2
+    assert stored_entries(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_partly_read_and_oversized_bodies_are_not_stored(site, clock, tmp_path):
+    site.responses["large"] = ({"Cache-Control": "max-age=60"}, b"x" * 500_000)
+    site.responses["oversized"] = ({"Cache-Control": "max-age=60"}, b"x" * 2000)
+    client, _ = cache_client(tmp_path, clock, max_bytes=8 * 1000)
+    async with client:
+        async with client.stream("GET", site.url("/custom/large")) as response:
+            async for _ in response.aiter_raw(1000):
+                break
+        assert len((await client.get(site.url("/custom/oversized"))).content) == 2000
+    assert stored_entries(tmp_path) == []
+    assert list(tmp_path.glob("*.body")) == []
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted(site, clock, tmp_path):
+    for n in range(9):
+        site.responses[f"page{n}"] = ({"Cache-Control": "max-age=600"}, b"x" * 100)
+    # Room for eight entries; an entry may take up to an eighth of the cache
+    client, cache = cache_client(tmp_path, clock, max_bytes=850)
+    async with client:
+        for n in range(8):
+            await client.get(site.url(f"/custom/page{n}"))
+            clock.advance(1)
+        await client.get(site.url("/custom/page0"))  # now the most recently used
+        clock.advance(1)
+        await client.get(site.url("/custom/page8"))
+        assert cache.size <= cache.max_bytes and len(stored_entries(tmp_path)) == 8
+
+        for n in (0, *range(2, 9)):
+            await client.get(site.url(f"/custom/page{n}"))
+            assert site.hits[f"/custom/page{n}"] == 1
+        await client.get(site.url("/custom/page1"))
+        assert site.hits["/custom/page1"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_survive_a_restart(site, clock, tmp_path):
+    site.responses["page"] = ({"Cache-Control": "max-age=600", "ETag": '"v1"'}, b"body")
+    url = site.url("/custom/page")
+    client, _ = cache_client(tmp_path, clock)
+    async with client:
+        await client.get(url)
+    # An orphaned body from an interrupted write is removed once it is old
+    orphan = tmp_path / f"{'0' * 64}.deadbeef.body"
+    orphan.write_bytes(b"partial")
+    os.utime(orphan, (clock.now - 7200, clock.now - 7200))
+    site.hits.clear()
+
+    clock.advance(60)
+    client, cache = cache_client(tmp_path, clock)
+    assert cache.size == 4 and not orphan.exists()
+    async with client:
+        response = await client.get(url)
+    assert response.text == "body" and response.extensions["from_cache"]
+    assert site.hits["/custom/page"] == 0
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from mcp.shared.exceptions import McpError
+
+from local_site import LocalSite, fetch_server, text_body
+from mcp_server_fetch.chunking import split_chunks
+from mcp_server_fetch.server import (
+    DEFAULT_USER_AGENT_AUTONOMOUS,
+    ContentCache,
+    RobotsCache,
+    check_may_autonomously_fetch_url,
+    create_http_client,
+    fetch_url,
+)
+
+USER_AGENT = DEFAULT_USER_AGENT_AUTONOMOUS
+
+
+@pytest.fixture
+def site():
+    with LocalSite() as local_site:
+        yield local_site
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with create_http_client(10, 4) as http_client:
+        yield http_client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("robots", [404, "User-agent: *\nAllow: /\n", "User-agent: *\nDisallow: /private/\n"])
+async def test_robots_txt_allows_page(client, robots):
+    with LocalSite(robots=robots) as site:
+        await check_may_autonomously_fetch_url(site.url("/pages/blog-post"), USER_AGENT, client)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("robots", [401, 403, "User-agent: *\nDisallow: /\n"])
+async def test_robots_txt_forbids_page(client, robots):
+    with LocalSite(robots=robots) as site:
+        with pytest.raises(McpError):
+            await check_may_autonomously_fetch_url(site.url("/pages/blog-post"), USER_AGENT, client)
+
+
+@pytest.mark.asyncio
+async def test_robots_txt_is_downloaded_once(client):
+    with LocalSite(robots="User-agent: *\nDisallow: /private/\n") as site:
+        cache = RobotsCache()
+        urls = [site.url(f"/pages/blog-post?n={n}") for n in range(10)]
+        await asyncio.gather(*(check_may_autonomously_fetch_url(url, USER_AGENT, client, cache) for url in urls))
+        with pytest.raises(McpError):
+            await check_may_autonomously_fetch_url(site.url("/private/page"), USER_AGENT, client, cache)
+        assert site.hits["/robots.txt"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_simplifies_html(site, client):
+    content, prefix = await fetch_url(site.url("/pages/documentation"), USER_AGENT, client=client, extractor="lxml")
+    assert prefix == ""
+    assert content.lstrip().startswith("#")
+    assert "<div" not in content
+
+
+@pytest.mark.asyncio
+async def test_fetch_follows_redirects(site, client):
+    content, _ = await fetch_url(site.url("/redirect/3/text/100"), USER_AGENT, client=client)
+    assert content == text_body(100).decode()
+    assert site.hits["/text/100"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_reports_error_status(site, client):
+    with pytest.raises(McpError, match="status code 404"):
+        await fetch_url(site.url("/status/404"), USER_AGENT, client=client)
+
+
+@pytest.mark.asyncio
+async def test_fetch_stops_at_download_limit(site, client):
+    content, prefix = await fetch_url(site.url("/text/5000000"), USER_AGENT, client=client, max_bytes=100_000)
+    assert "100000 byte download limit" in prefix
+    assert len(content) <= 100_000
+
+
+@pytest.mark.asyncio
+async def test_fetch_reads_raw_window_only(site, client):
+    content, _ = await fetch_url(site.url("/text/5000000"), USER_AGENT, force_raw=True, client=client, max_chars=10_000)
+    assert len(content) == 10_000
+
+
+@pytest.mark.asyncio
+async def test_fetch_times_out_on_slow_response(site):
+    async with AsyncClient(timeout=0.2) as slow_client:
+        with pytest.raises(McpError):
+            await fetch_url(site.url("/slow/2/text/10"), USER_AGENT, client=slow_client)
+
+
+@pytest.mark.asyncio
+async def test_content_cache_revalidates_page(site, client):
+    cache = ContentCache()
+    url = site.url("/pages/news-article")
+    first, _ = await fetch_url(url, USER_AGENT, client=client, content_cache=cache, extractor="lxml")
+    second, _ = await fetch_url(url, USER_AGENT, client=client, content_cache=cache, extractor="lxml")
+    assert first == second
+    assert cache.revalidated == 1
+    assert site.hits["/pages/news-article"] == 2
+
+
+def test_chunks_respect_limit_and_structure():
+    content = "\n\n".join(f"## Section {n}\n\n" + "word " * 120 + "\n\n```\n" + "code\n" * 20 + "```" for n in range(10))
+    chunks = split_chunks(content, 1500)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        text = content[chunk.start:chunk.end]
+        assert len(text) <= 1500
+        assert text.count("```") % 2 == 0
+        assert chunk.title.startswith("## Section")
+        assert chunk.byte_end - chunk.byte_start == len(text.encode())
+
+
+SERVER_ARGS = ("--extractor", "lxml", "--extract-workers", "1")
+
+
+@pytest.mark.asyncio
+async def test_call_tool_fetch(site):
+    async with fetch_server(*SERVER_ARGS) as session:
+        result = await session.call_tool("fetch", {"url": site.url("/pages/blog-post"), "max_length": 500})
+    text = result.content[0].text
+    assert text.startswith(f"Contents of {site.url('/pages/blog-post')}:")
+    assert "start_index of 500" in text
+
+
+@pytest.mark.asyncio
+async def test_call_tool_fetch_recovers_from_extraction_timeout(site):
+    # Takes the lxml extractor several seconds
+    site.responses["slow"] = ({}, b"<html><body>" + b"<div><p>A paragraph with a <a href='/'>link</a>.</p></div>" * 20_000)
+    async with fetch_server(*SERVER_ARGS, "--extract-timeout", "0.5") as session:
+        slow = await session.call_tool("fetch", {"url": site.url("/custom/slow")})
+        page = await session.call_tool("fetch", {"url": site.url("/pages/blog-post")})
+    assert "took longer than 0.5s to be simplified" in slow.content[0].text
+    assert page.content[0].text.startswith(f"Contents of {site.url('/pages/blog-post')}:")
+    assert "to be simplified" not in page.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_call_tool_fetch_many(site):
+    urls = [site.url(f"/pages/{name}") for name in site.pages()] + [site.url("/status/500")]
+    async with fetch_server(*SERVER_ARGS) as session:
+        result = await session.call_tool("fetch_many", {"urls": urls, "max_length": 200})
+    assert len(result.content) == len(urls)
+    assert all(item.text.startswith("Contents of") for item in result.content[:-1])
+    assert "status code 500" in result.content[-1].text
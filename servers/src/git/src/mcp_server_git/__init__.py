@@ -2,12 +2,19 @@ import click
 from pathlib import Path
 import logging
 import sys
-from .server import serve
+from .server import DEFAULT_REPO_CACHE_SIZE, serve
 
 @click.command()
 @click.option("--repository", "-r", type=Path, help="Git repository path")
+@click.option(
+    "--repo-cache-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_REPO_CACHE_SIZE,
+    show_default=True,
+    help="Number of repositories kept open between tool calls",
+)
 @click.option("-v", "--verbose", count=True)
-def main(repository: Path | None, verbose: bool) -> None:
+def main(repository: Path | None, repo_cache_size: int, verbose: bool) -> None:
     """MCP Git Server - Git functionality for MCP"""
     import asyncio
 
@@ -18,7 +25,7 @@ def main(repository: Path | None, verbose: bool) -> None:
         logging_level = logging.DEBUG
 
     logging.basicConfig(level=logging_level, stream=sys.stderr)
-    asyncio.run(serve(repository))
+    asyncio.run(serve(repository, repo_cache_size))
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,5 @@
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import Sequence
 from mcp.server import Server
@@ -73,6 +74,51 @@ class GitTools(str, Enum):
     SHOW = "git_show"
     INIT = "git_init"
 
+DEFAULT_REPO_CACHE_SIZE = 16
+
+class RepoCache:
+    """Open `git.Repo` handles, kept from one tool call to the next.
+
+    Opening a repository finds its git dir and reads its config, and the
+    first object read starts persistent `git cat-file` processes. Handles are
+    keyed by resolved path and reused, and the least recently used one is
+    closed, stopping its processes, once more than `max_repos` are open.
+    """
+
+    def __init__(self, max_repos: int = DEFAULT_REPO_CACHE_SIZE):
+        self.max_repos = max_repos
+        self._repos: OrderedDict[Path, git.Repo] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._repos)
+
+    def get(self, repo_path: str | Path) -> git.Repo:
+        key = Path(repo_path).resolve()
+        repo = self._repos.get(key)
+        if repo is not None:
+            if Path(repo.git_dir).is_dir():
+                self._repos.move_to_end(key)
+                return repo
+            # The repository was deleted or moved since it was opened
+            self.discard(key)
+
+        repo = git.Repo(key)
+        self._repos[key] = repo
+        while len(self._repos) > self.max_repos:
+            _, evicted = self._repos.popitem(last=False)
+            evicted.close()
+        return repo
+
+    def discard(self, repo_path: str | Path) -> None:
+        repo = self._repos.pop(Path(repo_path).resolve(), None)
+        if repo is not None:
+            repo.close()
+
+    def close(self) -> None:
+        for repo in self._repos.values():
+            repo.close()
+        self._repos.clear()
+
 def git_status(repo: git.Repo) -> str:
     return repo.git.status()
 
@@ -147,12 +193,13 @@ def git_show(repo: git.Repo, revision: str) -> str:
         output.append(d.diff.decode('utf-8'))
     return "".join(output)
 
-async def serve(repository: Path | None) -> None:
+async def serve(repository: Path | None, repo_cache_size: int = DEFAULT_REPO_CACHE_SIZE) -> None:
     logger = logging.getLogger(__name__)
+    repo_cache = RepoCache(repo_cache_size)
 
     if repository is not None:
         try:
-            git.Repo(repository)
+            repo_cache.get(repository)
             logger.info(f"Using repository at {repository}")
         except git.InvalidGitRepositoryError:
             logger.error(f"{repository} is not a valid Git repository")
@@ -261,13 +308,15 @@ async def serve(repository: Path | None) -> None:
         # Handle git init separately since it doesn't require an existing repo
         if name == GitTools.INIT:
             result = git_init(str(repo_path))
+            # A handle opened before the repository was (re)initialized is stale
+            repo_cache.discard(repo_path)
             return [TextContent(
                 type="text",
                 text=result
             )]
             
         # For all other commands, we need an existing repo
-        repo = git.Repo(repo_path)
+        repo = repo_cache.get(repo_path)
 
         match name:
             case GitTools.STATUS:
@@ -355,5 +404,8 @@ async def serve(repository: Path | None) -> None:
                 raise ValueError(f"Unknown tool: {name}")
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        repo_cache.close()
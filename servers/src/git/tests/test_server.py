@@ -1,7 +1,7 @@
 import pytest
 from pathlib import Path
 import git
-from mcp_server_git.server import git_checkout
+from mcp_server_git.server import RepoCache, git_checkout, git_show
 import shutil
 
 @pytest.fixture
@@ -27,4 +27,61 @@ def test_git_checkout_existing_branch(test_repository):
 def test_git_checkout_nonexistent_branch(test_repository):
 
     with pytest.raises(git.GitCommandError):
-        git_checkout(test_repository, "nonexistent-branch")
\ No newline at end of file
+        git_checkout(test_repository, "nonexistent-branch")
+
+def test_repo_cache_reuses_repo(test_repository):
+    cache = RepoCache()
+    repo = cache.get(test_repository.working_dir)
+
+    assert cache.get(Path(test_repository.working_dir) / ".") is repo
+    assert len(cache) == 1
+    cache.close()
+
+def test_repo_cache_keeps_cat_file_alive(test_repository):
+    cache = RepoCache()
+    repo = cache.get(test_repository.working_dir)
+    repo.head.commit.tree["test.txt"].data_stream.read()
+    cat_file = repo.git.cat_file_all
+
+    assert cat_file is not None
+    git_show(cache.get(test_repository.working_dir), "HEAD")
+    assert repo.git.cat_file_all is cat_file
+    cache.close()
+    assert repo.git.cat_file_all is None
+
+def _committed_repo(repo_path: Path) -> git.Repo:
+    repo = git.Repo.init(repo_path)
+    (repo_path / "test.txt").write_text("test")
+    repo.index.add(["test.txt"])
+    repo.index.commit("initial commit")
+    return repo
+
+def test_repo_cache_closes_least_recently_used(tmp_path: Path):
+    paths = [tmp_path / f"repo{n}" for n in range(3)]
+    for path in paths:
+        _committed_repo(path)
+    cache = RepoCache(max_repos=2)
+    first = cache.get(paths[0])
+    git_show(first, "HEAD")
+    assert first.git.cat_file_all is not None
+    cache.get(paths[1])
+    cache.get(paths[2])
+
+    assert len(cache) == 2
+    assert first.git.cat_file_all is None
+    assert cache.get(paths[0]) is not first
+    cache.close()
+
+def test_repo_cache_forgets_deleted_repository(tmp_path: Path):
+    repo_path = tmp_path / "deleted_repo"
+    _committed_repo(repo_path)
+    cache = RepoCache()
+    repo = cache.get(repo_path)
+    git_show(repo, "HEAD")
+    assert repo.git.cat_file_all is not None
+    shutil.rmtree(repo_path)
+
+    with pytest.raises(git.NoSuchPathError):
+        cache.get(repo_path)
+    assert len(cache) == 0
+    assert repo.git.cat_file_all is None
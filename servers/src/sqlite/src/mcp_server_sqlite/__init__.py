@@ -9,9 +9,68 @@ def main():
     parser.add_argument('--db-path', 
                        default="./sqlite_mcp_server.db",
                        help='Path to SQLite database file')
+    parser.add_argument('--readers',
+                       type=int,
+                       default=server.DEFAULT_READERS,
+                       help='Number of pooled read-only connections')
+    parser.add_argument('--max-concurrent-queries',
+                       type=int,
+                       default=server.DEFAULT_MAX_CONCURRENT_QUERIES,
+                       help='Maximum number of queries executing at once')
+    parser.add_argument('--query-timeout',
+                       type=float,
+                       default=server.DEFAULT_QUERY_TIMEOUT,
+                       help='Seconds after which a query is interrupted (0 disables)')
+    parser.add_argument('--statement-cache-size',
+                       type=int,
+                       default=server.DEFAULT_STATEMENT_CACHE_SIZE,
+                       help='Prepared statements cached per connection')
+    parser.add_argument('--slow-query-threshold',
+                       type=float,
+                       default=server.DEFAULT_SLOW_QUERY_THRESHOLD,
+                       help='Seconds after which a query is recorded for the index advisor')
+    parser.add_argument('--mode',
+                       choices=server.OPEN_MODES,
+                       default="rw",
+                       help='Open the databases read-write, read-only, or read-only and immutable')
+    parser.add_argument('--attach',
+                       action='append',
+                       default=[],
+                       metavar='NAME=PATH',
+                       help='Attach another database file under schema NAME (repeatable)')
+    parser.add_argument('--max-insights',
+                       type=int,
+                       default=0,
+                       help='Keep only this many of the latest insights (0 keeps all)')
+    parser.add_argument('--memo-window',
+                       type=int,
+                       default=0,
+                       help='Show only this many of the latest insights in the memo (0 shows all)')
+    parser.add_argument('--result-cache-bytes',
+                       type=int,
+                       default=server.DEFAULT_RESULT_CACHE_BYTES,
+                       help='Memory for cached read_query results (0 disables)')
     
     args = parser.parse_args()
-    asyncio.run(server.main(args.db_path))
+    attachments = {}
+    for attachment in args.attach:
+        name, separator, path = attachment.partition('=')
+        if not separator or not name or not path:
+            parser.error(f"--attach expects NAME=PATH, got {attachment!r}")
+        attachments[name] = path
+    asyncio.run(server.main(
+        args.db_path,
+        readers=args.readers,
+        max_concurrent_queries=args.max_concurrent_queries,
+        query_timeout=args.query_timeout or None,
+        statement_cache_size=args.statement_cache_size,
+        slow_query_threshold=args.slow_query_threshold,
+        mode=args.mode,
+        attachments=attachments,
+        max_insights=args.max_insights,
+        memo_window=args.memo_window,
+        result_cache_bytes=args.result_cache_bytes,
+    ))
 
 
 # Optionally expose other important items at package level
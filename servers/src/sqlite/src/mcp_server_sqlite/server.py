@@ -1,15 +1,28 @@
+import io
 import os
+import csv
 import sys
+import json
+import time
+import re
+import queue
+import asyncio
+import secrets
 import sqlite3
 import logging
-from contextlib import closing
+import itertools
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from functools import partial
 from pathlib import Path
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
 from pydantic import AnyUrl
-from typing import Any
+from typing import Any, Callable, Iterator, TypeVar
 
 # reconfigure UnicodeEncodeError prone default (i.e. windows-1252) to utf-8
 if sys.platform == "win32" and os.environ.get('PYTHONIOENCODING') is None:
@@ -101,68 +114,1571 @@ The provided XML tags are for the assistants understanding. Implore to make all
 Start your first message fully in character with something like "Oh, Hey there! I see you've chosen the topic {topic}. Let's get started! 🚀"
 """
 
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'DROP', 'ALTER')
+
+DEFAULT_READERS = 4
+DEFAULT_MAX_CONCURRENT_QUERIES = 4
+DEFAULT_QUERY_TIMEOUT = 30.0
+
+# Number of SQLite virtual machine instructions between timeout/cancel checks
+PROGRESS_HANDLER_INTERVAL = 1000
+
+RESULT_FORMATS = ("jsonl", "csv")
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 10000
+DEFAULT_MAX_PAGE_BYTES = 256 * 1024
+FETCH_BATCH_SIZE = 256
+MAX_OPEN_CURSORS = 16
+CURSOR_TTL = 300.0
+
+DEFAULT_STATEMENT_CACHE_SIZE = 256
+
+# rw: read-write; ro: read-only, sees changes made by other processes;
+# immutable: read-only without locking, for files nothing else modifies
+OPEN_MODES = ("rw", "ro", "immutable")
+# Tools not offered when the database is opened read-only
+WRITE_TOOLS = ("write_query", "create_table", "import_csv", "import_jsonl")
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_BATCH_SIZE = 5000
+# Rows read ahead to infer column types when an import creates its table
+SCHEMA_SAMPLE_ROWS = 1000
+
+DEFAULT_SLOW_QUERY_THRESHOLD = 0.1
+MAX_SLOW_QUERIES = 50
+
+INSIGHTS_TABLE = "mcp_insights"
+
+DEFAULT_RESULT_CACHE_BYTES = 32 * 1024 * 1024
+# String literals and quoted identifiers, whose whitespace is significant
+_QUOTED_SQL = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])""")
+# Results of queries calling these functions can change without a write
+_VOLATILE_SQL = re.compile(
+    r"\b(?:random|randomblob|changes|total_changes|last_insert_rowid|date|time|datetime|julianday|"
+    r"unixepoch|strftime|timediff|current_date|current_time|current_timestamp)\b",
+    re.IGNORECASE,
+)
+
+T = TypeVar("T")
+
+# Named (:name) parameters as an object or positional (?) parameters as a list
+Params = dict[str, Any] | list[Any]
+
+# Applied to every pooled connection. WAL lets readers run alongside the
+# writer, and synchronous=NORMAL is durable across application crashes in WAL
+# mode while avoiding an fsync per commit.
+DEFAULT_PRAGMAS: dict[str, Any] = {
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # KiB, i.e. 64 MB of page cache per connection
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+class ConnectionPool:
+    """Long-lived SQLite connections: a single writer and a pool of readers"""
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = DEFAULT_READERS,
+        pragmas: dict[str, Any] | None = None,
+        statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+        mode: str = "rw",
+        attachments: dict[str, str] | None = None,
+    ):
+        if mode not in OPEN_MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        self.db_path = db_path
+        self.mode = mode
+        self.read_only = mode != "rw"
+        self.attachments = dict(attachments or {})
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.statement_cache_size = statement_cache_size
+        # sqlite3 keeps an LRU of prepared statements per connection but does
+        # not report its hit rate, so pooled connections mirror it here
+        self._statement_caches: dict[int, OrderedDict[str, None]] = {}
+        self._stats_lock = threading.Lock()
+        self.statement_hits = 0
+        self.statement_misses = 0
+        # Bumped every time the writer is borrowed for writing, so cached data
+        # can tell whether it may be stale
+        self.write_generation = 0
+        self._writer_lock = threading.Lock()
+        # Private in-memory databases cannot be shared between connections
+        if db_path == ":memory:":
+            if self.read_only:
+                raise ValueError("In-memory databases cannot be opened read-only")
+            readers = 0
+        elif self.read_only:
+            readers = max(readers, 1)
+        # A read-only pool has no writer; all queries go through the readers
+        self._writer = None if self.read_only else self._connect()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        # Borrowed readers handed over to their borrower, replaced on return
+        self._detached: set[int] = set()
+        for _ in range(readers):
+            self._readers.put(self.connect_reader())
+        self.reader_count = readers
+        if self._writer is not None:
+            self.journal_mode = self._writer.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        else:
+            with self.reader() as conn:
+                self.journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        for conn in [self._writer, *self._readers.queue]:
+            if conn is not None:
+                self._statement_caches[id(conn)] = OrderedDict()
+        self._probe: sqlite3.Connection | None = None
+        self._probe_lock = threading.Lock()
+
+    def _uri(self, path: str) -> str:
+        """Filename or URI to open `path` with in the pool's mode"""
+        if not self.read_only:
+            return path
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        return uri + "&immutable=1" if self.mode == "immutable" else uri
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: single statements commit immediately and explicit
+        # transactions are opened with BEGIN where needed
+        conn = sqlite3.connect(
+            self._uri(self.db_path),
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+            uri=self.read_only,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        for schema, path in self.attachments.items():
+            conn.execute(f"ATTACH DATABASE ? AS {_quote_identifier(schema)}", (self._uri(path),))
+        if self.read_only:
+            # Pages of a read-only database never change, so map each file whole
+            for schema, path in [("main", self.db_path), *self.attachments.items()]:
+                size = max(int(self.pragmas["mmap_size"]), os.path.getsize(path))
+                conn.execute(f"PRAGMA {_quote_identifier(schema)}.mmap_size={size}")
+        return conn
+
+    def connect_reader(self) -> sqlite3.Connection:
+        """Open a new read-only connection outside the pool"""
+        if self.db_path == ":memory:":
+            raise sqlite3.OperationalError("In-memory databases do not support additional connections")
+        conn = self._connect()
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def data_version(self) -> tuple[int, ...] | None:
+        """A value that changes whenever another connection or process commits
+
+        Read through a dedicated connection, since PRAGMA data_version only
+        reports commits made by other connections. Returns None where nothing
+        else can change the data: private in-memory and immutable databases.
+        """
+        if self.db_path == ":memory:" or self.mode == "immutable":
+            return None
+        with self._probe_lock:
+            if self._probe is None:
+                self._probe = self.connect_reader()
+            return tuple(
+                self._probe.execute(f"PRAGMA {_quote_identifier(schema)}.data_version").fetchone()[0]
+                for schema in ["main", *self.attachments]
+            )
+
+    def record_statement(self, conn: sqlite3.Connection, sql: str):
+        """Count whether `sql` was served from the statement cache of a pooled connection"""
+        cache = self._statement_caches.get(id(conn))
+        if cache is None:
+            return
+        hit = sql in cache
+        if hit:
+            cache.move_to_end(sql)
+        else:
+            cache[sql] = None
+            if len(cache) > self.statement_cache_size:
+                cache.popitem(last=False)
+        with self._stats_lock:
+            if hit:
+                self.statement_hits += 1
+            else:
+                self.statement_misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Connection and prepared statement cache statistics"""
+        lookups = self.statement_hits + self.statement_misses
+        return {
+            "mode": self.mode,
+            "attached": list(self.attachments),
+            "readers": self.reader_count,
+            "journal_mode": self.journal_mode,
+            "statement_cache_size": self.statement_cache_size,
+            "statement_cache_hits": self.statement_hits,
+            "statement_cache_misses": self.statement_misses,
+            "statement_cache_hit_rate": self.statement_hits / lookups if lookups else 0.0,
+        }
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the writer connection, serializing all writes"""
+        if self._writer is None:
+            raise sqlite3.OperationalError(f"Database is opened {self.mode}, writes are not allowed")
+        with self._writer_lock:
+            try:
+                yield self._writer
+            finally:
+                self.write_generation += 1
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection, falling back to the writer if there are none"""
+        if not self.reader_count:
+            if self._writer is None:
+                raise sqlite3.OperationalError("No connection is available for reading")
+            # Reading on the writer changes nothing, so write_generation stays
+            with self._writer_lock:
+                yield self._writer
+            return
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if id(conn) not in self._detached:
+                self._readers.put(conn)
+            else:
+                self._detached.discard(id(conn))
+                self._replace_reader()
+
+    def detach(self, conn: sqlite3.Connection) -> bool:
+        """Keep a borrowed reader for good, so it is not returned to the pool
+
+        The pool opens a new reader in its place. The caller closes `conn` when
+        done with it. Returns False, keeping nothing, when `conn` is the writer.
+        """
+        if conn is self._writer:
+            return False
+        self._statement_caches.pop(id(conn), None)
+        self._detached.add(id(conn))
+        return True
+
+    def _replace_reader(self):
+        try:
+            conn = self.connect_reader()
+        except sqlite3.Error as e:
+            logger.error(f"Could not replace a detached reader: {e}")
+            self.reader_count -= 1
+            return
+        self._statement_caches[id(conn)] = OrderedDict()
+        self._readers.put(conn)
+
+    def close(self):
+        with self._probe_lock:
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
+        for _ in range(self.reader_count):
+            self._readers.get().close()
+        self.reader_count = 0
+        if self._writer is not None:
+            with self._writer_lock:
+                self._writer.close()
+
+
+class OpenResult:
+    """A partially consumed result set kept open between read_query pages"""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection | None,
+        rows: Iterator[Any],
+        columns: list[str],
+        owns_connection: bool = True,
+    ):
+        self.conn = conn
+        # A connection borrowed from the pool goes back to it instead of being closed
+        self.owns_connection = owns_connection
+        self.rows = rows
+        self.columns = columns
+        self.rows_read = 0
+        self.expires = 0.0
+        self._pushed_back: list[Any] = []
+
+    def fetch(self, size: int) -> list[Any]:
+        """Fetch up to `size` rows, starting with any that were pushed back"""
+        batch, self._pushed_back = self._pushed_back[:size], self._pushed_back[size:]
+        if len(batch) < size:
+            if isinstance(self.rows, sqlite3.Cursor):
+                batch += self.rows.fetchmany(size - len(batch))
+            else:
+                batch += itertools.islice(self.rows, size - len(batch))
+        return batch
+
+    def push_back(self, rows: list[Any]):
+        """Return fetched but unused rows so the next fetch yields them first"""
+        self._pushed_back = rows + self._pushed_back
+
+    def materialize(self):
+        """Read the remaining rows into memory, letting go of the connection"""
+        rows = self._pushed_back + (self.rows.fetchall() if isinstance(self.rows, sqlite3.Cursor) else list(self.rows))
+        self.close()
+        self.rows = iter(rows)
+        self._pushed_back = []
+
+    def close(self):
+        """Finish the statement, and close the connection if it owns one"""
+        if isinstance(self.rows, sqlite3.Cursor):
+            self.rows.close()
+        if self.conn is not None and self.owns_connection:
+            self.conn.close()
+        self.conn = None
+
+
+class CursorRegistry:
+    """Open result sets addressable by continuation token
+
+    Each open cursor holds a dedicated connection and a read transaction, so at
+    most `max_open` are kept and those idle for longer than `ttl` are closed.
+    """
+
+    def __init__(self, max_open: int = MAX_OPEN_CURSORS, ttl: float = CURSOR_TTL):
+        self.max_open = max_open
+        self.ttl = ttl
+        self._results: OrderedDict[str, OpenResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, result: OpenResult, token: str | None = None) -> str:
+        """Register `result`, reusing `token` when continuing a cursor"""
+        token = token or secrets.token_urlsafe(12)
+        result.expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._expire()
+            self._results[token] = result
+            while len(self._results) > self.max_open:
+                _, oldest = self._results.popitem(last=False)
+                oldest.close()
+        return token
+
+    def take(self, token: str) -> OpenResult | None:
+        """Remove and return the result for `token`, if it is still open"""
+        with self._lock:
+            self._expire()
+            return self._results.pop(token, None)
+
+    def _expire(self):
+        now = time.monotonic()
+        for token in [t for t, r in self._results.items() if r.expires < now]:
+            self._results.pop(token).close()
+
+    def close(self):
+        with self._lock:
+            for result in self._results.values():
+                result.close()
+            self._results.clear()
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _serialize_page(result: OpenResult, page_size: int, max_bytes: int, format: str) -> tuple[str, int, bool]:
+    """Serialize rows from `result` until `page_size` rows or `max_bytes` bytes
+
+    Returns the text, the number of rows written and whether the result set is
+    exhausted. At least one row is always written so paging makes progress.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n") if format == "csv" else None
+
+    def encode(values: list[Any]) -> str:
+        if writer is None:
+            return json.dumps(values, default=_json_value, ensure_ascii=False) + "\n"
+        writer.writerow(["" if v is None else v.hex() if isinstance(v, bytes) else v for v in values])
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    lines = [encode(result.columns)]
+    size = len(lines[0].encode())
+    rows = 0
+    while rows < page_size:
+        batch = result.fetch(min(FETCH_BATCH_SIZE, page_size - rows))
+        if not batch:
+            return "".join(lines), rows, True
+        for index, row in enumerate(batch):
+            line = encode(list(row))
+            line_size = len(line.encode())
+            if rows and size + line_size > max_bytes:
+                result.push_back(batch[index:])
+                return "".join(lines), rows, False
+            lines.append(line)
+            size += line_size
+            rows += 1
+    peek = result.fetch(1)
+    result.push_back(peek)
+    return "".join(lines), rows, not peek
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _infer_type(values: list[Any]) -> str:
+    """Narrowest of INTEGER, REAL and TEXT that fits every non-null sample value"""
+    affinity = "INTEGER"
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, str):
+            try:
+                int(value)
+                continue
+            except ValueError:
+                pass
+            try:
+                float(value)
+                affinity = "REAL"
+                continue
+            except ValueError:
+                return "TEXT"
+        if isinstance(value, float):
+            affinity = "REAL"
+        elif not isinstance(value, int):
+            return "TEXT"
+    return affinity
+
+
+def _sql_value(value: Any) -> Any:
+    """Store nested JSON values as JSON text"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _row_estimate(conn: sqlite3.Connection, schema: str, table: str) -> int | None:
+    """Approximate row count without scanning the table
+
+    Uses the statistics gathered by ANALYZE when present, else the largest rowid,
+    which is exact unless rows have been deleted.
+    """
+    schema = _quote_identifier(schema)
+    try:
+        row = conn.execute(
+            f"SELECT stat FROM {schema}.sqlite_stat1 WHERE tbl = ? ORDER BY idx IS NULL DESC LIMIT 1", (table,)
+        ).fetchone()
+        if row is not None:
+            return int(row[0].split()[0])
+    except sqlite3.OperationalError:
+        pass  # ANALYZE has never run
+    try:
+        return conn.execute(f"SELECT MAX(rowid) FROM {schema}.{_quote_identifier(table)}").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return None  # WITHOUT ROWID table
+
+
+class SlowQueryLog:
+    """Statements that took at least `threshold` seconds, aggregated by SQL text
+
+    Holds at most `max_entries` statements, dropping the least recently slow.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_SLOW_QUERY_THRESHOLD, max_entries: int = MAX_SLOW_QUERIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, query: str, params: Params | None, seconds: float):
+        if seconds < self.threshold:
+            return
+        key = " ".join(query.split())
+        with self._lock:
+            entry = self._entries.pop(key, None) or {
+                "query": query, "count": 0, "total_seconds": 0.0, "max_seconds": 0.0
+            }
+            entry["params"] = params
+            entry["count"] += 1
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug(f"Slow query ({seconds:.3f}s): {query}")
+
+    def discard(self, query: str):
+        with self._lock:
+            self._entries.pop(" ".join(query.split()), None)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Recorded statements, the most total time first"""
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        return sorted(entries, key=lambda entry: entry["total_seconds"], reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_IDENTIFIER = r'(?:"(?:[^"]|"")+"|\w+)'
+_TABLE_REFERENCE = re.compile(
+    rf"\b(?:FROM|JOIN|UPDATE|INTO)\s+({_IDENTIFIER})(?:\s+(?:AS\s+)?({_IDENTIFIER}))?", re.IGNORECASE
+)
+# A column compared to something, e.g. `o.status = ?` or `price BETWEEN 1 AND 2`;
+# the operator decides whether it can lead an index (equality) or end it (range)
+_COMPARED_COLUMN = re.compile(
+    rf"(?:({_IDENTIFIER})\s*\.\s*)?({_IDENTIFIER})\s*(==|=|<=|>=|<(?!>)|>|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b|\bGLOB\b)",
+    re.IGNORECASE,
+)
+# The right-hand side of a join condition, e.g. `= i.id`
+_COMPARED_QUALIFIED_COLUMN = re.compile(rf"(?:==|=|<=|>=|<|>)\s*({_IDENTIFIER})\s*\.\s*({_IDENTIFIER})")
+_QUALIFIED_COLUMN = re.compile(rf"\s*{_IDENTIFIER}\s*\.\s*{_IDENTIFIER}")
+_EQUALITY_OPERATORS = {"=", "==", "IN", "IS"}
+_NOT_ALIASES = {
+    "WHERE", "ON", "USING", "JOIN", "LEFT", "RIGHT", "FULL", "INNER", "OUTER", "CROSS", "NATURAL",
+    "GROUP", "ORDER", "LIMIT", "HAVING", "WINDOW", "UNION", "EXCEPT", "INTERSECT", "SET", "VALUES",
+    "SELECT", "DEFAULT", "INDEXED", "NOT", "RETURNING",
+}
+# A full scan in EXPLAIN QUERY PLAN output: "SCAN items", but not "SCAN items USING INDEX ...",
+# or a search through an automatic index, which SQLite builds with a full scan on every run
+_FULL_SCAN = re.compile(
+    r"^(?:SCAN (?:TABLE )?(\S+)(?: AS (\S+))?$|SEARCH (?:TABLE )?(\S+)(?: AS (\S+))? USING AUTOMATIC )"
+)
+
+
+def _unquote(identifier: str) -> str:
+    if identifier.startswith('"'):
+        return identifier[1:-1].replace('""', '"')
+    return identifier
+
+
+def _compared_columns(query: str) -> list[tuple[str | None, str, bool, bool]]:
+    """(qualifier, column, is_equality, is_join) for every column the query compares
+
+    `is_join` is set when the column is compared to a column of another table.
+    """
+    text = _STRING_LITERAL.sub("''", query)
+    found = []
+    for match in _COMPARED_COLUMN.finditer(text):
+        qualifier, column, operator = match.groups()
+        is_join = _QUALIFIED_COLUMN.match(text, match.end()) is not None
+        found.append((
+            qualifier and _unquote(qualifier),
+            _unquote(column),
+            operator.upper() in _EQUALITY_OPERATORS,
+            is_join,
+        ))
+    for match in _COMPARED_QUALIFIED_COLUMN.finditer(text):
+        found.append((_unquote(match.group(1)), _unquote(match.group(2)), True, True))
+    return found
+
+
+class SchemaCatalog:
+    """In-memory description of the database schema
+
+    The catalog is tagged with PRAGMA schema_version of the main and attached
+    databases, which SQLite increments on every schema change from any
+    connection, and is rebuilt once that moves. Tables of attached databases are
+    named `schema.table`. Table details are loaded lazily per table. Row
+    estimates are also refreshed after writes, tracked through the pool's write
+    generation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version: tuple[int, ...] | None = None
+        self._tables: dict[str, dict[str, Any]] = {}
+        self._details: dict[str, dict[str, Any]] = {}
+        self._row_estimates: dict[str, int | None] = {}
+        self._rows_generation = -1
+        self.hits = 0
+        self.misses = 0
+
+    def _sync(self, conn: sqlite3.Connection, generation: int):
+        """Reload the table list if the schema changed, and drop stale row estimates"""
+        schemas = [row["name"] for row in conn.execute("PRAGMA database_list") if row["name"] != "temp"]
+        for schema in schemas:
+            # Pragmas such as index_list read the connection's parsed copy of the
+            # schema, which is only refreshed by a statement that reads the database
+            conn.execute(f"SELECT 1 FROM {_quote_identifier(schema)}.sqlite_master LIMIT 0").fetchall()
+        version = tuple(
+            conn.execute(f"PRAGMA {_quote_identifier(schema)}.schema_version").fetchone()[0] for schema in schemas
+        )
+        if version == self.version:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._tables = {}
+            for schema in schemas:
+                # The server's own insights table is not part of the user's schema
+                for row in conn.execute(
+                    f"SELECT name, type, sql FROM {_quote_identifier(schema)}.sqlite_master "
+                    "WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%' AND name != ? ORDER BY name",
+                    (INSIGHTS_TABLE,),
+                ):
+                    name = row["name"] if schema == "main" else f"{schema}.{row['name']}"
+                    self._tables[name] = {
+                        "name": name, "schema": schema, "table": row["name"], "type": row["type"], "sql": row["sql"]
+                    }
+            self._details.clear()
+            self._row_estimates.clear()
+            self.version = version
+        if generation != self._rows_generation:
+            self._row_estimates.clear()
+            self._rows_generation = generation
+
+    def _rows(self, conn: sqlite3.Connection, table: dict[str, Any]) -> int | None:
+        name = table["name"]
+        if name not in self._row_estimates:
+            self._row_estimates[name] = (
+                _row_estimate(conn, table["schema"], table["table"]) if table["type"] == "table" else None
+            )
+        return self._row_estimates[name]
+
+    def tables(self, conn: sqlite3.Connection, generation: int) -> list[dict[str, Any]]:
+        """Name, type and estimated row count of every table and view"""
+        with self._lock:
+            self._sync(conn, generation)
+            return [
+                {"name": table["name"], "type": table["type"], "row_estimate": self._rows(conn, table)}
+                for table in self._tables.values()
+            ]
+
+    def describe(self, conn: sqlite3.Connection, name: str, generation: int) -> dict[str, Any]:
+        """Columns, indexes, foreign keys and estimated row count of one table"""
+        with self._lock:
+            self._sync(conn, generation)
+            table = self._tables.get(name)
+            if table is None:
+                raise ValueError(f"Unknown table: {name}")
+            if name not in self._details:
+                schema = _quote_identifier(table["schema"])
+                quoted = _quote_identifier(table["table"])
+                indexes = []
+                for index in conn.execute(f"PRAGMA {schema}.index_list({quoted})").fetchall():
+                    columns = conn.execute(
+                        f"PRAGMA {schema}.index_info({_quote_identifier(index['name'])})"
+                    ).fetchall()
+                    indexes.append({
+                        "name": index["name"],
+                        "unique": bool(index["unique"]),
+                        "origin": index["origin"],
+                        "partial": bool(index["partial"]),
+                        "columns": [column["name"] for column in columns],
+                    })
+                self._details[name] = {
+                    "name": name,
+                    "type": table["type"],
+                    "sql": table["sql"],
+                    "columns": [dict(row) for row in conn.execute(f"PRAGMA {schema}.table_info({quoted})")],
+                    "indexes": indexes,
+                    "foreign_keys": [
+                        {
+                            "id": row["id"],
+                            "from": row["from"],
+                            "table": row["table"],
+                            "to": row["to"],
+                            "on_update": row["on_update"],
+                            "on_delete": row["on_delete"],
+                        }
+                        for row in conn.execute(f"PRAGMA {schema}.foreign_key_list({quoted})")
+                    ],
+                }
+            return {**self._details[name], "row_estimate": self._rows(conn, table)}
+
+    def stats(self) -> dict[str, Any]:
+        return {"version": self.version, "hits": self.hits, "misses": self.misses}
+
+
+def _csv_records(
+    file: io.TextIOBase, delimiter: str, header: bool
+) -> tuple[list[str] | None, Iterator[tuple[int, list[Any]]]]:
+    """Return the header (if any) and (line, values) pairs; empty fields are NULL"""
+    reader = csv.reader(file, delimiter=delimiter)
+    names = next(reader, None) if header else None
+    if header and names is None:
+        raise ValueError("CSV file is empty")
+    return names, ((reader.line_num, [v if v != "" else None for v in row]) for row in reader if row)
+
+
+def _jsonl_records(file: io.TextIOBase) -> Iterator[tuple[int, dict[str, Any]]]:
+    for line_num, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_num}: invalid JSON: {e}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_num}: expected a JSON object")
+        yield line_num, record
+
+
+class ResultCache:
+    """Complete first pages of read_query results, least recently used evicted first
+
+    Entries are stored with the database version they were read at and only
+    served while it is unchanged. The total size is bounded by `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._version: Any = None
+        self._entries: OrderedDict[tuple, tuple[str, dict[str, Any], int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query: str, params: Params | None, *options: Any) -> tuple | None:
+        """Cache key for a query, or None if its results may change without a write
+
+        Whitespace outside string literals and quoted identifiers is collapsed, so
+        formatting does not defeat the cache.
+        """
+        pieces = _QUOTED_SQL.split(query)
+        if _VOLATILE_SQL.search(" ".join(pieces[0::2])):
+            return None
+        normalized = "".join(
+            piece if index % 2 else " ".join(piece.split()) for index, piece in enumerate(pieces)
+        ).rstrip("; ")
+        return (normalized, json.dumps(params or None, sort_keys=True, default=str), *options)
+
+    def _sync(self, version: Any):
+        # Entries read at an older version can never be served again
+        if version != self._version:
+            self._entries.clear()
+            self.size = 0
+            self._version = version
+
+    def get(self, key: tuple, version: Any) -> tuple[str, dict[str, Any]] | None:
+        with self._lock:
+            self._sync(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key: tuple, version: Any, text: str, metadata: dict[str, Any]):
+        size = sys.getsizeof(text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._sync(version)
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[2]
+            self._entries[key] = (text, metadata, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self._entries.popitem(last=False)[1][2]
+                self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class InsightStore:
+    """Insights behind the memo://insights resource and their rendered memo
+
+    Keeps only what the memo shows: every insight by default, or the latest
+    `window` when set. `limit` caps how many insights exist at all, as older
+    ones are deleted from the database. The memo body is extended on each
+    append rather than rebuilt, and the rendered memo is cached until the next
+    append.
+    """
+
+    def __init__(self, window: int = 0, limit: int = 0):
+        # The memo never shows more insights than are kept
+        self.window = min((n for n in (window, limit) if n > 0), default=0)
+        self.limit = limit
+        self.count = 0
+        self._recent: deque[str] = deque(maxlen=self.window or None)
+        self._body = ""
+        self._memo: str | None = None
+
+    def add(self, insight: str):
+        line = f"- {insight}"
+        if self.window:
+            self._recent.append(line)
+        else:
+            self._body += ("\n" if self._body else "") + line
+        self.count = min(self.count + 1, self.limit) if self.limit else self.count + 1
+        self._memo = None
+
+    def memo(self) -> str:
+        if self._memo is None:
+            self._memo = self._render()
+        return self._memo
+
+    def _render(self) -> str:
+        logger.debug(f"Synthesizing memo with {self.count} insights")
+        if not self.count:
+            return "No business insights have been discovered yet."
+
+        memo = "📊 Business Intelligence Memo 📊\n\n"
+        memo += "Key Insights Discovered:\n\n"
+        if self.window:
+            if self.count > len(self._recent):
+                memo += f"(Showing the latest {len(self._recent)} of {self.count} insights)\n"
+            memo += "\n".join(self._recent)
+        else:
+            memo += self._body
+
+        if self.count > 1:
+            memo += "\nSummary:\n"
+            memo += f"Analysis has revealed {self.count} key business insights that suggest opportunities for strategic optimization and growth."
+
+        logger.debug("Generated basic memo format")
+        return memo
+
+
 class SqliteDatabase:
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = DEFAULT_READERS,
+        max_concurrent_queries: int = DEFAULT_MAX_CONCURRENT_QUERIES,
+        query_timeout: float | None = DEFAULT_QUERY_TIMEOUT,
+        statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+        slow_query_threshold: float = DEFAULT_SLOW_QUERY_THRESHOLD,
+        mode: str = "rw",
+        attachments: dict[str, str] | None = None,
+        max_insights: int = 0,
+        memo_window: int = 0,
+        result_cache_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+    ):
         self.db_path = str(Path(db_path).expanduser())
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.attachments = {name: str(Path(path).expanduser()) for name, path in (attachments or {}).items()}
+        for name, path in self.attachments.items():
+            if not re.fullmatch(r"\w+", name) or name.lower() in ("main", "temp"):
+                raise ValueError(f"Invalid schema name for attached database: {name}")
+            if not Path(path).is_file():
+                raise ValueError(f"Attached database not found: {path}")
+        if mode == "rw":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        elif not Path(self.db_path).is_file():
+            raise ValueError(f"Database not found: {self.db_path}")
+        self.readers = readers
+        self.query_timeout = query_timeout
+        self.statement_cache_size = statement_cache_size
+        self.max_insights = max_insights
         self._init_database()
-        self.insights: list[str] = []
+        self.insights = InsightStore(window=memo_window, limit=max_insights)
+        self._load_insights()
+        # Queries run on worker threads so they never block the event loop
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_queries, thread_name_prefix="sqlite-query")
+        self._query_slots = asyncio.Semaphore(max_concurrent_queries)
+        self._cursors = CursorRegistry()
+        self.catalog = SchemaCatalog()
+        self.slow_queries = SlowQueryLog(slow_query_threshold)
+        self.results = ResultCache(result_cache_bytes) if result_cache_bytes > 0 else None
 
     def _init_database(self):
-        """Initialize connection to the SQLite database"""
-        logger.debug("Initializing database connection")
-        with closing(sqlite3.connect(self.db_path)) as conn:
-            conn.row_factory = sqlite3.Row
-            conn.close()
+        """Open the pool of connections to the SQLite database"""
+        logger.debug("Initializing database connection pool")
+        self.pool = ConnectionPool(
+            self.db_path,
+            readers=self.readers,
+            statement_cache_size=self.statement_cache_size,
+            mode=self.mode,
+            attachments=self.attachments,
+        )
+        logger.debug(f"Opened {self.pool.reader_count} readers, journal mode {self.pool.journal_mode}")
+
+    def close(self):
+        """Stop the query workers and close all pooled connections"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._cursors.close()
+        self.pool.close()
+
+    async def _run(self, fn: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any) -> T:
+        """Run `fn` on a worker thread without blocking the event loop
+
+        At most `max_concurrent_queries` calls run at once. `fn` receives `timeout`
+        (default `query_timeout`) and a `cancelled` event, which is set when the
+        awaiting task is cancelled, e.g. because the client cancelled the request.
+        """
+        timeout = self.query_timeout if timeout is None else timeout
+        cancelled = threading.Event()
+        async with self._query_slots:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(fn, *args, timeout=timeout, cancelled=cancelled, **kwargs)
+            )
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                logger.debug(f"Cancelling {fn.__name__}")
+                cancelled.set()
+                # Hold the slot until the worker has actually stopped
+                await asyncio.wait([future])
+                raise
+
+    async def execute_query(
+        self,
+        query: str,
+        params: Params | None = None,
+        timeout: float | None = None,
+        write: bool | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute a SQL query on a worker thread, interrupting it after `timeout` seconds"""
+        return await self._run(self._execute_query, query, params, write, timeout=timeout)
+
+    async def execute_many(
+        self, query: str, params_list: list[Params], timeout: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Execute a write statement once per parameter set in a single transaction"""
+        return await self._run(self._execute_many, query, params_list, timeout=timeout)
+
+    async def import_file(
+        self,
+        path: str,
+        table: str,
+        format: str,
+        columns: dict[str, str] | None = None,
+        delimiter: str = ",",
+        header: bool = True,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> dict[str, Any]:
+        """Load a CSV or JSONL file into `table`; bulk operations are not timed out"""
+        return await self._run(
+            self._import_file, path, table, format, columns, delimiter, header, batch_size, timeout=0
+        )
+
+    async def export_query(
+        self,
+        query: str,
+        path: str,
+        params: Params | None = None,
+        format: str = "csv",
+        overwrite: bool = False,
+    ) -> dict[str, Any]:
+        """Stream the result of a SELECT to a CSV or JSONL file"""
+        return await self._run(self._export_query, query, path, params, format, overwrite, timeout=0)
+
+    async def list_tables(self) -> list[dict[str, Any]]:
+        """Tables and views with estimated row counts, from the schema catalog"""
+        return await self._run(self._with_reader, self.catalog.tables)
+
+    async def describe_table(self, name: str) -> dict[str, Any]:
+        """Schema of one table, from the schema catalog"""
+        return await self._run(self._with_reader, partial(self.catalog.describe, name=name))
+
+    async def explain_query(self, query: str, params: Params | None = None) -> dict[str, Any]:
+        """Query plan of `query` with the full table scans it performs and indexes that would avoid them"""
+        return await self._run(self._with_reader, partial(self._explain, query=query, params=params))
+
+    async def suggest_indexes(self, create: bool = False) -> dict[str, Any]:
+        """Index suggestions for the recorded slow queries, optionally creating them"""
+        return await self._run(self._suggest_indexes, create)
+
+    def _with_reader(
+        self,
+        fn: Callable[..., T],
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> T:
+        with self.pool.reader() as conn, self._interruptible(conn, timeout, cancelled):
+            # One read transaction, so the schema version and what is read under
+            # it come from the same snapshot
+            conn.execute("BEGIN")
+            try:
+                return fn(conn, generation=self.pool.write_generation)
+            finally:
+                conn.execute("COMMIT")
+
+    def stats(self) -> dict[str, Any]:
+        """Runtime statistics reported by the database_stats tool"""
+        return {
+            "pool": self.pool.stats(),
+            "schema_cache": self.catalog.stats(),
+            "slow_queries": len(self.slow_queries),
+            "result_cache": self.results.stats() if self.results is not None else None,
+        }
+
+    async def read_page(
+        self,
+        query: str | None = None,
+        params: Params | None = None,
+        cursor: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_bytes: int = DEFAULT_MAX_PAGE_BYTES,
+        format: str = "jsonl",
+        timeout: float | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """Read one page of a SELECT, or continue an earlier one by its cursor token
+
+        Returns the serialized page and metadata with the row count, when more
+        rows remain the cursor token to pass to the next call, and whether the
+        page came from the result cache.
+        """
+        return await self._run(
+            self._read_page, query, params, cursor, page_size, max_bytes, format, timeout=timeout
+        )
+
+    def _load_insights(self):
+        """Restore insights persisted by earlier sessions"""
+        with self.pool.reader() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (INSIGHTS_TABLE,)
+            ).fetchone()
+            if not exists:
+                return
+            table = _quote_identifier(INSIGHTS_TABLE)
+            total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            limit = self.insights.window or -1
+            rows = conn.execute(f"SELECT insight FROM {table} ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        for row in reversed(rows):
+            self.insights.add(row[0])
+        self.insights.count = min(total, self.max_insights) if self.max_insights else total
+        logger.debug(f"Loaded {total} insights")
+
+    async def append_insight(self, insight: str):
+        """Record an insight, persisting it unless the database is read-only"""
+        if not self.pool.read_only:
+            await self._run(self._store_insight, insight)
+        self.insights.add(insight)
+
+    def _store_insight(self, insight: str, timeout: float | None = None, cancelled: threading.Event | None = None):
+        table = _quote_identifier(INSIGHTS_TABLE)
+        with self.pool.writer() as conn, self._interruptible(conn, timeout, cancelled):
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(id INTEGER PRIMARY KEY, insight TEXT NOT NULL, created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+            insight_id = conn.execute(f"INSERT INTO {table} (insight) VALUES (?)", (insight,)).lastrowid
+            if self.max_insights and insight_id is not None:
+                conn.execute(f"DELETE FROM {table} WHERE id <= ?", (insight_id - self.max_insights,))
 
     def _synthesize_memo(self) -> str:
         """Synthesizes business insights into a formatted memo"""
-        logger.debug(f"Synthesizing memo with {len(self.insights)} insights")
-        if not self.insights:
-            return "No business insights have been discovered yet."
+        return self.insights.memo()
 
-        insights = "\n".join(f"- {insight}" for insight in self.insights)
+    @contextmanager
+    def _interruptible(
+        self, conn: sqlite3.Connection, timeout: float | None, cancelled: threading.Event | None
+    ) -> Iterator[None]:
+        """Interrupt statements on `conn` once `timeout` elapses or `cancelled` is set"""
+        deadline = time.monotonic() + timeout if timeout else None
 
-        memo = "📊 Business Intelligence Memo 📊\n\n"
-        memo += "Key Insights Discovered:\n\n"
-        memo += insights
+        def should_interrupt() -> int:
+            if cancelled is not None and cancelled.is_set():
+                return 1
+            return int(deadline is not None and time.monotonic() > deadline)
 
-        if len(self.insights) > 1:
-            memo += "\nSummary:\n"
-            memo += f"Analysis has revealed {len(self.insights)} key business insights that suggest opportunities for strategic optimization and growth."
+        if deadline is not None or cancelled is not None:
+            conn.set_progress_handler(should_interrupt, PROGRESS_HANDLER_INTERVAL)
+        try:
+            yield
+        except sqlite3.OperationalError as e:
+            if cancelled is not None and cancelled.is_set():
+                raise sqlite3.OperationalError("Query was cancelled") from e
+            if deadline is not None and time.monotonic() > deadline:
+                raise sqlite3.OperationalError(f"Query exceeded the {timeout:g}s timeout") from e
+            raise
+        finally:
+            conn.set_progress_handler(None, PROGRESS_HANDLER_INTERVAL)
 
-        logger.debug("Generated basic memo format")
-        return memo
+    def _execute_query(
+        self,
+        query: str,
+        params: Params | None = None,
+        write: bool | None = None,
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute a SQL query and return results as a list of dictionaries
 
-    def _execute_query(self, query: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
-        """Execute a SQL query and return results as a list of dictionaries"""
+        Writes go to the writer connection; `write` defaults to guessing from the
+        statement's first keyword.
+        """
         logger.debug(f"Executing query: {query}")
+        is_write = query.strip().upper().startswith(WRITE_PREFIXES) if write is None else write
         try:
-            with closing(sqlite3.connect(self.db_path)) as conn:
-                conn.row_factory = sqlite3.Row
-                with closing(conn.cursor()) as cursor:
+            with (self.pool.writer() if is_write else self.pool.reader()) as conn:
+                with self._interruptible(conn, timeout, cancelled), closing(conn.cursor()) as cursor:
+                    self.pool.record_statement(conn, query)
+                    started = time.perf_counter()
                     if params:
                         cursor.execute(query, params)
                     else:
                         cursor.execute(query)
 
-                    if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER')):
-                        conn.commit()
+                    if is_write:
                         affected = cursor.rowcount
+                        self.slow_queries.record(query, params, time.perf_counter() - started)
                         logger.debug(f"Write query affected {affected} rows")
                         return [{"affected_rows": affected}]
 
                     results = [dict(row) for row in cursor.fetchall()]
+                    self.slow_queries.record(query, params, time.perf_counter() - started)
                     logger.debug(f"Read query returned {len(results)} rows")
                     return results
         except Exception as e:
             logger.error(f"Database error executing query: {e}")
             raise
 
-async def main(db_path: str):
-    logger.info(f"Starting SQLite MCP Server with DB path: {db_path}")
+    def _execute_many(
+        self,
+        query: str,
+        params_list: list[Params],
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute `query` for every parameter set, committing once at the end"""
+        logger.debug(f"Executing query for {len(params_list)} parameter sets: {query}")
+        try:
+            with self.pool.writer() as conn:
+                with self._interruptible(conn, timeout, cancelled), closing(conn.cursor()) as cursor:
+                    self.pool.record_statement(conn, query)
+                    cursor.execute("BEGIN")
+                    try:
+                        cursor.executemany(query, params_list)
+                        affected = cursor.rowcount
+                        cursor.execute("COMMIT")
+                    except BaseException:
+                        conn.rollback()
+                        raise
+                    logger.debug(f"Bulk write affected {affected} rows")
+                    return [{"affected_rows": affected}]
+        except Exception as e:
+            logger.error(f"Database error executing query: {e}")
+            raise
+
+    def _read_page(
+        self,
+        query: str | None,
+        params: Params | None,
+        token: str | None,
+        page_size: int,
+        max_bytes: int,
+        format: str,
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """Serialize up to `page_size` rows or `max_bytes` bytes of a result set
+
+        The first page of a query is read on a pooled reader. If rows remain, the
+        reader is detached from the pool and the statement stays open on it as a
+        server-side cursor, registered under a token, so later pages continue
+        where this one stopped without re-running the query. Idle cursors expire
+        after CURSOR_TTL seconds.
+        """
+        if format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+        results = self.results
+        key = version = None
+        if token is not None:
+            result = self._cursors.take(token)
+            if result is None:
+                raise ValueError("Unknown or expired cursor, run the query again")
+            try:
+                with self._interruptible(result.conn, timeout, cancelled) if result.conn else nullcontext():
+                    text, rows, exhausted = _serialize_page(result, page_size, max_bytes, format)
+            except BaseException:
+                result.close()
+                raise
+        else:
+            if query is None:
+                raise ValueError("Either query or cursor is required")
+            if results is not None:
+                key = results.key(query, params, page_size, max_bytes, format)
+            if results is not None and key is not None:
+                # Taken before running the query, so a concurrent write can only
+                # make the cached page look older than it is
+                version = (self.pool.write_generation, self.pool.data_version())
+                cached = results.get(key, version)
+                if cached is not None:
+                    logger.debug(f"Serving cached page for query: {query}")
+                    return cached[0], {**cached[1], "cache": "hit"}
+            logger.debug(f"Executing paged query: {query}")
+            started = time.perf_counter()
+            with self._open_result(query, params, timeout, cancelled) as result:
+                text, rows, exhausted = _serialize_page(result, page_size, max_bytes, format)
+                if not exhausted:
+                    self._keep_open(result)
+            self.slow_queries.record(query, params, time.perf_counter() - started)
+
+        result.rows_read += rows
+        metadata: dict[str, Any] = {"rows": rows, "offset": result.rows_read - rows, "cursor": None}
+        if exhausted:
+            result.close()
+            # Only complete results are cached; a cursor cannot be shared
+            if results is not None and key is not None:
+                results.put(key, version, text, metadata)
+        else:
+            metadata["cursor"] = self._cursors.put(result, token)
+        logger.debug(f"Read page of {rows} rows, cursor {metadata['cursor']}")
+        return text, {**metadata, "cache": "miss" if key is not None else "bypass"}
+
+    @contextmanager
+    def _open_result(
+        self,
+        query: str,
+        params: Params | None,
+        timeout: float | None,
+        cancelled: threading.Event | None,
+    ) -> Iterator[OpenResult]:
+        """Start executing a query for paging, on a reader borrowed for the context
+
+        Statements on the reader are interrupted on `timeout` or `cancelled` for
+        the whole context. The statement is finished when the context exits
+        unless `_keep_open` took the result off the pool's reader.
+        """
+        with self.pool.reader() as conn, self._interruptible(conn, timeout, cancelled):
+            self.pool.record_statement(conn, query)
+            cursor = conn.execute(query, params or ())
+            result = OpenResult(conn, cursor, [column[0] for column in cursor.description or ()], owns_connection=False)
+            try:
+                yield result
+            finally:
+                if not result.owns_connection:
+                    result.close()
+
+    def _keep_open(self, result: OpenResult):
+        """Let `result` outlive its `_open_result` context
+
+        Its reader is detached from the pool to hold the cursor open. In-memory
+        databases have no spare connections, so their (already in-memory) rows
+        are materialized instead.
+        """
+        if result.conn is not None and self.pool.detach(result.conn):
+            result.owns_connection = True
+        else:
+            result.materialize()
+
+    def _explain(
+        self, conn: sqlite3.Connection, query: str, params: Params | None, generation: int
+    ) -> dict[str, Any]:
+        """Run EXPLAIN QUERY PLAN and propose an index for each full scan of a filtered table
+
+        A scanned table gets an index on the columns the query compares: equality
+        comparisons first, then at most one range comparison. Join columns only
+        count when the table is scanned in an inner loop, where an index replaces
+        a scan per outer row. Columns are found by matching comparisons in the
+        SQL text, so this is a heuristic.
+        """
+        plan = [
+            {"id": row[0], "parent": row[1], "detail": row[3]}
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params or ())
+        ]
+        tables = {table["name"].lower(): table["name"] for table in self.catalog.tables(conn, generation)}
+        aliases = {}
+        for match in _TABLE_REFERENCE.finditer(_STRING_LITERAL.sub("''", query)):
+            table = _unquote(match.group(1))
+            if table.lower() not in tables:
+                continue
+            aliases[table.lower()] = table
+            alias = match.group(2)
+            if alias and alias.upper() not in _NOT_ALIASES:
+                aliases[_unquote(alias).lower()] = table
+
+        compared = _compared_columns(query)
+        full_scans = []
+        suggestions = []
+        for position, step in enumerate(plan):
+            match = _FULL_SCAN.match(step["detail"])
+            if not match:
+                continue
+            inner_loop = any(
+                earlier["parent"] == step["parent"] and earlier["detail"].startswith(("SCAN", "SEARCH"))
+                for earlier in plan[:position]
+            )
+            name = next(group for group in reversed(match.groups()) if group is not None).lower()
+            table = aliases.get(name) or tables.get(name)
+            if table is None:
+                continue  # a subquery, CTE or view
+            full_scans.append(table)
+            info = self.catalog.describe(conn, tables[table.lower()], generation)
+            columns = {column["name"].lower(): column["name"] for column in info["columns"]}
+            equality, ranges = [], []
+            for qualifier, column, is_equality, is_join in compared:
+                if qualifier is not None and aliases.get(qualifier.lower()) != table:
+                    continue
+                if is_join and not inner_loop:
+                    continue
+                column = columns.get(column.lower())
+                if column is None or column in equality or column in ranges:
+                    continue
+                (equality if is_equality else ranges).append(column)
+            index_columns = equality + ranges[:1]
+            if not index_columns:
+                continue
+            if any(index["columns"][:len(index_columns)] == index_columns for index in info["indexes"]):
+                continue  # SQLite preferred a scan over an existing index
+            index_name = re.sub(r"\W", "_", f"idx_{table}_{'_'.join(index_columns)}")
+            suggestions.append({
+                "table": table,
+                "columns": index_columns,
+                "reason": step["detail"],
+                "sql": (
+                    f"CREATE INDEX IF NOT EXISTS {_quote_identifier(index_name)} ON {_quote_identifier(table)} "
+                    f"({', '.join(_quote_identifier(column) for column in index_columns)})"
+                ),
+            })
+        return {"plan": plan, "full_scans": full_scans, "suggestions": suggestions}
+
+    def _time_query(
+        self, query: str, params: Params | None, timeout: float | None, cancelled: threading.Event | None
+    ) -> float:
+        with self.pool.reader() as conn:
+            with self._interruptible(conn, timeout, cancelled), closing(conn.cursor()) as cursor:
+                started = time.perf_counter()
+                cursor.execute(query, params or ())
+                cursor.fetchall()
+                return time.perf_counter() - started
+
+    def _suggest_indexes(
+        self, create: bool, timeout: float | None = None, cancelled: threading.Event | None = None
+    ) -> dict[str, Any]:
+        """Explain every recorded slow query; with `create`, build the suggested
+        indexes and time the affected SELECTs before and after"""
+        if create and self.pool.read_only:
+            raise ValueError(f"Database is opened {self.pool.mode}, indexes cannot be created")
+        slow_queries = []
+        by_sql: dict[str, list[dict[str, Any]]] = {}
+        for entry in self.slow_queries.entries():
+            try:
+                advice = self._with_reader(partial(self._explain, query=entry["query"], params=entry["params"]))
+            except sqlite3.Error as e:
+                logger.debug(f"Cannot explain slow query: {e}")
+                continue
+            slow_queries.append({
+                "query": entry["query"],
+                "count": entry["count"],
+                "avg_seconds": round(entry["total_seconds"] / entry["count"], 4),
+                "max_seconds": round(entry["max_seconds"], 4),
+                "suggestions": [suggestion["sql"] for suggestion in advice["suggestions"]],
+            })
+            for suggestion in advice["suggestions"]:
+                by_sql.setdefault(suggestion["sql"], []).append(entry)
+
+        created = []
+        if create:
+            for sql, entries in by_sql.items():
+                selects = [e for e in entries if e["query"].strip().upper().startswith(("SELECT", "WITH"))]
+                before = [self._time_query(e["query"], e["params"], timeout, cancelled) for e in selects]
+                with self.pool.writer() as conn:
+                    conn.execute(sql)
+                after = [self._time_query(e["query"], e["params"], timeout, cancelled) for e in selects]
+                for entry in entries:
+                    self.slow_queries.discard(entry["query"])
+                created.append({
+                    "sql": sql,
+                    "queries": [
+                        {"query": e["query"], "before_seconds": round(b, 4), "after_seconds": round(a, 4)}
+                        for e, b, a in zip(selects, before, after)
+                    ],
+                })
+                logger.info(f"Created index: {sql}")
+        return {"slow_queries": slow_queries, "created": created}
+
+    def _import_file(
+        self,
+        path: str,
+        table: str,
+        format: str,
+        columns: dict[str, str] | None,
+        delimiter: str,
+        header: bool,
+        batch_size: int,
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> dict[str, Any]:
+        """Stream a file into `table` in batches inside a single transaction
+
+        The table is created when it does not exist, from `columns` or with column
+        types inferred from the first SCHEMA_SAMPLE_ROWS records. Either every row
+        is imported or, on any error, none are.
+        """
+        if format not in IMPORT_FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+        started = time.perf_counter()
+        batch_size = max(1, batch_size)
+        logger.debug(f"Importing {format} file {path} into {table}")
+
+        with open(Path(path).expanduser(), newline="", encoding="utf-8-sig") as file:
+            if format == "csv":
+                names, records = _csv_records(file, delimiter, header)
+            else:
+                names, records = None, _jsonl_records(file)
+            sample = list(itertools.islice(records, SCHEMA_SAMPLE_ROWS))
+
+            with self.pool.writer() as conn:
+                with self._interruptible(conn, timeout, cancelled), closing(conn.cursor()) as cursor:
+                    existing = [row[1] for row in cursor.execute(f"PRAGMA table_info({_quote_identifier(table)})")]
+                    if names is None:
+                        if columns:
+                            names = list(columns)
+                        elif existing:
+                            names = existing
+                        elif format == "csv":
+                            names = [f"c{i + 1}" for i in range(len(sample[0][1]) if sample else 0)]
+                        else:
+                            names = list(dict.fromkeys(key for _, record in sample for key in record))
+                    if not names:
+                        raise ValueError("Cannot determine the columns to import, pass columns")
+
+                    def rows(batch: list[tuple[int, Any]]) -> list[Any]:
+                        if format == "csv":
+                            for line_num, values in batch:
+                                if len(values) != len(names):
+                                    raise ValueError(
+                                        f"Line {line_num}: expected {len(names)} fields, got {len(values)}"
+                                    )
+                            return [values for _, values in batch]
+                        converted = []
+                        for line_num, record in batch:
+                            unknown = record.keys() - set(names)
+                            if unknown:
+                                raise ValueError(f"Line {line_num}: unknown columns {sorted(unknown)}")
+                            converted.append([_sql_value(record.get(name)) for name in names])
+                        return converted
+
+                    insert = (
+                        f"INSERT INTO {_quote_identifier(table)} "
+                        f"({', '.join(_quote_identifier(name) for name in names)}) "
+                        f"VALUES ({', '.join('?' * len(names))})"
+                    )
+                    cursor.execute("BEGIN")
+                    try:
+                        created = not existing
+                        if created:
+                            sample_rows = rows(sample)
+                            definitions = []
+                            for index, name in enumerate(names):
+                                if columns and name in columns:
+                                    column_type = columns[name]
+                                else:
+                                    column_type = _infer_type([row[index] for row in sample_rows])
+                                definitions.append(f"{_quote_identifier(name)} {column_type}")
+                            cursor.execute(f"CREATE TABLE {_quote_identifier(table)} ({', '.join(definitions)})")
+
+                        self.pool.record_statement(conn, insert)
+                        imported = 0
+                        batches = itertools.chain(sample, records)
+                        while batch := list(itertools.islice(batches, batch_size)):
+                            if cancelled is not None and cancelled.is_set():
+                                raise sqlite3.OperationalError("Query was cancelled")
+                            cursor.executemany(insert, rows(batch))
+                            imported += len(batch)
+                        cursor.execute("COMMIT")
+                    except BaseException:
+                        conn.rollback()
+                        raise
+
+        seconds = time.perf_counter() - started
+        logger.debug(f"Imported {imported} rows into {table} in {seconds:.2f}s")
+        return {
+            "table": table,
+            "rows": imported,
+            "created": created,
+            "columns": names,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(imported / seconds) if seconds else imported,
+        }
+
+    def _export_query(
+        self,
+        query: str,
+        path: str,
+        params: Params | None,
+        format: str,
+        overwrite: bool,
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> dict[str, Any]:
+        """Write every row of a SELECT to a file, one batch at a time
+
+        Rows are written to a temporary file next to `path` that replaces it only
+        once the export has completed.
+        """
+        if format not in IMPORT_FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+        target = Path(path).expanduser()
+        if target.exists() and not overwrite:
+            raise ValueError(f"{target} already exists, pass overwrite to replace it")
+        started = time.perf_counter()
+        partial_path = target.with_name(target.name + ".part")
+        exported = 0
+        try:
+            with self._open_result(query, params, timeout, cancelled) as result:
+                with open(partial_path, "w", newline="", encoding="utf-8") as file:
+                    writer = csv.writer(file, lineterminator="\n") if format == "csv" else None
+                    if writer is not None:
+                        writer.writerow(result.columns)
+                    while batch := result.fetch(FETCH_BATCH_SIZE):
+                        if writer is not None:
+                            writer.writerows(
+                                ["" if v is None else v.hex() if isinstance(v, bytes) else v for v in row]
+                                for row in batch
+                            )
+                        else:
+                            file.writelines(
+                                json.dumps(dict(zip(result.columns, row)), default=_json_value, ensure_ascii=False)
+                                + "\n"
+                                for row in batch
+                            )
+                        exported += len(batch)
+            os.replace(partial_path, target)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+
+        seconds = time.perf_counter() - started
+        logger.debug(f"Exported {exported} rows to {target}")
+        return {
+            "path": str(target),
+            "rows": exported,
+            "bytes": target.stat().st_size,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(exported / seconds) if seconds else exported,
+        }
 
-    db = SqliteDatabase(db_path)
+async def main(
+    db_path: str,
+    readers: int = DEFAULT_READERS,
+    max_concurrent_queries: int = DEFAULT_MAX_CONCURRENT_QUERIES,
+    query_timeout: float | None = DEFAULT_QUERY_TIMEOUT,
+    statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+    slow_query_threshold: float = DEFAULT_SLOW_QUERY_THRESHOLD,
+    mode: str = "rw",
+    attachments: dict[str, str] | None = None,
+    max_insights: int = 0,
+    memo_window: int = 0,
+    result_cache_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+):
+    logger.info(f"Starting SQLite MCP Server with DB path: {db_path} ({mode})")
+
+    db = SqliteDatabase(
+        db_path,
+        readers=readers,
+        max_concurrent_queries=max_concurrent_queries,
+        query_timeout=query_timeout,
+        statement_cache_size=statement_cache_size,
+        slow_query_threshold=slow_query_threshold,
+        mode=mode,
+        attachments=attachments,
+        max_insights=max_insights,
+        memo_window=memo_window,
+        result_cache_bytes=result_cache_bytes,
+    )
     server = Server("sqlite-manager")
 
     # Register handlers
@@ -239,25 +1755,63 @@ async def main(db_path: str):
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
         """List available tools"""
-        return [
+        tools = [
             types.Tool(
                 name="read_query",
-                description="Execute a SELECT query on the SQLite database",
+                description=(
+                    "Execute a SELECT query on the SQLite database. Results are returned one page at a time: "
+                    "a header line with the column names followed by one line per row. If more rows are "
+                    "available, the result metadata contains a cursor; call read_query again with only that "
+                    "cursor to get the next page."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "query": {"type": "string", "description": "SELECT SQL query to execute"},
+                        "params": {
+                            "type": ["object", "array"],
+                            "description": "Values for :name placeholders (object) or ? placeholders (array)",
+                        },
+                        "cursor": {"type": "string", "description": "Cursor returned by a previous page, continues that result set"},
+                        "page_size": {
+                            "type": "integer",
+                            "description": f"Maximum rows per page (default {DEFAULT_PAGE_SIZE}, at most {MAX_PAGE_SIZE})",
+                            "minimum": 1,
+                            "maximum": MAX_PAGE_SIZE,
+                        },
+                        "max_bytes": {
+                            "type": "integer",
+                            "description": f"Maximum size of a page in bytes (default {DEFAULT_MAX_PAGE_BYTES})",
+                            "minimum": 1,
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": list(RESULT_FORMATS),
+                            "description": "jsonl: one JSON array per line; csv: comma-separated values (default jsonl)",
+                        },
                     },
-                    "required": ["query"],
                 },
             ),
             types.Tool(
                 name="write_query",
-                description="Execute an INSERT, UPDATE, or DELETE query on the SQLite database",
+                description=(
+                    "Execute an INSERT, UPDATE, or DELETE query on the SQLite database. Pass values through "
+                    "params rather than inlining them; to insert many rows in one call, pass one parameter "
+                    "set per row in params_list and they are applied in a single transaction."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "query": {"type": "string", "description": "SQL query to execute"},
+                        "params": {
+                            "type": ["object", "array"],
+                            "description": "Values for :name placeholders (object) or ? placeholders (array)",
+                        },
+                        "params_list": {
+                            "type": "array",
+                            "items": {"type": ["object", "array"]},
+                            "description": "Parameter sets to execute the query with, one execution per item",
+                        },
                     },
                     "required": ["query"],
                 },
@@ -273,9 +1827,81 @@ async def main(db_path: str):
                     "required": ["query"],
                 },
             ),
+            types.Tool(
+                name="import_csv",
+                description=(
+                    "Load a CSV file from disk into a table in a single transaction, creating the table "
+                    "if it does not exist. Empty fields are stored as NULL."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Path of the CSV file to import"},
+                        "table": {"type": "string", "description": "Table to insert the rows into"},
+                        "columns": {
+                            "type": "object",
+                            "additionalProperties": {"type": "string"},
+                            "description": "Column names mapped to SQL types, used instead of inferring them",
+                        },
+                        "header": {
+                            "type": "boolean",
+                            "description": "Whether the first row holds the column names (default true)",
+                        },
+                        "delimiter": {"type": "string", "description": "Field delimiter (default ,)"},
+                        "batch_size": {"type": "integer", "description": "Rows inserted per batch (default 5000)"},
+                    },
+                    "required": ["path", "table"],
+                },
+            ),
+            types.Tool(
+                name="import_jsonl",
+                description=(
+                    "Load a file with one JSON object per line into a table in a single transaction, "
+                    "creating the table if it does not exist. Nested values are stored as JSON text."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Path of the JSONL file to import"},
+                        "table": {"type": "string", "description": "Table to insert the rows into"},
+                        "columns": {
+                            "type": "object",
+                            "additionalProperties": {"type": "string"},
+                            "description": "Column names mapped to SQL types, used instead of inferring them",
+                        },
+                        "batch_size": {"type": "integer", "description": "Rows inserted per batch (default 5000)"},
+                    },
+                    "required": ["path", "table"],
+                },
+            ),
+            types.Tool(
+                name="export_query",
+                description="Write the full result of a SELECT query to a CSV or JSONL file on disk",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "SELECT SQL query to execute"},
+                        "path": {"type": "string", "description": "Path of the file to write"},
+                        "params": {
+                            "type": ["object", "array"],
+                            "description": "Values for :name placeholders (object) or ? placeholders (array)",
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": list(IMPORT_FORMATS),
+                            "description": "csv: header row then one row per line; jsonl: one JSON object per line (default csv)",
+                        },
+                        "overwrite": {
+                            "type": "boolean",
+                            "description": "Replace the file if it already exists (default false)",
+                        },
+                    },
+                    "required": ["query", "path"],
+                },
+            ),
             types.Tool(
                 name="list_tables",
-                description="List all tables in the SQLite database",
+                description="List all tables and views in the SQLite database with estimated row counts",
                 inputSchema={
                     "type": "object",
                     "properties": {},
@@ -283,7 +1909,7 @@ async def main(db_path: str):
             ),
             types.Tool(
                 name="describe_table",
-                description="Get the schema information for a specific table",
+                description="Get the columns, indexes, foreign keys and estimated row count of a table",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -292,6 +1918,48 @@ async def main(db_path: str):
                     "required": ["table_name"],
                 },
             ),
+            types.Tool(
+                name="explain_query",
+                description=(
+                    "Show the query plan of a SQL query, the tables it scans in full and indexes that "
+                    "would avoid those scans"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "SQL query to explain"},
+                        "params": {
+                            "type": ["object", "array"],
+                            "description": "Values for :name placeholders (object) or ? placeholders (array)",
+                        },
+                    },
+                    "required": ["query"],
+                },
+            ),
+            types.Tool(
+                name="suggest_indexes",
+                description=(
+                    "Propose indexes for recently recorded slow queries. With create set, build them and "
+                    "report the query timings before and after."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "create": {
+                            "type": "boolean",
+                            "description": "Create the suggested indexes (default false)",
+                        },
+                    },
+                },
+            ),
+            types.Tool(
+                name="database_stats",
+                description="Report connection pool and cache statistics of the SQLite server",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                },
+            ),
             types.Tool(
                 name="append_insight",
                 description="Add a business insight to the memo",
@@ -304,6 +1972,18 @@ async def main(db_path: str):
                 },
             ),
         ]
+        if db.pool.read_only:
+            tools = [
+                # Suggestions only; creating indexes needs the writer
+                tool.model_copy(update={
+                    "description": "Propose indexes for recently recorded slow queries.",
+                    "inputSchema": {"type": "object", "properties": {}},
+                })
+                if tool.name == "suggest_indexes" else tool
+                for tool in tools
+                if tool.name not in WRITE_TOOLS
+            ]
+        return tools
 
     @server.call_tool()
     async def handle_call_tool(
@@ -312,25 +1992,27 @@ async def main(db_path: str):
         """Handle tool execution requests"""
         try:
             if name == "list_tables":
-                results = db._execute_query(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                )
-                return [types.TextContent(type="text", text=str(results))]
+                results = await db.list_tables()
+                return [types.TextContent(type="text", text=json.dumps(results))]
 
             elif name == "describe_table":
                 if not arguments or "table_name" not in arguments:
                     raise ValueError("Missing table_name argument")
-                results = db._execute_query(
-                    f"PRAGMA table_info({arguments['table_name']})"
-                )
-                return [types.TextContent(type="text", text=str(results))]
+                results = await db.describe_table(arguments["table_name"])
+                return [types.TextContent(type="text", text=json.dumps(results))]
+
+            elif name == "database_stats":
+                return [types.TextContent(type="text", text=json.dumps(db.stats()))]
+
+            elif name == "suggest_indexes":
+                results = await db.suggest_indexes(create=(arguments or {}).get("create", False))
+                return [types.TextContent(type="text", text=json.dumps(results))]
 
             elif name == "append_insight":
                 if not arguments or "insight" not in arguments:
                     raise ValueError("Missing insight argument")
 
-                db.insights.append(arguments["insight"])
-                _ = db._synthesize_memo()
+                await db.append_insight(arguments["insight"])
 
                 # Notify clients that the memo resource has changed
                 await server.request_context.session.send_resource_updated(AnyUrl("memo://insights"))
@@ -341,23 +2023,77 @@ async def main(db_path: str):
                 raise ValueError("Missing arguments")
 
             if name == "read_query":
-                if not arguments["query"].strip().upper().startswith("SELECT"):
-                    raise ValueError("Only SELECT queries are allowed for read_query")
-                results = db._execute_query(arguments["query"])
-                return [types.TextContent(type="text", text=str(results))]
+                if "cursor" not in arguments:
+                    if "query" not in arguments:
+                        raise ValueError("Missing query argument")
+                    if not arguments["query"].strip().upper().startswith("SELECT"):
+                        raise ValueError("Only SELECT queries are allowed for read_query")
+                page, metadata = await db.read_page(
+                    query=arguments.get("query"),
+                    params=arguments.get("params"),
+                    cursor=arguments.get("cursor"),
+                    page_size=arguments.get("page_size", DEFAULT_PAGE_SIZE),
+                    max_bytes=arguments.get("max_bytes", DEFAULT_MAX_PAGE_BYTES),
+                    format=arguments.get("format", "jsonl"),
+                )
+                return [
+                    types.TextContent(type="text", text=page),
+                    types.TextContent(type="text", text=json.dumps(metadata)),
+                ]
 
             elif name == "write_query":
                 if arguments["query"].strip().upper().startswith("SELECT"):
                     raise ValueError("SELECT queries are not allowed for write_query")
-                results = db._execute_query(arguments["query"])
+                if "params_list" in arguments:
+                    if "params" in arguments:
+                        raise ValueError("Pass either params or params_list, not both")
+                    results = await db.execute_many(arguments["query"], arguments["params_list"])
+                else:
+                    results = await db.execute_query(arguments["query"], arguments.get("params"), write=True)
                 return [types.TextContent(type="text", text=str(results))]
 
             elif name == "create_table":
                 if not arguments["query"].strip().upper().startswith("CREATE TABLE"):
                     raise ValueError("Only CREATE TABLE statements are allowed")
-                db._execute_query(arguments["query"])
+                await db.execute_query(arguments["query"], write=True)
                 return [types.TextContent(type="text", text="Table created successfully")]
 
+            elif name == "explain_query":
+                if "query" not in arguments:
+                    raise ValueError("Missing query argument")
+                results = await db.explain_query(arguments["query"], arguments.get("params"))
+                return [types.TextContent(type="text", text=json.dumps(results))]
+
+            elif name == "import_csv" or name == "import_jsonl":
+                for key in ("path", "table"):
+                    if key not in arguments:
+                        raise ValueError(f"Missing {key} argument")
+                stats = await db.import_file(
+                    arguments["path"],
+                    arguments["table"],
+                    format="csv" if name == "import_csv" else "jsonl",
+                    columns=arguments.get("columns"),
+                    delimiter=arguments.get("delimiter", ","),
+                    header=arguments.get("header", True),
+                    batch_size=arguments.get("batch_size", IMPORT_BATCH_SIZE),
+                )
+                return [types.TextContent(type="text", text=json.dumps(stats))]
+
+            elif name == "export_query":
+                for key in ("query", "path"):
+                    if key not in arguments:
+                        raise ValueError(f"Missing {key} argument")
+                if not arguments["query"].strip().upper().startswith("SELECT"):
+                    raise ValueError("Only SELECT queries are allowed for export_query")
+                stats = await db.export_query(
+                    arguments["query"],
+                    arguments["path"],
+                    params=arguments.get("params"),
+                    format=arguments.get("format", "csv"),
+                    overwrite=arguments.get("overwrite", False),
+                )
+                return [types.TextContent(type="text", text=json.dumps(stats))]
+
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
@@ -366,17 +2102,20 @@ async def main(db_path: str):
         except Exception as e:
             return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        logger.info("Server running with stdio transport")
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="sqlite",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            logger.info("Server running with stdio transport")
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="sqlite",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        db.close()
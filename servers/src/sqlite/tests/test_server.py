@@ -0,0 +1,561 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from mcp_server_sqlite.server import CursorRegistry, InsightStore, OpenResult, ResultCache, SqliteDatabase
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "test.db"), readers=2)
+    database._execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    yield database
+    database.close()
+
+
+def test_pool_uses_wal_and_pragmas(db):
+    assert db.pool.journal_mode == "wal"
+    with db.pool.reader() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+
+
+def test_writes_are_visible_to_readers(db):
+    assert db._execute_query("INSERT INTO items (name) VALUES ('a')") == [{"affected_rows": 1}]
+    assert db._execute_query("SELECT name FROM items") == [{"name": "a"}]
+
+
+def test_readers_are_read_only(db):
+    with db.pool.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+
+
+def test_connections_are_reused(db):
+    with db.pool.reader() as first:
+        pass
+    with db.pool.reader() as second, db.pool.reader() as third:
+        assert first in (second, third)
+
+
+def test_concurrent_queries_from_threads(db):
+    errors = []
+
+    def work(n):
+        try:
+            db._execute_query(f"INSERT INTO items (name) VALUES ('{n}')")
+            db._execute_query("SELECT count(*) AS n FROM items")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert db._execute_query("SELECT count(*) AS n FROM items") == [{"n": 20}]
+
+
+def test_memory_database_shares_writer():
+    database = SqliteDatabase(":memory:")
+    database._execute_query("CREATE TABLE t (x)")
+    database._execute_query("INSERT INTO t VALUES (1)")
+    assert database._execute_query("SELECT x FROM t") == [{"x": 1}]
+    database.close()
+
+
+SLOW_QUERY = (
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+    "SELECT count(*) AS c FROM n"
+)
+
+
+@pytest.mark.asyncio
+async def test_execute_query_times_out(db):
+    with pytest.raises(sqlite3.OperationalError, match="timeout"):
+        await db.execute_query(SLOW_QUERY, timeout=0.2)
+    # The connection is still usable afterwards
+    assert await db.execute_query("SELECT 1 AS one") == [{"one": 1}]
+
+
+@pytest.mark.asyncio
+async def test_execute_query_keeps_event_loop_responsive(db):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    with pytest.raises(sqlite3.OperationalError):
+        await db.execute_query(SLOW_QUERY, timeout=0.3)
+    task.cancel()
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_cancelling_caller_interrupts_query(db):
+    task = asyncio.create_task(db.execute_query(SLOW_QUERY, timeout=60))
+    await asyncio.sleep(0.1)
+    started = time.monotonic()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert time.monotonic() - started < 5
+    assert await db.execute_query("SELECT 1 AS one") == [{"one": 1}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_query_limit(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "limit.db"), readers=4, max_concurrent_queries=2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+    original = database._execute_query
+
+    def tracked(*args, **kwargs):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        try:
+            return original(*args, **kwargs)
+        finally:
+            with lock:
+                running -= 1
+
+    database._execute_query = tracked
+    await asyncio.gather(*(database.execute_query("SELECT 1") for _ in range(8)))
+    assert peak == 2
+    database.close()
+
+
+@pytest.mark.asyncio
+async def test_read_page_paginates_with_cursor(db):
+    for i in range(1, 26):
+        db._execute_query(f"INSERT INTO items (name) VALUES ('item{i}')")
+
+    text, meta = await db.read_page("SELECT id, name FROM items ORDER BY id", page_size=10)
+    lines = text.splitlines()
+    assert json.loads(lines[0]) == ["id", "name"]
+    assert json.loads(lines[1]) == [1, "item1"]
+    assert meta["rows"] == 10 and meta["cursor"]
+
+    seen = [json.loads(line)[0] for line in lines[1:]]
+    cursor = meta["cursor"]
+    while cursor:
+        text, meta = await db.read_page(cursor=cursor, page_size=10)
+        seen += [json.loads(line)[0] for line in text.splitlines()[1:]]
+        cursor = meta["cursor"]
+    assert seen == list(range(1, 26))
+    assert meta["offset"] == 20 and meta["rows"] == 5
+
+    with pytest.raises(ValueError, match="cursor"):
+        await db.read_page(cursor="bogus")
+
+
+@pytest.mark.asyncio
+async def test_read_page_respects_byte_cap_and_csv(db):
+    for i in range(5):
+        db._execute_query(f"INSERT INTO items (name) VALUES ('{'x' * 100}')")
+
+    text, meta = await db.read_page("SELECT name FROM items", max_bytes=250, format="csv")
+    assert text.splitlines()[0] == "name"
+    assert meta["rows"] == 2
+    text, meta = await db.read_page(cursor=meta["cursor"], max_bytes=10_000, format="csv")
+    assert meta["rows"] == 3 and meta["cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_exhausted_first_page_has_no_cursor(db):
+    text, meta = await db.read_page("SELECT 1 AS one, NULL AS missing, x'00ff' AS blob")
+    assert text == '["one", "missing", "blob"]\n[1, null, "00ff"]\n'
+    assert meta == {"rows": 1, "offset": 0, "cursor": None, "cache": "miss"}
+
+
+@pytest.mark.asyncio
+async def test_read_page_runs_on_pooled_readers(db, monkeypatch):
+    for i in range(5):
+        db._execute_query(f"INSERT INTO items (name) VALUES ('item{i}')")
+    db.pool.data_version()  # opens the probe connection
+    pooled = set(map(id, db.pool._readers.queue))
+    opened = []
+    connect_reader = db.pool.connect_reader
+    monkeypatch.setattr(db.pool, "connect_reader", lambda: opened.append(1) or connect_reader())
+
+    before = db.pool.statement_hits
+    for name in ("item1", "item2", "item3"):
+        _, meta = await db.read_page("SELECT id FROM items WHERE name = ?", [name])
+        assert meta["cursor"] is None
+    assert not opened
+    assert db.pool.statement_hits > before
+
+    # A cursor keeps its reader, which the pool replaces
+    _, meta = await db.read_page("SELECT id FROM items", page_size=2)
+    assert meta["cursor"] and len(opened) == 1
+    assert db.pool._readers.qsize() == db.pool.reader_count == 2
+    assert len(pooled & set(map(id, db.pool._readers.queue))) == 1
+    text, meta = await db.read_page(cursor=meta["cursor"], page_size=10)
+    assert len(text.splitlines()) == 4 and meta["cursor"] is None
+
+
+def test_cursor_registry_expires_and_bounds():
+    registry = CursorRegistry(max_open=2, ttl=60)
+    results = [OpenResult(None, iter([]), []) for _ in range(3)]
+    tokens = [registry.put(r) for r in results]
+    assert registry.take(tokens[0]) is None
+    assert registry.take(tokens[2]) is results[2]
+
+    expiring = CursorRegistry(ttl=-1)
+    assert expiring.take(expiring.put(OpenResult(None, iter([]), []))) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_database_pages():
+    database = SqliteDatabase(":memory:")
+    database._execute_query("CREATE TABLE t (x)")
+    for i in range(3):
+        database._execute_query(f"INSERT INTO t VALUES ({i})")
+    text, meta = await database.read_page("SELECT x FROM t", page_size=2)
+    assert meta["rows"] == 2
+    text, meta = await database.read_page(cursor=meta["cursor"], page_size=2)
+    assert text.splitlines()[1:] == ["[2]"] and meta["cursor"] is None
+    database.close()
+
+
+def test_parameterized_queries_reuse_statements(db):
+    db._execute_query("INSERT INTO items (name) VALUES (?)", ["a"])
+    db._execute_query("INSERT INTO items (name) VALUES (:name)", {"name": "b"})
+    before = db.pool.statement_hits
+    for name in ("a", "b", "a"):
+        assert db._execute_query("SELECT id FROM items WHERE name = ?", [name])
+    assert db.pool.statement_hits >= before + 1
+    stats = db.stats()["pool"]
+    assert stats["statement_cache_size"] == 256
+    assert 0 < stats["statement_cache_hit_rate"] <= 1
+
+
+@pytest.mark.asyncio
+async def test_execute_many_is_atomic(db):
+    rows = [[f"item-{i}"] for i in range(50)]
+    assert await db.execute_many("INSERT INTO items (name) VALUES (?)", rows) == [{"affected_rows": 50}]
+
+    with pytest.raises(sqlite3.Error):
+        await db.execute_many("INSERT INTO items (id, name) VALUES (?, ?)", [[1000, "x"], [1000, "y"]])
+    assert await db.execute_query("SELECT COUNT(*) AS n FROM items") == [{"n": 50}]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_infers_schema_in_batches(db, tmp_path: Path):
+    path = tmp_path / "people.csv"
+    path.write_text("name,age,score\n" + "".join(f"p{i},{i},{i / 2}\n" for i in range(1200)) + "empty,,\n")
+
+    stats = await db.import_file(str(path), "people", "csv", batch_size=100)
+    assert stats["rows"] == 1201 and stats["created"]
+    assert stats["rows_per_second"] > 0
+    with db.pool.reader() as conn:
+        types_ = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(people)")}
+    assert types_ == {"name": "TEXT", "age": "INTEGER", "score": "REAL"}
+    assert await db.execute_query("SELECT age, score FROM people WHERE name = 'empty'") == [
+        {"age": None, "score": None}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_import_is_rolled_back(db, tmp_path: Path):
+    path = tmp_path / "items.jsonl"
+    path.write_text('{"name": "a"}\n{"name": "b", "extra": 1}\n')
+    with pytest.raises(ValueError, match="Line 2"):
+        await db.import_file(str(path), "items", "jsonl")
+    assert await db.execute_query("SELECT COUNT(*) AS n FROM items") == [{"n": 0}]
+
+    path = tmp_path / "new.jsonl"
+    path.write_text('{"id": 1, "tags": ["x"]}\n{"id": "oops"}\n')
+    with pytest.raises(sqlite3.IntegrityError):
+        await db.import_file(str(path), "tagged", "jsonl", columns={"id": "INTEGER PRIMARY KEY", "tags": "TEXT"})
+    # The table created by the failed import is rolled back as well
+    assert await db.execute_query("SELECT name FROM sqlite_master WHERE name = 'tagged'") == []
+
+
+@pytest.mark.asyncio
+async def test_export_round_trips_through_import(db, tmp_path: Path):
+    await db.execute_many("INSERT INTO items (name) VALUES (?)", [[f"item-{i}"] for i in range(600)])
+    for format in ("csv", "jsonl"):
+        path = tmp_path / f"items.{format}"
+        stats = await db.export_query("SELECT id, name FROM items ORDER BY id", str(path), format=format)
+        assert stats["rows"] == 600 and stats["bytes"] == path.stat().st_size
+        with pytest.raises(ValueError, match="already exists"):
+            await db.export_query("SELECT 1", str(path), format=format)
+
+        await db.import_file(str(path), f"copy_{format}", format)
+        assert await db.execute_query(f"SELECT COUNT(*) AS n, MAX(id) AS m FROM copy_{format}") == [
+            {"n": 600, "m": 600}
+        ]
+
+
+@pytest.mark.asyncio
+async def test_schema_catalog_is_cached_until_schema_changes(db):
+    await db.execute_query(
+        "CREATE TABLE orders (id INTEGER PRIMARY KEY, item_id INTEGER REFERENCES items(id) ON DELETE CASCADE)",
+        write=True,
+    )
+    await db.execute_query("CREATE INDEX orders_item ON orders (item_id)", write=True)
+    await db.execute_many("INSERT INTO orders (item_id) VALUES (?)", [[1]] * 10)
+
+    tables = await db.list_tables()
+    assert tables == [
+        {"name": "items", "type": "table", "row_estimate": 0},
+        {"name": "orders", "type": "table", "row_estimate": 10},
+    ]
+    orders = await db.describe_table("orders")
+    assert [column["name"] for column in orders["columns"]] == ["id", "item_id"]
+    assert orders["indexes"] == [
+        {"name": "orders_item", "unique": False, "origin": "c", "partial": False, "columns": ["item_id"]}
+    ]
+    assert orders["foreign_keys"][0]["table"] == "items"
+    assert orders["foreign_keys"][0]["on_delete"] == "CASCADE"
+
+    misses = db.catalog.misses
+    await db.describe_table("orders")
+    await db.list_tables()
+    assert db.catalog.misses == misses
+
+    # Row estimates follow writes, the catalog follows schema changes
+    await db.execute_many("INSERT INTO items (name) VALUES (?)", [["a"], ["b"]])
+    assert (await db.list_tables())[0]["row_estimate"] == 2
+    assert db.catalog.misses == misses
+    await db.execute_query("ALTER TABLE items ADD COLUMN price REAL", write=True)
+    assert [column["name"] for column in (await db.describe_table("items"))["columns"]][-1] == "price"
+    assert db.catalog.misses == misses + 1
+
+    with pytest.raises(ValueError, match="Unknown table"):
+        await db.describe_table("missing")
+
+
+@pytest.mark.asyncio
+async def test_explain_query_suggests_indexes_for_filtered_scans(db):
+    await db.execute_query("CREATE TABLE orders (id INTEGER PRIMARY KEY, item_id INTEGER, status TEXT, total REAL)")
+
+    advice = await db.explain_query(
+        "SELECT * FROM orders o JOIN items i ON o.item_id = i.id WHERE o.status = 'x = 1' AND o.total > ?", [5]
+    )
+    assert "o" in advice["plan"][0]["detail"]
+    assert advice["full_scans"] == ["orders"]
+    [suggestion] = advice["suggestions"]
+    assert suggestion["columns"] == ["status", "total"]
+    assert suggestion["sql"] == (
+        'CREATE INDEX IF NOT EXISTS "idx_orders_status_total" ON "orders" ("status", "total")'
+    )
+
+    # Primary key lookups and unfiltered scans need no index
+    assert (await db.explain_query("SELECT * FROM items WHERE id = 1"))["suggestions"] == []
+    assert (await db.explain_query("SELECT COUNT(*) FROM items"))["suggestions"] == []
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_recorded_and_indexed(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "slow.db"), readers=1, slow_query_threshold=0)
+    try:
+        await database.execute_query("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT)", write=True)
+        await database.execute_many("INSERT INTO events (kind) VALUES (?)", [[f"k{i % 100}"] for i in range(2000)])
+        for _ in range(2):
+            await database.execute_query("SELECT * FROM events WHERE kind = ?", ["k7"])
+
+        report = await database.suggest_indexes()
+        [entry] = [e for e in report["slow_queries"] if e["query"].startswith("SELECT * FROM events")]
+        assert entry["count"] == 2
+        assert entry["suggestions"] == ['CREATE INDEX IF NOT EXISTS "idx_events_kind" ON "events" ("kind")']
+        assert report["created"] == []
+
+        report = await database.suggest_indexes(create=True)
+        [created] = report["created"]
+        assert created["queries"][0]["before_seconds"] >= 0
+        assert "idx_events_kind" in [index["name"] for index in (await database.describe_table("events"))["indexes"]]
+        assert (await database.explain_query("SELECT * FROM events WHERE kind = 'k1'"))["full_scans"] == []
+    finally:
+        database.close()
+
+
+@pytest.mark.asyncio
+async def test_explain_query_indexes_join_columns_of_inner_scans(db):
+    await db.execute_query("CREATE TABLE tags (item_id INTEGER, tag TEXT)")
+    # tags is the outer loop, so joining on its item_id needs no index
+    advice = await db.explain_query("SELECT * FROM tags t JOIN items i ON t.item_id = i.id")
+    assert advice["full_scans"] == ["tags"] and advice["suggestions"] == []
+
+    # tags is scanned once per matching item
+    advice = await db.explain_query("SELECT * FROM items i JOIN tags t ON t.item_id = i.id WHERE i.id = 1")
+    assert [s["columns"] for s in advice["suggestions"]] == [["item_id"]]
+
+    # SQLite builds an automatic index on every run
+    advice = await db.explain_query("SELECT * FROM items i JOIN tags t ON t.tag = i.name")
+    assert advice["full_scans"] == ["items", "tags"]
+    assert [s["columns"] for s in advice["suggestions"]] == [["tag"]]
+
+
+def make_database(path: Path, rows: list[tuple[int, str]]):
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO items VALUES (?, ?)", rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["ro", "immutable"])
+async def test_read_only_modes_reject_writes(tmp_path: Path, mode: str):
+    make_database(tmp_path / "data.db", [(1, "a"), (2, "b")])
+    database = SqliteDatabase(str(tmp_path / "data.db"), readers=2, mode=mode)
+    try:
+        assert await database.execute_query("SELECT COUNT(*) AS n FROM items") == [{"n": 2}]
+        with pytest.raises(sqlite3.OperationalError, match="writes are not allowed"):
+            await database.execute_query("INSERT INTO items (name) VALUES ('c')")
+        assert database.pool.stats()["mode"] == mode
+        assert (await database.suggest_indexes())["created"] == []
+        with pytest.raises(ValueError, match="indexes cannot be created"):
+            await database.suggest_indexes(create=True)
+    finally:
+        database.close()
+
+    with pytest.raises(ValueError, match="not found"):
+        SqliteDatabase(str(tmp_path / "missing.db"), mode=mode)
+
+
+@pytest.mark.asyncio
+async def test_attached_databases_join_in_one_query(tmp_path: Path):
+    make_database(tmp_path / "main.db", [(1, "a"), (2, "b")])
+    make_database(tmp_path / "other.db", [(2, "b"), (3, "c")])
+    database = SqliteDatabase(str(tmp_path / "main.db"), mode="ro", attachments={"other": str(tmp_path / "other.db")})
+    try:
+        rows = await database.execute_query(
+            "SELECT m.name FROM main.items m JOIN other.items o ON o.id = m.id"
+        )
+        assert rows == [{"name": "b"}]
+        assert [table["name"] for table in await database.list_tables()] == ["items", "other.items"]
+        assert (await database.describe_table("other.items"))["row_estimate"] == 3
+    finally:
+        database.close()
+
+    with pytest.raises(ValueError, match="Invalid schema name"):
+        SqliteDatabase(str(tmp_path / "main.db"), attachments={"main": str(tmp_path / "other.db")})
+
+
+@pytest.mark.asyncio
+async def test_insights_persist_across_sessions(tmp_path: Path):
+    path = str(tmp_path / "insights.db")
+    database = SqliteDatabase(path)
+    try:
+        assert database._synthesize_memo() == "No business insights have been discovered yet."
+        await database.append_insight("Sales peak on Fridays")
+        memo = database._synthesize_memo()
+        assert memo.endswith("- Sales peak on Fridays")
+        assert database._synthesize_memo() is memo  # cached until the next append
+        await database.append_insight("Returns cluster in March")
+        assert "2 key business insights" in database._synthesize_memo()
+    finally:
+        database.close()
+
+    database = SqliteDatabase(path)
+    try:
+        memo = database._synthesize_memo()
+        assert "- Sales peak on Fridays\n- Returns cluster in March\nSummary:" in memo
+    finally:
+        database.close()
+
+
+@pytest.mark.asyncio
+async def test_insights_are_capped_and_windowed(tmp_path: Path):
+    path = str(tmp_path / "insights.db")
+    database = SqliteDatabase(path, max_insights=5, memo_window=3)
+    try:
+        for i in range(8):
+            await database.append_insight(f"insight {i}")
+        assert await database.execute_query("SELECT COUNT(*) AS n FROM mcp_insights") == [{"n": 5}]
+        assert "mcp_insights" not in [table["name"] for table in await database.list_tables()]
+        with pytest.raises(ValueError):
+            await database.describe_table("mcp_insights")
+        memo = database._synthesize_memo()
+        assert "(Showing the latest 3 of 5 insights)" in memo
+        assert "- insight 4" not in memo and "- insight 7" in memo
+    finally:
+        database.close()
+
+    database = SqliteDatabase(path, memo_window=2)
+    try:
+        memo = database._synthesize_memo()
+        assert "(Showing the latest 2 of 5 insights)\n- insight 6\n- insight 7" in memo
+    finally:
+        database.close()
+
+
+@pytest.mark.parametrize("window, limit", [(0, 3), (10, 3)])
+def test_insight_memo_never_shows_more_than_the_limit(window, limit):
+    store = InsightStore(window=window, limit=limit)
+    for i in range(10):
+        store.add(f"insight {i}")
+    memo = store.memo()
+    assert "3 key business insights" in memo
+    assert "(Showing the latest 3 of 3 insights)" not in memo
+    assert [line for line in memo.splitlines() if line.startswith("- ")] == [
+        "- insight 7", "- insight 8", "- insight 9"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_result_cache_serves_repeated_reads_until_a_write(db):
+    await db.execute_many("INSERT INTO items (name) VALUES (?)", [["a"], ["b"]])
+    query = "SELECT name FROM items WHERE name != ? ORDER BY id"
+
+    first, meta = await db.read_page(query, ["x"])
+    assert meta["cache"] == "miss"
+    again, meta = await db.read_page("SELECT name  FROM items\nWHERE name != ?  ORDER BY id;", ["x"])
+    assert (again, meta["cache"]) == (first, "hit")
+    assert (await db.read_page(query, ["a"]))[1]["cache"] == "miss"
+
+    await db.execute_query("INSERT INTO items (name) VALUES ('c')")
+    text, meta = await db.read_page(query, ["x"])
+    assert meta["cache"] == "miss" and '"c"' in text
+
+    # Writes from another connection are detected through PRAGMA data_version
+    with closing(sqlite3.connect(db.db_path)) as other, other:
+        other.execute("INSERT INTO items (name) VALUES ('d')")
+    text, meta = await db.read_page(query, ["x"])
+    assert meta["cache"] == "miss" and '"d"' in text
+
+    assert (await db.read_page("SELECT random()"))[1]["cache"] == "bypass"
+    _, meta = await db.read_page(query, ["x"], page_size=1)
+    assert meta["cursor"] and (await db.read_page(cursor=meta["cursor"]))[1]["cache"] == "bypass"
+
+
+@pytest.mark.asyncio
+async def test_result_cache_hits_for_memory_database():
+    database = SqliteDatabase(":memory:")
+    try:
+        database._execute_query("CREATE TABLE t (x)")
+        database._execute_query("INSERT INTO t VALUES (1)")
+        assert (await database.read_page("SELECT x FROM t"))[1]["cache"] == "miss"
+        assert (await database.read_page("SELECT x FROM t"))[1]["cache"] == "hit"
+        database._execute_query("INSERT INTO t VALUES (2)")
+        text, meta = await database.read_page("SELECT x FROM t")
+        assert meta["cache"] == "miss" and "[2]" in text
+    finally:
+        database.close()
+
+
+def test_result_cache_is_bounded_by_bytes():
+    cache = ResultCache(max_bytes=300)
+    assert cache.key("SELECT 'a  b'", None) != cache.key("SELECT 'a b'", None)
+    keys = [cache.key(f"SELECT {i}", None) for i in range(3)]
+    for key in keys:
+        cache.put(key, 1, "x" * 100, {})
+    assert cache.get(keys[0], 1) is None and cache.get(keys[2], 1) is not None
+    assert cache.evictions == 1 and cache.size <= 300
+    assert cache.get(keys[2], 2) is None and cache.stats()["entries"] == 0
@@ -0,0 +1,3 @@
+"""
+Load tests for the Wai document API.
+"""
@@ -0,0 +1,412 @@
+"""
+Load test runner for the Wai document API.
+
+Launches the MCP and AI stubs plus the FastAPI app as separate processes,
+drives `/documents/process`, `/documents/batch_process` and `/documents/list`
+at a target request rate and reports latency percentiles, error rates and
+server CPU/memory usage. Thresholds and a baseline report can be supplied to
+use the run as a regression gate.
+
+Usage:
+    python -m tests.load.runner --rps 50 --duration 30 --output report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from tests.load.stubs import Distribution, StubProfile
+
+try:
+    import psutil
+except ImportError:  # Resource sampling is optional
+    psutil = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = ("process", "batch_process", "list")
+
+
+class LoadTestConfig(BaseModel):
+    """Parameters of a single load test run."""
+    rps: float = 20.0
+    duration: float = 10.0
+    warmup: float = 1.0
+    mix: Dict[str, float] = {"process": 0.6, "batch_process": 0.2, "list": 0.2}
+    batch_size: int = 5
+    source: str = "google-drive"
+    document_count: int = 100
+    max_in_flight: int = 500
+    request_timeout: float = 30.0
+    mcp_profile: StubProfile = StubProfile(latency_ms=Distribution(kind="lognormal", mean=20, spread=10))
+    ai_profile: StubProfile = StubProfile(
+        latency_ms=Distribution(kind="lognormal", mean=50, spread=20),
+        size_bytes=Distribution(mean=500),
+    )
+    seed: int = 0
+
+
+class Thresholds(BaseModel):
+    """Limits that make a run fail when exceeded."""
+    max_error_rate: Optional[float] = None
+    max_p95_ms: Optional[float] = None
+    max_p99_ms: Optional[float] = None
+    max_regression: Optional[float] = None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the `pct` percentile of `values` using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Summarize latencies (in seconds) of one endpoint or of the whole run."""
+    total = len(latencies) + errors
+    millis = [value * 1000 for value in latencies]
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "min": min(millis) if millis else 0.0,
+            "mean": sum(millis) / len(millis) if millis else 0.0,
+            "p50": percentile(millis, 50),
+            "p90": percentile(millis, 90),
+            "p95": percentile(millis, 95),
+            "p99": percentile(millis, 99),
+            "max": max(millis) if millis else 0.0,
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process serving {url} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+@contextmanager
+def _serve(args: List[str], health_url: str, env: Optional[Dict[str, str]] = None) -> Iterator[subprocess.Popen]:
+    process = subprocess.Popen(
+        [sys.executable, *args],
+        cwd=ROOT_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(health_url, process)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@contextmanager
+def launch_stack(config: LoadTestConfig) -> Iterator[Dict[str, Any]]:
+    """Start the stubs and the API server, yielding its base URL and process."""
+    mcp_port, ai_port, api_port = _free_port(), _free_port(), _free_port()
+    mcp_url = f"http://127.0.0.1:{mcp_port}"
+    ai_url = f"http://127.0.0.1:{ai_port}"
+    api_url = f"http://127.0.0.1:{api_port}"
+
+    with _serve(
+        ["-m", "tests.load.stubs", "mcp", "--port", str(mcp_port),
+         "--profile", config.mcp_profile.model_dump_json()],
+        f"{mcp_url}/health",
+    ), _serve(
+        ["-m", "tests.load.stubs", "ai", "--port", str(ai_port),
+         "--profile", config.ai_profile.model_dump_json()],
+        f"{ai_url}/health",
+    ), _serve(
+        ["-m", "uvicorn", "backend.server:app", "--host", "127.0.0.1", "--port", str(api_port),
+         "--log-level", "warning", "--no-access-log"],
+        f"{api_url}/health",
+        env={"WAI_MCP_BASE_URL": mcp_url, "WAI_AI_BASE_URL": ai_url},
+    ) as api_process:
+        yield {"url": api_url, "pid": api_process.pid}
+
+
+class ResourceSampler:
+    """Periodically samples CPU and memory usage of the API server process."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.interval = interval
+        self.cpu_percent: List[float] = []
+        self.rss_bytes: List[int] = []
+        self.process = psutil.Process(pid) if psutil else None
+
+    async def run(self):
+        if self.process is None:
+            return
+        self.process.cpu_percent(None)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.cpu_percent.append(self.process.cpu_percent(None))
+                self.rss_bytes.append(self.process.memory_info().rss)
+            except psutil.Error:
+                return
+
+    def report(self) -> Optional[Dict[str, float]]:
+        if not self.cpu_percent:
+            return None
+        return {
+            "cpu_percent_mean": sum(self.cpu_percent) / len(self.cpu_percent),
+            "cpu_percent_max": max(self.cpu_percent),
+            "rss_mb_max": max(self.rss_bytes) / 2**20,
+            "rss_mb_final": self.rss_bytes[-1] / 2**20,
+        }
+
+
+def _build_request(endpoint: str, config: LoadTestConfig, rng: random.Random) -> Dict[str, Any]:
+    def document_request():
+        return {
+            "source": config.source,
+            "params": {"document_id": f"doc-{rng.randrange(config.document_count)}"},
+            "query": "Summarize the key information",
+        }
+
+    if endpoint == "process":
+        return {"method": "POST", "url": "/api/documents/process", "json": document_request()}
+    if endpoint == "batch_process":
+        return {
+            "method": "POST",
+            "url": "/api/documents/batch_process",
+            "json": [document_request() for _ in range(config.batch_size)],
+        }
+    return {
+        "method": "GET",
+        "url": "/api/documents/list",
+        "params": {"source": config.source, "folder_id": f"folder-{rng.randrange(10)}"},
+    }
+
+
+async def drive_load(base_url: str, config: LoadTestConfig, pid: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Issue requests at a fixed arrival rate (open loop) and collect results.
+
+    Requests are scheduled on a fixed timetable regardless of how quickly the
+    server answers, so queueing delay shows up in the latencies instead of
+    silently lowering the offered load.
+    """
+    rng = random.Random(config.seed)
+    endpoints = [name for name in ENDPOINTS if config.mix.get(name, 0) > 0]
+    weights = [config.mix[name] for name in endpoints]
+    latencies: Dict[str, List[float]] = {name: [] for name in endpoints}
+    errors: Dict[str, int] = {name: 0 for name in endpoints}
+    error_samples: List[str] = []
+    in_flight = asyncio.Semaphore(config.max_in_flight)
+    dropped = 0
+
+    limits = httpx.Limits(max_connections=config.max_in_flight, max_keepalive_connections=config.max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=config.request_timeout, limits=limits) as client:
+
+        async def issue(endpoint: str, request: Dict[str, Any], record: bool):
+            started = time.perf_counter()
+            try:
+                response = await client.request(**request)
+                failed = response.status_code >= 400
+                if failed and len(error_samples) < 10:
+                    error_samples.append(f"{endpoint}: {response.status_code} {response.text[:200]}")
+            except httpx.HTTPError as e:
+                failed = True
+                if len(error_samples) < 10:
+                    error_samples.append(f"{endpoint}: {e!r}")
+            finally:
+                in_flight.release()
+            if record:
+                if failed:
+                    errors[endpoint] += 1
+                else:
+                    latencies[endpoint].append(time.perf_counter() - started)
+
+        sampler = ResourceSampler(pid) if pid else None
+        sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+        tasks = []
+        interval = 1.0 / config.rps
+        total = int((config.warmup + config.duration) * config.rps)
+        start = time.perf_counter()
+        for index in range(total):
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            record = index * interval >= config.warmup
+            endpoint = rng.choices(endpoints, weights)[0]
+            if in_flight.locked():
+                # The server cannot keep up; count the request as failed rather
+                # than letting the client itself become the bottleneck.
+                if record:
+                    dropped += 1
+                    errors[endpoint] += 1
+                continue
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(issue(endpoint, _build_request(endpoint, config, rng), record)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start - config.warmup
+        if sampler_task:
+            sampler_task.cancel()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "config": config.model_dump(),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": {name: summarize(latencies[name], errors[name], elapsed) for name in endpoints},
+        "dropped": dropped,
+        "error_samples": error_samples,
+        "server": sampler.report() if sampler else None,
+    }
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """Launch the stack, drive load against it and return the report."""
+    with launch_stack(config) as stack:
+        return asyncio.run(drive_load(stack["url"], config, stack["pid"]))
+
+
+def check_thresholds(report: Dict[str, Any], thresholds: Thresholds,
+                     baseline: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Return a list of human-readable threshold violations."""
+    failures = []
+    overall = report["overall"]
+    if thresholds.max_error_rate is not None and overall["error_rate"] > thresholds.max_error_rate:
+        failures.append(f"error rate {overall['error_rate']:.2%} > {thresholds.max_error_rate:.2%}")
+    if thresholds.max_p95_ms is not None and overall["latency_ms"]["p95"] > thresholds.max_p95_ms:
+        failures.append(f"p95 {overall['latency_ms']['p95']:.1f}ms > {thresholds.max_p95_ms:.1f}ms")
+    if thresholds.max_p99_ms is not None and overall["latency_ms"]["p99"] > thresholds.max_p99_ms:
+        failures.append(f"p99 {overall['latency_ms']['p99']:.1f}ms > {thresholds.max_p99_ms:.1f}ms")
+    if baseline is not None and thresholds.max_regression is not None:
+        for name, stats in report["endpoints"].items():
+            previous = baseline.get("endpoints", {}).get(name)
+            if not previous or not previous["latency_ms"]["p95"]:
+                continue
+            ratio = stats["latency_ms"]["p95"] / previous["latency_ms"]["p95"] - 1
+            if ratio > thresholds.max_regression:
+                failures.append(f"{name} p95 regressed by {ratio:.1%} (limit {thresholds.max_regression:.1%})")
+    return failures
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as a plain-text table."""
+    lines = [f"{'endpoint':<15}{'reqs':>8}{'err%':>8}{'rps':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, stats in rows:
+        latency = stats["latency_ms"]
+        lines.append(
+            f"{name:<15}{stats['requests']:>8}{stats['error_rate'] * 100:>7.1f}%{stats['throughput_rps']:>8.1f}"
+            f"{latency['p50']:>9.1f}{latency['p90']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}{latency['max']:>9.1f}"
+        )
+    server = report.get("server")
+    if server:
+        lines.append(
+            f"server: cpu mean {server['cpu_percent_mean']:.1f}% max {server['cpu_percent_max']:.1f}%, "
+            f"rss max {server['rss_mb_max']:.1f}MB final {server['rss_mb_final']:.1f}MB"
+        )
+    for sample in report["error_samples"]:
+        lines.append(f"error: {sample}")
+    return "\n".join(lines)
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Wai document API against local stubs")
+    parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured duration in seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured warmup in seconds")
+    parser.add_argument("--mix", type=_parse_mix, default=None,
+                        help="Endpoint weights, e.g. process=0.6,batch_process=0.2,list=0.2")
+    parser.add_argument("--batch-size", type=int, default=5, help="Documents per batch_process request")
+    parser.add_argument("--mcp-profile", default=None, help="MCP stub StubProfile as JSON")
+    parser.add_argument("--ai-profile", default=None, help="AI stub StubProfile as JSON")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for request generation")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare against")
+    parser.add_argument("--max-error-rate", type=float, help="Fail if the error rate exceeds this fraction")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if overall p95 latency exceeds this")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if overall p99 latency exceeds this")
+    parser.add_argument("--max-regression", type=float,
+                        help="Fail if any endpoint's p95 is this fraction slower than the baseline")
+    args = parser.parse_args()
+
+    overrides: Dict[str, Any] = {
+        "rps": args.rps,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "batch_size": args.batch_size,
+        "seed": args.seed,
+    }
+    if args.mix:
+        overrides["mix"] = args.mix
+    if args.mcp_profile:
+        overrides["mcp_profile"] = StubProfile(**json.loads(args.mcp_profile))
+    if args.ai_profile:
+        overrides["ai_profile"] = StubProfile(**json.loads(args.ai_profile))
+    config = LoadTestConfig(**overrides)
+
+    report = run_load_test(config)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check_thresholds(report, Thresholds(
+        max_error_rate=args.max_error_rate,
+        max_p95_ms=args.max_p95_ms,
+        max_p99_ms=args.max_p99_ms,
+        max_regression=args.max_regression,
+    ), baseline)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Local stand-ins for the MCP and AI services used by the load tests.
+
+Each stub is a small FastAPI app whose response latency and payload size are
+drawn from a configurable distribution, so the Wai API can be exercised
+end-to-end without any network dependency.
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+from typing import Literal, Optional
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+DistributionKind = Literal["constant", "uniform", "exponential", "lognormal"]
+
+
+class Distribution(BaseModel):
+    """A non-negative random distribution described by its mean and spread."""
+    kind: DistributionKind = "constant"
+    mean: float = 0.0
+    spread: float = 0.0
+    maximum: Optional[float] = None
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value from the distribution."""
+        if self.kind == "constant":
+            value = self.mean
+        elif self.kind == "uniform":
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / self.mean) if self.mean > 0 else 0.0
+        else:
+            # Parameterise the lognormal so that `mean` is its median and
+            # `spread` the multiplicative standard deviation.
+            sigma = max(self.spread, 1e-9) / max(self.mean, 1e-9)
+            value = self.mean * rng.lognormvariate(0.0, sigma)
+        if self.maximum is not None:
+            value = min(value, self.maximum)
+        return max(value, 0.0)
+
+
+class StubProfile(BaseModel):
+    """Behaviour of a stub service."""
+    latency_ms: Distribution = Distribution()
+    size_bytes: Distribution = Distribution(mean=2000)
+    files_per_listing: int = 25
+    mime_type: str = "text/plain"
+    seed: int = 0
+
+
+def _make_block(rng: random.Random, length: int = 4096) -> str:
+    """Build a block of pseudo-random prose used to fill payloads."""
+    alphabet = string.ascii_lowercase + "     \n"
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def _take(block: str, size: int) -> str:
+    """Return exactly `size` characters by repeating `block`."""
+    repeats, remainder = divmod(size, len(block))
+    return block * repeats + block[:remainder]
+
+
+def create_mcp_stub(profile: StubProfile) -> FastAPI:
+    """
+    Create a fake MCP service.
+
+    Serves the Google Drive adapter routes under `/google-drive` as well as the
+    generic `/v1/{source}/documents` route used for other sources.
+    """
+    app = FastAPI(title="Wai MCP stub")
+    rng = random.Random(profile.seed)
+    block = _make_block(rng)
+
+    async def delay():
+        await asyncio.sleep(profile.latency_ms.sample(rng) / 1000)
+
+    def document(document_id: str):
+        size = int(profile.size_bytes.sample(rng))
+        return {
+            "content": _take(block, size),
+            "metadata": {"id": document_id, "mimeType": profile.mime_type, "size": size},
+        }
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/google-drive/v1/documents/get")
+    async def get_document(payload: dict):
+        await delay()
+        return document(payload.get("document_id", ""))
+
+    @app.get("/google-drive/files")
+    async def list_files(q: Optional[str] = None, fields: Optional[str] = None):
+        await delay()
+        return {
+            "files": [
+                {
+                    "id": f"file-{index}",
+                    "name": f"Document {index}",
+                    "mimeType": profile.mime_type,
+                    "modifiedTime": f"2024-01-{index % 28 + 1:02d}T00:00:00Z",
+                }
+                for index in range(profile.files_per_listing)
+            ]
+        }
+
+    @app.get("/google-drive/files/{file_id}")
+    async def get_file(file_id: str, fields: Optional[str] = None, alt: Optional[str] = None):
+        await delay()
+        if alt == "media":
+            return PlainTextResponse(document(file_id)["content"])
+        return {
+            "id": file_id,
+            "name": f"Document {file_id}",
+            "mimeType": profile.mime_type,
+            "modifiedTime": "2024-01-01T00:00:00Z",
+        }
+
+    @app.get("/google-drive/files/{file_id}/export")
+    async def export_file(file_id: str, mimeType: str = "text/plain"):
+        await delay()
+        return PlainTextResponse(document(file_id)["content"], media_type=mimeType)
+
+    @app.post("/v1/{source}/documents")
+    async def get_source_documents(source: str, payload: dict):
+        await delay()
+        return document(str(payload.get("document_id", source)))
+
+    return app
+
+
+def create_ai_stub(profile: StubProfile) -> FastAPI:
+    """Create a fake AI completion service."""
+    app = FastAPI(title="Wai AI stub")
+    rng = random.Random(profile.seed)
+    block = _make_block(rng)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/v1/completions")
+    async def completions(payload: dict):
+        await asyncio.sleep(profile.latency_ms.sample(rng) / 1000)
+        return {"choices": [{"text": _take(block, int(profile.size_bytes.sample(rng)))}]}
+
+    return app
+
+
+def main():
+    """Run a single stub service; used by the load test runner."""
+    parser = argparse.ArgumentParser(description="Run a Wai MCP or AI stub service")
+    parser.add_argument("kind", choices=["mcp", "ai"], help="Which service to emulate")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind to")
+    parser.add_argument("--port", type=int, required=True, help="Port to listen on")
+    parser.add_argument("--profile", default="{}", help="StubProfile as JSON")
+    args = parser.parse_args()
+
+    profile = StubProfile(**json.loads(args.profile))
+    app = create_mcp_stub(profile) if args.kind == "mcp" else create_ai_stub(profile)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
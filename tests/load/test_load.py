@@ -0,0 +1,52 @@
+"""
+Smoke tests for the load test suite.
+"""
+import random
+
+import pytest
+
+from tests.load.runner import (
+    LoadTestConfig,
+    Thresholds,
+    check_thresholds,
+    percentile,
+    run_load_test,
+    summarize,
+)
+from tests.load.stubs import Distribution
+
+
+def test_percentile_interpolates():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+def test_distribution_respects_bounds():
+    rng = random.Random(1)
+    dist = Distribution(kind="lognormal", mean=20, spread=10, maximum=50)
+    samples = [dist.sample(rng) for _ in range(1000)]
+    assert all(0 <= s <= 50 for s in samples)
+    assert Distribution(kind="constant", mean=7).sample(rng) == 7
+
+
+def test_check_thresholds_reports_regressions():
+    report = {
+        "overall": summarize([0.1, 0.2, 0.3], errors=1, elapsed=1.0),
+        "endpoints": {"process": summarize([0.2, 0.2], errors=0, elapsed=1.0)},
+    }
+    baseline = {"endpoints": {"process": summarize([0.1, 0.1], errors=0, elapsed=1.0)}}
+    failures = check_thresholds(report, Thresholds(max_error_rate=0.1, max_regression=0.5), baseline)
+    assert len(failures) == 2
+    assert check_thresholds(report, Thresholds()) == []
+
+
+def test_smoke_run_against_stubs():
+    """Drive every endpoint briefly and make sure nothing fails."""
+    config = LoadTestConfig(rps=5, duration=2, warmup=0.5, batch_size=2)
+    report = run_load_test(config)
+
+    assert set(report["endpoints"]) == {"process", "batch_process", "list"}
+    assert report["overall"]["requests"] > 0
+    assert report["overall"]["error_rate"] == 0, report["error_samples"]